@@ -1,12 +1,11 @@
 import docker
 import secrets
 from fastapi import HTTPException
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from loguru import logger
 
 from inferadmin.docker import DockerManager
 from inferadmin.routes.images.support import get_image_name_by_id
-from inferadmin.common.async_utils import to_async_io
 
 
 def generate_deployment_id() -> str:
@@ -14,10 +13,10 @@ def generate_deployment_id() -> str:
     return secrets.token_hex(4)
 
 
-def check_container_exists(container_id: str) -> bool:
+async def check_container_exists(container_id: str) -> bool:
     """Check if a Docker container exists."""
     try:
-        DockerManager.client.containers.get(container_id)
+        await DockerManager.get_engine().containers_get(container_id)
         return True
     except docker.errors.NotFound:
         return False
@@ -26,10 +25,10 @@ def check_container_exists(container_id: str) -> bool:
         return False
 
 
-def get_container_status(container_id: str) -> str:
+async def get_container_status(container_id: str) -> str:
     """Get the status of a Docker container."""
     try:
-        container = DockerManager.client.containers.get(container_id)
+        container = await DockerManager.get_engine().containers_get(container_id)
         return container.status
     except docker.errors.NotFound:
         return "not_found"
@@ -38,13 +37,13 @@ def get_container_status(container_id: str) -> str:
         return "error"
 
 
-@to_async_io
-def stop_container(container_id: str) -> bool:
+async def stop_container(container_id: str) -> bool:
     """Stop a Docker container."""
     try:
-        container = DockerManager.client.containers.get(container_id)
+        container = await DockerManager.get_engine().containers_get(container_id)
         if container.status == "running":
-            container.stop(timeout=10)  # Give 10 seconds for graceful shutdown
+            # Give 10 seconds for graceful shutdown
+            await DockerManager.get_engine().containers_stop(container_id, timeout=10)
         return True
     except docker.errors.NotFound:
         raise HTTPException(status_code=404, detail=f"Container not found: {container_id}")
@@ -55,13 +54,12 @@ def stop_container(container_id: str) -> bool:
         )
 
 
-@to_async_io
-def start_container(container_id: str) -> bool:
+async def start_container(container_id: str) -> bool:
     """Start a Docker container."""
     try:
-        container = DockerManager.client.containers.get(container_id)
+        container = await DockerManager.get_engine().containers_get(container_id)
         if container.status != "running":
-            container.start()
+            await DockerManager.get_engine().containers_start(container_id)
         return True
     except docker.errors.NotFound:
         raise HTTPException(status_code=404, detail=f"Container not found: {container_id}")
@@ -72,12 +70,10 @@ def start_container(container_id: str) -> bool:
         )
 
 
-@to_async_io
-def remove_container(container_id: str) -> bool:
+async def remove_container(container_id: str) -> bool:
     """Remove a Docker container."""
     try:
-        container = DockerManager.client.containers.get(container_id)
-        container.remove(force=True)
+        await DockerManager.get_engine().containers_remove(container_id, force=True)
         return True
     except docker.errors.NotFound:
         return False
@@ -88,13 +84,22 @@ def remove_container(container_id: str) -> bool:
         )
 
 
-@to_async_io
-def get_container_logs(container_id: str, tail: int = 100) -> str:
-    """Get logs from a Docker container."""
+async def get_container_logs(
+    container_id: str, tail: int | str = 100, since: Optional[int] = None
+) -> str:
+    """
+    Get timestamped logs from a Docker container.
+
+    Args:
+        container_id: Container ID
+        tail: Number of lines from the end to return, or "all"
+        since: Only return lines at or after this UNIX timestamp
+    """
     try:
-        container = DockerManager.client.containers.get(container_id)
-        logs = container.logs(tail=tail, timestamps=True).decode("utf-8")
-        return logs
+        logs = await DockerManager.get_engine().containers_logs(
+            container_id, tail=tail, since=since, timestamps=True
+        )
+        return logs.decode("utf-8")
     except docker.errors.NotFound:
         raise HTTPException(
             status_code=404, detail=f"Container {container_id} not found"
@@ -106,8 +111,7 @@ def get_container_logs(container_id: str, tail: int = 100) -> str:
         )
 
 
-@to_async_io
-def run_container(
+async def run_container(
     image_id: str,
     name: str,
     ports: Dict[str, Any] = None,
@@ -115,7 +119,7 @@ def run_container(
     environment: Dict[str, str] = None,
     gpu_uuids: List[str] = None,
     labels: Dict[str, str] = None,
-) -> docker.models.containers.Container:
+):
     """
     Run a docker container with the specified configuration.
     
@@ -129,43 +133,37 @@ def run_container(
         labels: Labels to apply to the container
         
     Returns:
-        The created container
+        The created container (``id``, ``status`` and ``attrs`` are available)
     """
     try:
-        image_name = get_image_name_by_id(image_id)
+        image_name = await get_image_name_by_id(image_id)
         
         # Set up default parameters
         ports = ports or {}
         volumes = volumes or {}
         env = environment or {}
         labels = labels or {}
-        device_requests = None
         
         # Add standard labels
         labels.update({
             "managed-by": "inferadmin",
         })
         
-        # Configure GPU access if requested
-        if gpu_uuids:
-            device_requests = [
-                docker.types.DeviceRequest(device_ids=gpu_uuids, capabilities=[["gpu"]])
-            ]
-            
-        # Launch container
-        container = DockerManager.client.containers.run(
+        # Launch container, attaching the requested GPUs
+        container = await DockerManager.get_engine().containers_run(
             image_name,
-            detach=True,
+            name=name,
             environment=env,
             ports=ports,
             volumes=volumes,
-            name=name,
             labels=labels,
-            device_requests=device_requests,
+            gpu_uuids=gpu_uuids,
         )
         
         return container
         
+    except HTTPException:
+        raise
     except docker.errors.ImageNotFound:
         raise HTTPException(status_code=404, detail=f"Image not found: {image_id}")
     except docker.errors.APIError as e:
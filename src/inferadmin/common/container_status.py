@@ -0,0 +1,169 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from inferadmin.docker import DockerManager
+from inferadmin.common.docker_events import (
+    DockerEventStream,
+    EventSource,
+    event_actor_id,
+    event_time_ns,
+)
+from inferadmin.common.logging import logger
+
+# Label applied to every container InferAdmin starts
+MANAGED_LABEL = "managed-by=inferadmin"
+
+# Container status implied by each lifecycle event; None means "gone"
+EVENT_STATUS: Dict[str, Optional[str]] = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+    "destroy": None,
+}
+
+# Returns (container id, status) for every managed container
+ListSource = Callable[[], Awaitable[List[Tuple[str, str]]]]
+
+
+async def docker_list_source() -> List[Tuple[str, str]]:
+    """List managed containers with a single summary Docker API call."""
+    containers = await DockerManager.get_engine().containers_list(
+        all=True, filters={"label": MANAGED_LABEL}
+    )
+    return [(container.id, container.status) for container in containers]
+
+
+class ContainerStatusWatcher:
+    """
+    In-memory status table for containers managed by InferAdmin.
+
+    The table is fed by the Docker events stream and reconciled against a
+    full container listing every ``refresh_interval`` seconds and whenever
+    the events stream reconnects. Until the first reconciliation completes
+    ``synced`` is False and callers should ask Docker directly.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 30.0,
+        event_source: Optional[EventSource] = None,
+        list_source: Optional[ListSource] = None,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            refresh_interval: Seconds between full reconciliations
+            event_source: Source of Docker events, defaults to the daemon
+            list_source: Source of full container listings, defaults to the daemon
+        """
+        self.refresh_interval = refresh_interval
+        self.event_source = event_source
+        self.list_source = list_source or docker_list_source
+
+        self._statuses: Dict[str, str] = {}
+        # When each container's entry was last set by an event
+        self._updated_ns: Dict[str, int] = {}
+        self._synced = False
+        self._events: Optional[DockerEventStream] = None
+        self._reconciler: Optional[asyncio.Task] = None
+        self._reconcile_now = asyncio.Event()
+
+    @property
+    def synced(self) -> bool:
+        """Whether the table reflects at least one full listing."""
+        return self._synced
+
+    def get(self, container_id: str) -> str:
+        """Status of a container, or "not_found" if Docker doesn't know it."""
+        return self._statuses.get(container_id, "not_found")
+
+    async def start(self) -> None:
+        """Start following events and reconciling in the background."""
+        self._events = DockerEventStream(
+            filters={"type": "container", "label": MANAGED_LABEL},
+            handler=self.handle_event,
+            on_connect=self._reconcile_now.set,
+            source=self.event_source,
+        )
+        self._events.start()
+        self._reconciler = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        """Stop the events stream and the reconciliation task."""
+        if self._events is not None:
+            self._events.stop()
+            self._events = None
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            try:
+                await self._reconciler
+            except asyncio.CancelledError:
+                pass
+            self._reconciler = None
+        self._synced = False
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Apply a single container event to the table."""
+        action = event.get("Action") or event.get("status") or ""
+        if action not in EVENT_STATUS:
+            return
+        container_id = event_actor_id(event)
+        if not container_id:
+            return
+
+        status = EVENT_STATUS[action]
+        if status is None:
+            self._statuses.pop(container_id, None)
+        else:
+            self._statuses[container_id] = status
+        self._updated_ns[container_id] = event_time_ns(event)
+
+    async def reconcile(self) -> None:
+        """Replace the table with a full listing, keeping newer event updates."""
+        started_ns = time.time_ns()
+        listing = await self.list_source()
+
+        statuses = dict(listing)
+        # Events that arrived while the listing was in flight are fresher
+        for container_id, updated_ns in self._updated_ns.items():
+            if updated_ns > started_ns:
+                if container_id in self._statuses:
+                    statuses[container_id] = self._statuses[container_id]
+                else:
+                    statuses.pop(container_id, None)
+
+        self._statuses = statuses
+        self._updated_ns = {
+            container_id: updated_ns
+            for container_id, updated_ns in self._updated_ns.items()
+            if updated_ns > started_ns
+        }
+        self._synced = True
+
+    async def _reconcile_loop(self) -> None:
+        """Reconcile periodically, or early when the events stream reconnects."""
+        while True:
+            self._reconcile_now.clear()
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"reconciling container statuses: {e}")
+                # Without a listing the table can't be trusted
+                self._synced = False
+
+            try:
+                await asyncio.wait_for(
+                    self._reconcile_now.wait(), timeout=self.refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+# Shared watcher, started from the application lifespan
+container_status_watcher = ContainerStatusWatcher()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from inferadmin.docker import DockerManager
+from inferadmin.common.logging import logger
+
+# An event source takes Docker event filters and yields decoded events
+EventSource = Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]
+
+
+def docker_event_source(filters: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Stream decoded events from the Docker daemon."""
+    return DockerManager.get().events(decode=True, filters=filters)
+
+
+class DockerEventStream:
+    """
+    Follows the Docker events stream on a dedicated thread.
+
+    The blocking docker-py generator would pin an IO-pool thread for the life
+    of the process, so it gets its own daemon thread instead. Each event is
+    handed to ``handler`` on the event loop. If the stream drops it is
+    reopened with backoff, and ``on_connect`` is called on the loop every
+    time a stream is opened so callers can resync anything they missed.
+    """
+
+    def __init__(
+        self,
+        filters: Dict[str, Any],
+        handler: Callable[[Dict[str, Any]], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        source: Optional[EventSource] = None,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Initialize an event stream.
+
+        Args:
+            filters: Docker event filters, e.g. ``{"type": "container"}``
+            handler: Called on the event loop with each decoded event
+            on_connect: Called on the event loop whenever a stream opens
+            source: Event source, defaults to the Docker daemon
+            max_backoff: Upper bound in seconds between reconnect attempts
+        """
+        self.filters = filters
+        self.handler = handler
+        self.on_connect = on_connect
+        self.source = source or docker_event_source
+        self.max_backoff = max_backoff
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._stream: Any = None
+
+    def start(self) -> None:
+        """Start following events; must be called from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="inferadmin-docker-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following events and close the underlying stream."""
+        self._stopped.set()
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _dispatch(self, callback: Callable[..., None], *args: Any) -> None:
+        """Run a callback on the event loop, ignoring a loop that has closed."""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            self._stopped.set()
+
+    def _run(self) -> None:
+        """Thread body: read events until stopped, reconnecting on failure."""
+        backoff = 1.0
+        while not self._stopped.is_set():
+            try:
+                self._stream = self.source(self.filters)
+                if self.on_connect is not None:
+                    self._dispatch(self.on_connect)
+                for event in self._stream:
+                    if self._stopped.is_set():
+                        break
+                    self._dispatch(self.handler, event)
+                    backoff = 1.0
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                logger.error(f"reading docker events: {e}")
+            finally:
+                self._stream = None
+
+            # The stream ended or failed; wait before reopening it
+            if self._stopped.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+def event_time_ns(event: Dict[str, Any]) -> int:
+    """Timestamp of a Docker event in nanoseconds, falling back to now."""
+    if "timeNano" in event:
+        return int(event["timeNano"])
+    if "time" in event:
+        return int(event["time"]) * 1_000_000_000
+    return time.time_ns()
+
+
+def event_actor_id(event: Dict[str, Any]) -> Optional[str]:
+    """ID of the object an event refers to."""
+    actor = event.get("Actor") or {}
+    return actor.get("ID") or event.get("id")
+
@@ -0,0 +1,125 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Callable, Optional
+
+# Event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Changes that alter a directory's contents
+IN_CONTENT_CHANGES = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Called with (watch descriptor, mask, name) for every event
+InotifyHandler = Callable[[int, int, str], None]
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """libc with the inotify calls, or None on platforms without them."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class Inotify:
+    """
+    Minimal inotify binding read from the event loop.
+
+    Watches are non-recursive; callers add one per directory. Events are
+    decoded and handed to ``handler`` on the loop as the descriptor becomes
+    readable, so no thread is needed.
+    """
+
+    _libc = _load_libc()
+
+    def __init__(self, handler: InotifyHandler):
+        """
+        Initialize an inotify instance.
+
+        Raises:
+            OSError: if inotify is unavailable or the instance limit is reached
+        """
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self.handler = handler
+        # Checked once here, so the watch calls need no None check
+        self._lib: ctypes.CDLL = self._libc
+        self._fd = self._lib.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether this platform supports inotify."""
+        return cls._libc is not None
+
+    def start(self) -> None:
+        """Start delivering events; must be called from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._fd, self._read)
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Watch a path, returning its watch descriptor.
+
+        Raises:
+            OSError: if the path can't be watched (e.g. the watch limit is reached)
+        """
+        wd = self._lib.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching; the kernel follows up with an IN_IGNORED event."""
+        self._lib.inotify_rm_watch(self._fd, wd)
+
+    def close(self) -> None:
+        """Stop delivering events and release every watch."""
+        if self._fd < 0:
+            return
+        if self._loop is not None:
+            self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = -1
+
+    def _read(self) -> None:
+        """Decode every queued event."""
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            self.handler(wd, mask, name)
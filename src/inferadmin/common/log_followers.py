@@ -0,0 +1,190 @@
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from inferadmin.docker import DockerManager
+from inferadmin.common.log_store import LogLine, log_store, split_log_lines
+from inferadmin.common.logging import logger
+
+
+class LogFollowerLagged(Exception):
+    """Raised to a follower that fell too far behind the shared stream."""
+
+
+class _Follower:
+    """One subscriber's bounded queue of lines from a shared feed."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.lagged = False
+
+    def offer(self, item: Optional[LogLine]) -> None:
+        """Queue a line (or None for end of stream) without ever blocking the feed."""
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Drop the slow consumer rather than stall everyone else; it can
+            # reconnect with its last cursor and backfill from Docker
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class _ContainerFeed:
+    """A single ``follow=True`` Docker log stream shared by every follower of a container."""
+
+    def __init__(self, container_id: str, on_done: Callable[["_ContainerFeed"], None]):
+        self.container_id = container_id
+        self.on_done = on_done
+        self.followers: Set[_Follower] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._run())
+
+    def _broadcast(self, item: Optional[LogLine]) -> None:
+        for follower in list(self.followers):
+            follower.offer(item)
+
+    async def _run(self) -> None:
+        """Read the Docker stream, split it into lines and fan them out."""
+        pending = ""
+        try:
+            # tail=0: followers backfill on their own, the feed only carries new lines
+            async for chunk in DockerManager.get_engine().containers_logs_stream(
+                self.container_id, tail=0, follow=True
+            ):
+                text = pending + chunk.decode("utf-8", "replace")
+                complete, _, pending = text.rpartition("\n")
+                if not complete:
+                    continue
+                lines = split_log_lines(complete)
+                log_store.extend(self.container_id, lines)
+                for line in lines:
+                    self._broadcast(line)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"following logs of {self.container_id}: {e}")
+        # The container stopped or the stream failed
+        self.on_done(self)
+        self._broadcast(None)
+
+
+class LogFollowHub:
+    """
+    Fans out live container logs to any number of followers.
+
+    Followers of the same container share one Docker log stream, opened on
+    the first subscription and closed when the last follower leaves. Each
+    follower has a bounded queue; one that falls behind is disconnected with
+    LogFollowerLagged instead of slowing the shared stream down.
+    """
+
+    def __init__(self, max_followers_per_container: int = 8, queue_size: int = 1000):
+        """
+        Initialize the hub.
+
+        Args:
+            max_followers_per_container: Concurrent followers allowed per container
+            queue_size: Lines a follower may fall behind before being disconnected
+        """
+        self.max_followers_per_container = max_followers_per_container
+        self.queue_size = queue_size
+        self._feeds: Dict[str, _ContainerFeed] = {}
+
+    def _join(self, container_id: str) -> _Follower:
+        """Register a follower, starting the container's feed if needed."""
+        feed = self._feeds.get(container_id)
+        if feed is not None and len(feed.followers) >= self.max_followers_per_container:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many log followers for container {container_id}",
+            )
+
+        follower = _Follower(self.queue_size)
+        if feed is None:
+            feed = self._feeds[container_id] = _ContainerFeed(container_id, self._finished)
+            feed.followers.add(follower)
+            feed.start()
+        else:
+            feed.followers.add(follower)
+        return follower
+
+    def _leave(self, container_id: str, follower: _Follower) -> None:
+        """Unregister a follower, stopping the feed once nobody is left."""
+        feed = self._feeds.get(container_id)
+        if feed is None or follower not in feed.followers:
+            return
+        feed.followers.discard(follower)
+        if not feed.followers:
+            del self._feeds[container_id]
+            if feed.task is not None:
+                feed.task.cancel()
+
+    def _finished(self, feed: _ContainerFeed) -> None:
+        """Forget a feed whose stream ended so the next follower opens a new one."""
+        if self._feeds.get(feed.container_id) is feed:
+            del self._feeds[feed.container_id]
+
+    def open(self, container_id: str) -> "LogFollow":
+        """
+        Join a container's shared feed.
+
+        Raises:
+            HTTPException: 429 if the container already has the maximum number of followers
+        """
+        return LogFollow(self, container_id, self._join(container_id))
+
+    async def close(self) -> None:
+        """Stop every shared feed."""
+        for feed in list(self._feeds.values()):
+            if feed.task is not None:
+                feed.task.cancel()
+        self._feeds.clear()
+
+
+class LogFollow:
+    """A follower's handle on a shared feed; call ``close`` when done."""
+
+    def __init__(self, hub: LogFollowHub, container_id: str, follower: _Follower):
+        self.hub = hub
+        self.container_id = container_id
+        self.follower = follower
+
+    async def lines(self, backfill: List[LogLine]) -> AsyncIterator[LogLine]:
+        """
+        Yield the backfill followed by live lines until the container stops.
+
+        The feed must be joined before the backfill is fetched, so nothing is
+        missed in between; live lines already covered by it are skipped.
+
+        Raises:
+            LogFollowerLagged: if the follower fell too far behind
+        """
+        last_position = -1
+        for line in backfill:
+            last_position = line.position
+            yield line
+
+        while True:
+            line = await self.follower.queue.get()
+            if line is None:
+                if self.follower.lagged:
+                    raise LogFollowerLagged(self.container_id)
+                return
+            if line.position > last_position:
+                last_position = line.position
+                yield line
+
+    def close(self) -> None:
+        """Leave the feed, stopping it if this was the last follower."""
+        self.hub._leave(self.container_id, self.follower)
+
+
+# Shared hub for all managed containers
+log_follow_hub = LogFollowHub()
@@ -0,0 +1,113 @@
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional
+
+
+class LogLine(NamedTuple):
+    """A single container log line as returned with ``timestamps=True``."""
+
+    timestamp: str  # RFC3339Nano, as emitted by Docker
+    position: int  # Nanoseconds since the epoch, for ordering
+    text: str
+
+
+def parse_log_timestamp(timestamp: str) -> int:
+    """
+    Convert a Docker RFC3339Nano timestamp to nanoseconds since the epoch.
+
+    Docker trims trailing zeros from the fractional part, so timestamps can't
+    be compared as strings.
+
+    Args:
+        timestamp: e.g. ``2024-05-01T12:00:00.123456789Z``
+
+    Returns:
+        int: Nanoseconds since the epoch
+    """
+    base, _, rest = timestamp.partition(".")
+    fraction = ""
+    offset = "Z"
+    if rest:
+        # Split fractional digits from the timezone suffix
+        digits_end = len(rest) - len(rest.lstrip("0123456789"))
+        fraction, offset = rest[:digits_end], rest[digits_end:] or "Z"
+    elif base.endswith("Z"):
+        base = base[:-1]
+    elif len(base) > 19:
+        base, offset = base[:19], base[19:]
+
+    if offset == "Z":
+        offset = "+00:00"
+    seconds = int(datetime.fromisoformat(base + offset).timestamp())
+    nanos = int((fraction + "000000000")[:9])
+    return seconds * 1_000_000_000 + nanos
+
+
+def split_log_lines(logs: str) -> List[LogLine]:
+    """Split a timestamped Docker log blob into LogLines."""
+    lines: List[LogLine] = []
+    for raw in logs.splitlines():
+        timestamp, _, text = raw.partition(" ")
+        try:
+            position = parse_log_timestamp(timestamp)
+        except ValueError:
+            # Continuation of a line that contained a carriage return
+            if lines:
+                previous = lines[-1]
+                lines[-1] = previous._replace(text=f"{previous.text}\n{raw}")
+            continue
+        lines.append(LogLine(timestamp, position, text))
+    return lines
+
+
+def join_log_lines(lines: Iterable[LogLine]) -> str:
+    """Render LogLines back into the timestamped text format Docker returns."""
+    return "".join(f"{line.timestamp} {line.text}\n" for line in lines)
+
+
+class LogStore:
+    """
+    Bounded in-memory buffer of recent log lines per container.
+
+    Kept out of the persisted application state so that viewing logs never
+    grows the state files or the list payloads.
+    """
+
+    def __init__(self, max_lines: int = 1000):
+        """
+        Initialize a log store.
+
+        Args:
+            max_lines: Number of lines retained per container
+        """
+        self.max_lines = max_lines
+        self._lines: Dict[str, Deque[LogLine]] = {}
+
+    def extend(self, container_id: str, lines: Iterable[LogLine]) -> None:
+        """Append lines newer than anything already buffered for a container."""
+        buffer = self._lines.get(container_id)
+        if buffer is None:
+            buffer = self._lines[container_id] = deque(maxlen=self.max_lines)
+
+        newest = buffer[-1].position if buffer else -1
+        buffer.extend(line for line in lines if line.position > newest)
+
+    def since(self, container_id: str, position: Optional[int] = None) -> List[LogLine]:
+        """Return buffered lines strictly newer than ``position``."""
+        buffer = self._lines.get(container_id, ())
+        if position is None:
+            return list(buffer)
+        return [line for line in buffer if line.position > position]
+
+    def cursor(self, container_id: str) -> Optional[str]:
+        """Timestamp of the newest buffered line, usable as a ``since`` cursor."""
+        buffer = self._lines.get(container_id)
+        return buffer[-1].timestamp if buffer else None
+
+    def drop(self, container_id: str) -> None:
+        """Forget everything buffered for a container."""
+        self._lines.pop(container_id, None)
+
+
+# Shared store for all managed containers
+log_store = LogStore()
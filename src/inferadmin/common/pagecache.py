@@ -0,0 +1,91 @@
+import ctypes
+import ctypes.util
+import mmap
+import os
+from typing import Optional
+
+PROT_READ = 0x1
+MAP_SHARED = 0x01
+MAP_FAILED = ctypes.c_void_p(-1).value
+
+PAGE_SIZE = mmap.PAGESIZE
+
+# Bytes mapped at a time when counting resident pages, bounding the
+# residency vector to a few hundred KiB however large the file
+RESIDENCY_WINDOW = 1024 * 1024 * 1024
+
+# mincore marks a resident page with the low bit of its byte; the rest are reserved
+_RESIDENT_BIT = bytes(value & 1 for value in range(256))
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """libc with mmap and mincore, or None on platforms without them."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.mincore
+    except (OSError, AttributeError):
+        return None
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = [
+        ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long
+    ]
+    libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p]
+    return libc
+
+
+_libc = _load_libc()
+
+
+def residency_available() -> bool:
+    """Whether this platform can report page-cache residency."""
+    return _libc is not None
+
+
+def resident_bytes(path: str) -> int:
+    """
+    Bytes of a file currently in the page cache.
+
+    The file is mapped a window at a time and its pages queried with
+    ``mincore``, which reads no data and doesn't change what is cached.
+
+    Raises:
+        OSError: if the file can't be mapped or residency is unavailable
+    """
+    if _libc is None:
+        raise OSError("page-cache residency is not available on this platform")
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        resident = 0
+        for offset in range(0, size, RESIDENCY_WINDOW):
+            length = min(RESIDENCY_WINDOW, size - offset)
+            address = _libc.mmap(None, length, PROT_READ, MAP_SHARED, fd, offset)
+            if address in (None, MAP_FAILED):
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), path)
+            try:
+                pages = ctypes.create_string_buffer((length + PAGE_SIZE - 1) // PAGE_SIZE)
+                if _libc.mincore(address, length, pages) != 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno), path)
+                count = pages.raw.translate(_RESIDENT_BIT).count(1)
+            finally:
+                _libc.munmap(address, length)
+            resident += min(count * PAGE_SIZE, length)
+        return resident
+    finally:
+        os.close(fd)
+
+
+def advise_sequential(fd: int, offset: int = 0, length: int = 0) -> None:
+    """
+    Tell the kernel a range will be read sequentially, soon.
+
+    Widens readahead and starts asynchronous reads of the range; a no-op
+    where ``posix_fadvise`` is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    os.posix_fadvise(fd, offset, length, os.POSIX_FADV_SEQUENTIAL)
+    os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Literal, Optional
+
+import docker
+from pydantic import BaseModel
+
+from inferadmin.docker import DockerManager
+from inferadmin.common.logging import logger
+
+readiness_states = Literal["starting", "ready", "failed", "timeout"]
+
+# Container statuses after which a deployment will not become ready by itself
+CONTAINER_GONE = {"exited", "dead", "removing"}
+
+
+class DeploymentReadiness(BaseModel):
+    id: str
+    state: readiness_states = "starting"
+    probe: Optional[Literal["health", "http"]] = None
+    started: datetime
+    ready: Optional[datetime] = None
+    time_to_ready: Optional[float] = None  # seconds
+    probes: int = 0
+    last_error: Optional[str] = None
+
+
+async def http_probe(host: str, port: int, path: str = "/health", timeout: float = 2.0) -> bool:
+    """
+    Send one GET to ``host:port`` and report whether it answered below 500.
+
+    Raises:
+        OSError: if the connection fails
+        asyncio.TimeoutError: if no status line arrives in time
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+    finally:
+        writer.close()
+    parts = status_line.split()
+    return len(parts) >= 2 and parts[1].isdigit() and int(parts[1]) < 500
+
+
+class ReadinessMonitor:
+    """
+    Tracks when deployments start serving.
+
+    Each watched deployment gets one background task that probes it with
+    exponential backoff: the container's Docker health status when the
+    image defines a health check, otherwise an HTTP request to its host
+    port. The outcome and time-to-ready are recorded, and any number of
+    callers can ``wait`` on a deployment instead of polling for it.
+    """
+
+    def __init__(
+        self,
+        probe_host: str = "127.0.0.1",
+        probe_path: str = "/health",
+        initial_backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        timeout: float = 600.0,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            probe_host: Host that deployments' published ports are reached on
+            probe_path: Path requested by HTTP probes
+            initial_backoff: Seconds before the second probe
+            max_backoff: Upper bound in seconds between probes
+            timeout: Seconds after which a deployment that isn't ready is given up on
+        """
+        self.probe_host = probe_host
+        self.probe_path = probe_path
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+        self._status: Dict[str, DeploymentReadiness] = {}
+        self._settled: Dict[str, asyncio.Event] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, deployment_id: str) -> Optional[DeploymentReadiness]:
+        """Readiness of a deployment, or None if it isn't being tracked."""
+        return self._status.get(deployment_id)
+
+    def watch(
+        self,
+        deployment_id: str,
+        host_port: Optional[int] = None,
+        started: Optional[datetime] = None,
+        on_ready: Optional[Callable[[DeploymentReadiness], Awaitable[None]]] = None,
+    ) -> DeploymentReadiness:
+        """
+        Start probing a deployment, unless it is already being probed.
+
+        Args:
+            deployment_id: Container ID of the deployment
+            host_port: Published port for HTTP probes, if any
+            started: When the deployment was started, defaults to now
+            on_ready: Awaited once the deployment is ready
+        """
+        if deployment_id in self._tasks:
+            return self._status[deployment_id]
+
+        status = DeploymentReadiness(id=deployment_id, started=started or datetime.now())
+        self._status[deployment_id] = status
+        self._settled[deployment_id] = asyncio.Event()
+        self._tasks[deployment_id] = asyncio.create_task(
+            self._run(status, host_port, on_ready)
+        )
+        return status
+
+    def forget(self, deployment_id: str) -> None:
+        """Stop probing a deployment and drop its record."""
+        task = self._tasks.pop(deployment_id, None)
+        if task is not None:
+            task.cancel()
+        self._status.pop(deployment_id, None)
+        settled = self._settled.pop(deployment_id, None)
+        if settled is not None:
+            # Release waiters; they see the deployment as no longer tracked
+            settled.set()
+
+    async def wait(self, deployment_id: str, timeout: float) -> Optional[DeploymentReadiness]:
+        """
+        Wait up to ``timeout`` seconds for a deployment to become ready or fail.
+
+        Returns:
+            The deployment's readiness at that point, or None if it isn't tracked
+        """
+        settled = self._settled.get(deployment_id)
+        if settled is None:
+            return None
+        try:
+            await asyncio.wait_for(settled.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._status.get(deployment_id)
+
+    async def close(self) -> None:
+        """Stop every probe."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _probe(self, status: DeploymentReadiness, host_port: Optional[int]) -> bool:
+        """
+        Probe a deployment once.
+
+        Raises:
+            RuntimeError: if the container has stopped or disappeared
+        """
+        try:
+            container = await DockerManager.get_engine().containers_get(status.id)
+        except docker.errors.NotFound:
+            raise RuntimeError("container not found")
+        if container.status in CONTAINER_GONE:
+            raise RuntimeError(f"container {container.status}")
+
+        state = container.attrs.get("State")
+        health = state.get("Health") if isinstance(state, dict) else None
+        if health:
+            status.probe = "health"
+            status.last_error = None if health.get("Status") == "healthy" else health.get("Status")
+            return health.get("Status") == "healthy"
+
+        if container.status != "running":
+            status.last_error = container.status
+            return False
+        if host_port is None:
+            # Nothing to probe: a running container is as ready as we can tell
+            return True
+
+        status.probe = "http"
+        try:
+            ready = await http_probe(self.probe_host, host_port, self.probe_path)
+        except (OSError, asyncio.TimeoutError) as e:
+            status.last_error = str(e) or type(e).__name__
+            return False
+        status.last_error = None if ready else "server error"
+        return ready
+
+    async def _run(
+        self,
+        status: DeploymentReadiness,
+        host_port: Optional[int],
+        on_ready: Optional[Callable[[DeploymentReadiness], Awaitable[None]]],
+    ) -> None:
+        """Probe with exponential backoff until ready, failed or timed out."""
+        deadline = time.monotonic() + self.timeout
+        backoff = self.initial_backoff
+        try:
+            while True:
+                status.probes += 1
+                try:
+                    if await self._probe(status, host_port):
+                        status.state = "ready"
+                        status.ready = datetime.now()
+                        status.time_to_ready = round(
+                            (status.ready - status.started).total_seconds(), 3
+                        )
+                        break
+                except RuntimeError as e:
+                    status.state = "failed"
+                    status.last_error = str(e)
+                    break
+                except Exception as e:
+                    logger.error(f"probing deployment {status.id}: {e}")
+                    status.last_error = str(e)
+
+                if time.monotonic() + backoff > deadline:
+                    status.state = "timeout"
+                    break
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+        finally:
+            # A restart forgets this run and watches again before the
+            # cancellation lands; leave the new run's task and event alone
+            if self._tasks.get(status.id) is asyncio.current_task():
+                del self._tasks[status.id]
+                self._settled[status.id].set()
+
+        if status.state == "ready" and on_ready is not None:
+            try:
+                await on_ready(status)
+            except Exception as e:
+                logger.error(f"recording readiness of {status.id}: {e}")
+
+
+# Shared monitor, configured from the application lifespan
+readiness_monitor = ReadinessMonitor()
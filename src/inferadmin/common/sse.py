@@ -0,0 +1,51 @@
+import asyncio
+from typing import AsyncIterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Seconds between keepalive comments on an idle event stream
+SSE_HEARTBEAT = 15
+
+# Comment line that keeps proxies from timing out an idle stream
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+# Response headers for a server-sent events stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(data: str, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    """Format one server-sent event."""
+    message = ""
+    if event:
+        message += f"event: {event}\n"
+    if id:
+        message += f"id: {id}\n"
+    message += "".join(f"data: {part}\n" for part in data.split("\n"))
+    return message + "\n"
+
+
+async def with_heartbeat(
+    items: AsyncIterator[T], heartbeat: float = SSE_HEARTBEAT
+) -> AsyncIterator[Optional[T]]:
+    """
+    Yield items as they arrive, and None whenever none arrived for ``heartbeat`` seconds.
+
+    Lets an event stream send SSE_KEEPALIVE while its source is idle.
+    Exceptions raised by ``items`` propagate; the pending read is cancelled
+    when the stream is closed.
+    """
+    next_item = asyncio.ensure_future(anext(items))
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_item}, timeout=heartbeat)
+            if not done:
+                yield None
+                continue
+            try:
+                item = next_item.result()
+            except StopAsyncIteration:
+                return
+            yield item
+            next_item = asyncio.ensure_future(anext(items))
+    finally:
+        next_item.cancel()
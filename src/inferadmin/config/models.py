@@ -1,5 +1,9 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from inferadmin.state.stores import state_backends
+
 
 class InferAdminConfig(BaseSettings):
     model_config = SettingsConfigDict(
@@ -12,10 +16,90 @@ class InferAdminConfig(BaseSettings):
     # Authentication tokens
     hf_token: str
     
+    # Model index: seconds between full rescans of the model volume, and
+    # between change checks when inotify is unavailable
+    model_index_rescan_interval: float = 3600.0
+    model_index_poll_interval: float = 60.0
+
+    # Model downloads running at once; further download jobs wait in a queue
+    model_download_concurrency: int = 2
+
+    # Byte ranges a download fetches in parallel unless the request says
+    # otherwise, and the size of each range in MiB
+    model_download_workers: int = 4
+    model_download_chunk_mb: int = 64
+
+    # Combined download bandwidth limit in MiB/s; 0 means unlimited
+    model_download_bandwidth_mb: float = 0.0
+
+    # Hard link identical model files to one copy in a blob store on the
+    # volume; stored files become read-only. Disable for filesystems
+    # without hard links
+    model_dedup: bool = True
+
+    # Space freed per second when reclaiming deleted models, in MiB; keeps
+    # the unlinks from starving inference I/O. 0 means unlimited
+    model_trash_reclaim_mb: float = 512.0
+
+    # Model storage quota in GB; 0 means the whole filesystem. Downloads
+    # that would take usage past the high watermark first evict the least
+    # recently used undeployed models until usage fits under the low one
+    model_storage_quota_gb: float = 0.0
+    model_storage_high_watermark: float = 0.9
+    model_storage_low_watermark: float = 0.8
+
+    # Page-cache prewarming: threads reading a model in parallel, and the
+    # size in MiB of the range each thread reads at a time
+    model_prewarm_workers: int = 4
+    model_prewarm_chunk_mb: int = 64
+
     # Thread pool settings
     io_thread_pool_size: int = 10
     cpu_thread_pool_size: int = 0  # 0 means use CPU count - 1
     
+    # State persistence: "json" (journaled files) or "sqlite"
+    state_backend: state_backends = "json"
+
+    # Talk to the Docker socket with the asyncio-native client (docker-py otherwise)
+    docker_async_client: bool = True
+    docker_max_connections: int = 64
+
+    # Seconds between full container status reconciliations
+    container_refresh_interval: float = 30.0
+
+    # Seconds between GPU state samples, and samples kept per GPU
+    gpu_refresh_interval: float = 1.0
+    gpu_history_samples: int = 600
+
+    # "stream" keeps one nvidia-smi process reporting every interval;
+    # "poll" runs nvidia-smi once per sample
+    gpu_telemetry_backend: Literal["stream", "poll"] = "stream"
+
+    # Recent log lines kept in memory per container
+    container_log_buffer_lines: int = 1000
+
+    # Readiness probes: host published ports are reached on, HTTP path,
+    # longest pause between probes and when to give up, in seconds
+    readiness_probe_host: str = "127.0.0.1"
+    readiness_probe_path: str = "/health"
+    readiness_max_backoff: float = 10.0
+    readiness_timeout: float = 600.0
+
+    # Containers acted on at once by bulk start/stop/delete
+    bulk_operation_concurrency: int = 32
+
+    # Image pulls running at once; further pull jobs wait in a queue
+    image_pull_concurrency: int = 2
+
+    # Image references kept pre-pulled, refreshed daily during the quiet
+    # window ("HH:MM-HH:MM" local time, may wrap past midnight)
+    image_prepull_references: list[str] = []
+    image_prepull_window: str = "02:00-05:00"
+
+    # Live log followers: cap per container, and lines one may fall behind
+    log_followers_per_container: int = 8
+    log_follower_queue_lines: int = 1000
+
     # Logging configuration
     log_level: str = "INFO"
     log_file: str = ""  # Empty means log to console only
@@ -1,21 +1,68 @@
-import docker
-
-
-class DockerManagerClass:
-    client = None
-
-    def init(self):
-        """Initialize the Docker client"""
-        try:
-            self.client = docker.from_env()
-        except Exception as e:
-            raise Exception(f"Failed to initialize Docker: {e}")
-
-    def get(self):
-        """Get the Docker client instance"""
-        if self.client is None:
-            self.init()  # Auto-initialize if not done
-        return self.client
-
-
-DockerManager = DockerManagerClass()
+import os
+from typing import Optional, cast
+
+import docker
+
+from inferadmin.docker_engine import AsyncDockerEngine, DockerPyEngine, DEFAULT_SOCKET_PATH
+
+
+class DockerManagerClass:
+    client: Optional[docker.DockerClient] = None
+    # Async client used by the helpers: asyncio-native, or docker-py on the IO pool
+    engine: Optional[AsyncDockerEngine | DockerPyEngine] = None
+
+    def init(self, use_async_engine: bool = True, max_connections: int = 64):
+        """
+        Initialize the Docker client
+
+        Args:
+            use_async_engine: Use the asyncio-native client when the daemon is on a unix socket
+            max_connections: Connection pool size of the asyncio-native client
+        """
+        try:
+            self.client = docker.from_env()
+        except Exception as e:
+            raise Exception(f"Failed to initialize Docker: {e}")
+
+        socket_path = self._unix_socket_path() if use_async_engine else None
+        if socket_path is not None:
+            self.engine = AsyncDockerEngine(socket_path, max_connections=max_connections)
+        else:
+            self.engine = DockerPyEngine(self.client)
+
+    @staticmethod
+    def _unix_socket_path() -> Optional[str]:
+        """The daemon's unix socket, or None if it is reached some other way."""
+        host = os.environ.get("DOCKER_HOST", "")
+        if not host:
+            socket_path = DEFAULT_SOCKET_PATH
+        elif host.startswith("unix://"):
+            socket_path = host[len("unix://"):]
+        else:
+            return None
+        return socket_path if os.path.exists(socket_path) else None
+
+    def get(self) -> docker.DockerClient:
+        """Get the Docker client instance"""
+        if self.client is None:
+            self.init()  # Auto-initialize if not done
+        return cast(docker.DockerClient, self.client)
+
+    def get_engine(self) -> AsyncDockerEngine | DockerPyEngine:
+        """
+        Get the async Docker client
+
+        Raises:
+            RuntimeError: If Docker hasn't been initialized by the application lifespan
+        """
+        if self.engine is None:
+            raise RuntimeError("Docker is not initialized")
+        return self.engine
+
+    async def close(self):
+        """Close pooled connections of the async client"""
+        if self.engine is not None:
+            await self.engine.close()
+
+
+DockerManager = DockerManagerClass()
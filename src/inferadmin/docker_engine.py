@@ -0,0 +1,811 @@
+import asyncio
+import functools
+import json
+import struct
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Type
+from urllib.parse import quote, urlencode
+
+import docker
+from docker import auth
+from docker.utils import parse_repository_tag
+
+from inferadmin.common.async_utils import get_io_executor
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+
+# Content type of a non-TTY log body, whose stdout and stderr are framed
+MULTIPLEXED_STREAM = "application/vnd.docker.multiplexed-stream"
+
+# First API version that labels log bodies with their framing
+LOG_CONTENT_TYPE_VERSION = (1, 42)
+
+
+class EngineContainer:
+    """Container as returned by the Engine API, shaped like docker-py's Container."""
+
+    def __init__(self, attrs: Dict[str, Any]):
+        self.attrs = attrs
+
+    @property
+    def id(self) -> str:
+        return self.attrs.get("Id") or self.attrs.get("ID", "")
+
+    @property
+    def status(self) -> str:
+        state = self.attrs.get("State")
+        if isinstance(state, dict):
+            return state.get("Status", "unknown")
+        return state or "unknown"
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        config = self.attrs.get("Config") or {}
+        return config.get("Labels") or self.attrs.get("Labels") or {}
+
+
+class EngineImage:
+    """Image as returned by the Engine API, shaped like docker-py's Image."""
+
+    def __init__(self, attrs: Dict[str, Any]):
+        self.attrs = attrs
+
+    @property
+    def id(self) -> str:
+        return self.attrs.get("Id") or self.attrs.get("ID", "")
+
+    @property
+    def tags(self) -> List[str]:
+        tags = self.attrs.get("RepoTags") or []
+        return [tag for tag in tags if tag != "<none>:<none>"]
+
+
+class _Response:
+    """Status line and headers of an HTTP response whose body is still unread."""
+
+    def __init__(self, method: str, status: int, headers: Dict[str, str], reader: asyncio.StreamReader):
+        self.status = status
+        self.headers = headers
+        self.reader = reader
+        self.keep_alive = headers.get("connection", "").lower() != "close"
+        # Responses that never carry a body are complete once the headers are read
+        self.complete = method == "HEAD" or status in (204, 304) or status < 200
+
+    @property
+    def reusable(self) -> bool:
+        """Whether the connection can serve another request."""
+        return self.keep_alive and self.complete
+
+    @property
+    def chunked(self) -> bool:
+        return "chunked" in self.headers.get("transfer-encoding", "").lower()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield the body as it arrives, honouring the response framing."""
+        if self.complete:
+            return
+        if self.chunked:
+            while True:
+                size_line = await self.reader.readline()
+                if not size_line:
+                    raise ConnectionResetError("connection closed mid-body")
+                size = int(size_line.split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    self.complete = True
+                    return
+                data = await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+                yield data
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                data = await self.reader.read(min(remaining, 65536))
+                if not data:
+                    raise ConnectionResetError("connection closed mid-body")
+                remaining -= len(data)
+                yield data
+            self.complete = True
+        else:
+            # Body runs until the server closes the connection
+            self.keep_alive = False
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    return
+                yield data
+
+    async def read(self) -> bytes:
+        """Read the whole body."""
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def iter_lines(self) -> AsyncIterator[bytes]:
+        """Yield newline-delimited records from the body."""
+        buffer = b""
+        async for chunk in self.iter_chunks():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+
+    async def iter_json(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield decoded JSON objects from a newline-delimited JSON body."""
+        async for line in self.iter_lines():
+            yield json.loads(line)
+
+
+def demux_log_stream(data: bytes) -> Tuple[bytes, bytes]:
+    """
+    Strip the stream framing from a multiplexed (non-TTY) log body.
+
+    Each frame is an 8-byte header (stream type, 3 padding bytes, big-endian
+    length) followed by the payload.
+
+    Returns:
+        The payload of every complete frame, and any trailing partial frame
+    """
+    output = bytearray()
+    offset = 0
+    while len(data) - offset >= 8:
+        _, length = struct.unpack(">BxxxL", data[offset : offset + 8])
+        if len(data) - offset - 8 < length:
+            break
+        output += data[offset + 8 : offset + 8 + length]
+        offset += 8 + length
+    return bytes(output), data[offset:]
+
+
+def api_version_at_least(version: Optional[str], minimum: Tuple[int, int]) -> bool:
+    """Whether an ``Api-Version`` header value is at least ``minimum``."""
+    try:
+        major, minor = (int(part) for part in (version or "").split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= minimum
+
+
+async def iterate_in_thread(iterable: Iterable[Any]) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterable on a dedicated daemon thread.
+
+    Items are handed to the event loop as they arrive. Closing the async
+    iterator closes the underlying iterable if it supports ``close()``.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop has shut down
+            pass
+
+    def pump() -> None:
+        try:
+            for item in iterable:
+                put(item)
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+
+    threading.Thread(target=pump, name="inferadmin-docker-stream", daemon=True).start()
+    try:
+        while (item := await queue.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class AsyncDockerEngine:
+    """
+    Asyncio-native client for the Docker Engine API over its unix socket.
+
+    Requests reuse a pool of keep-alive HTTP/1.1 connections instead of
+    blocking an IO-pool thread per call, so concurrency is bounded only by
+    ``max_connections``. Errors are raised as docker-py exceptions so
+    callers can handle both clients the same way. Registry credentials are
+    read from the Docker config (``~/.docker/config.json`` and credential
+    helpers) like docker-py does, and sent with pulls and registry lookups.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_connections: int = 64,
+        timeout: float = 60.0,
+    ):
+        """
+        Initialize the client; connections are opened lazily.
+
+        Args:
+            socket_path: Path of the Docker daemon's unix socket
+            max_connections: Maximum number of concurrent connections
+            timeout: Default per-request timeout in seconds
+        """
+        self.socket_path = socket_path
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        # Docker config with registry credentials, loaded on first use
+        self._auth_configs: Optional[auth.AuthConfig] = None
+
+    # Connection pool
+
+    async def _acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Take a pooled connection, opening one if none are idle."""
+        await self._slots.acquire()
+
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=2**20)
+        except BaseException:
+            self._slots.release()
+            raise
+        return reader, writer, False
+
+    def _release(self, reader, writer, reusable: bool) -> None:
+        """Return a connection to the pool, or close it."""
+        if reusable and not writer.is_closing():
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    # HTTP
+
+    @staticmethod
+    def _target(path: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build the request target, dropping parameters that are None."""
+        if params:
+            query = urlencode(
+                {
+                    key: (int(value) if isinstance(value, bool) else value)
+                    for key, value in params.items()
+                    if value is not None
+                }
+            )
+            if query:
+                return f"{path}?{query}"
+        return path
+
+    async def _send(
+        self,
+        reader,
+        writer,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> _Response:
+        """Write one request and read the status line and headers."""
+        head = f"{method} {target} HTTP/1.1\r\nHost: docker\r\nUser-Agent: inferadmin\r\n"
+        for name, value in (headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        elif method in ("POST", "PUT"):
+            head += "Content-Length: 0\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        status = int(status_line.split(b" ", 2)[1])
+
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        return _Response(method, status, response_headers, reader)
+
+    @asynccontextmanager
+    async def _exchange(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        not_found: Type[docker.errors.APIError] = docker.errors.NotFound,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[_Response]:
+        """Perform a request on a pooled connection and yield the open response."""
+        target = self._target(path, params)
+        payload = json.dumps(body).encode() if body is not None else None
+
+        reader, writer, reused = await self._acquire()
+        try:
+            response = await self._send(reader, writer, method, target, payload, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self._release(reader, writer, False)
+            if not reused:
+                raise
+            # A pooled connection went stale; retry once on a fresh one
+            reader, writer, reused = await self._acquire()
+            try:
+                response = await self._send(reader, writer, method, target, payload, headers)
+            except BaseException:
+                self._release(reader, writer, False)
+                raise
+        except BaseException:
+            self._release(reader, writer, False)
+            raise
+
+        try:
+            if response.status >= 400:
+                raw = await response.read()
+                try:
+                    message = json.loads(raw).get("message", "")
+                except ValueError:
+                    message = raw.decode("utf-8", "replace")
+                error_cls = not_found if response.status == 404 else docker.errors.APIError
+                raise error_cls(f"{response.status} {method} {path}", explanation=message)
+
+            yield response
+        except BaseException:
+            # Leave no half-read body on a pooled connection
+            self._release(reader, writer, False)
+            raise
+        else:
+            self._release(reader, writer, response.reusable)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        not_found: Type[docker.errors.APIError] = docker.errors.NotFound,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> bytes:
+        """
+        Perform a request and return the whole response body.
+
+        Raises:
+            docker.errors.NotFound: (or ``not_found``) on a 404 response
+            docker.errors.APIError: on any other error response
+        """
+
+        async def _do() -> bytes:
+            async with self._exchange(
+                method, path, params, body, not_found, headers
+            ) as response:
+                return await response.read()
+
+        return await asyncio.wait_for(_do(), timeout=timeout or self.timeout)
+
+    async def request_json(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Perform a request and decode its JSON body."""
+        raw = await self.request(method, path, **kwargs)
+        return json.loads(raw) if raw else None
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        not_found: Type[docker.errors.APIError] = docker.errors.NotFound,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Open a streaming request; use as ``async with engine.stream(...) as response``."""
+        return self._exchange(method, path, params, body, not_found, headers)
+
+    # Registry credentials
+
+    def _config_header(self, reference: str) -> Optional[str]:
+        """The encoded credentials for the registry of a reference, like docker-py's."""
+        if self._auth_configs is None or self._auth_configs.is_empty:
+            self._auth_configs = auth.load_config()
+        registry, _ = auth.resolve_repository_name(reference)
+        authcfg = auth.resolve_authconfig(self._auth_configs, registry)
+        # Anonymous access may still work, e.g. for public images
+        return auth.encode_header(authcfg).decode("ascii") if authcfg else None
+
+    async def _registry_headers(self, reference: str) -> Dict[str, str]:
+        """
+        Request headers carrying registry credentials for a reference.
+
+        Resolving can run a credential helper, so it happens on the IO thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        header = await loop.run_in_executor(get_io_executor(), self._config_header, reference)
+        return {"X-Registry-Auth": header} if header else {}
+
+    # Containers
+
+    async def containers_list(
+        self, all: bool = False, filters: Optional[Dict[str, Any]] = None
+    ) -> List[EngineContainer]:
+        """List containers (summary records, like docker-py's ``sparse=True``)."""
+        params = {"all": all, "filters": json.dumps(filters) if filters else None}
+        items = await self.request_json("GET", "/containers/json", params=params)
+        return [EngineContainer(item) for item in items]
+
+    async def containers_get(self, container_id: str) -> EngineContainer:
+        """Inspect a container."""
+        attrs = await self.request_json("GET", f"/containers/{quote(container_id, safe='')}/json")
+        return EngineContainer(attrs)
+
+    async def containers_run(
+        self,
+        image: str,
+        name: Optional[str] = None,
+        environment: Optional[Dict[str, str]] = None,
+        ports: Optional[Dict[str, Any]] = None,
+        volumes: Optional[Dict[str, Dict[str, str]]] = None,
+        labels: Optional[Dict[str, str]] = None,
+        gpu_uuids: Optional[List[str]] = None,
+    ) -> EngineContainer:
+        """Create and start a detached container, mirroring docker-py's ``run``."""
+        exposed_ports: Dict[str, Dict] = {}
+        port_bindings: Dict[str, List[Dict[str, str]]] = {}
+        for container_port, binding in (ports or {}).items():
+            if "/" not in container_port:
+                container_port = f"{container_port}/tcp"
+            exposed_ports[container_port] = {}
+            if binding is None:
+                port_bindings[container_port] = [{}]
+            elif isinstance(binding, tuple):
+                port_bindings[container_port] = [
+                    {"HostIp": binding[0], "HostPort": str(binding[1])}
+                ]
+            else:
+                port_bindings[container_port] = [{"HostPort": str(binding)}]
+
+        host_config: Dict[str, Any] = {
+            "PortBindings": port_bindings,
+            "Binds": [
+                f"{source}:{spec['bind']}:{spec.get('mode', 'rw')}"
+                for source, spec in (volumes or {}).items()
+            ],
+        }
+        if gpu_uuids:
+            host_config["DeviceRequests"] = [
+                {"Driver": "", "Count": 0, "DeviceIDs": gpu_uuids, "Capabilities": [["gpu"]]}
+            ]
+
+        body = {
+            "Image": image,
+            "Env": [f"{key}={value}" for key, value in (environment or {}).items()],
+            "Labels": labels or {},
+            "ExposedPorts": exposed_ports,
+            "HostConfig": host_config,
+        }
+        create = functools.partial(
+            self.request_json,
+            "POST",
+            "/containers/create",
+            params={"name": name},
+            body=body,
+            not_found=docker.errors.ImageNotFound,
+        )
+        try:
+            created = await create()
+        except docker.errors.ImageNotFound:
+            # Pull a missing image and try again, as docker-py's run does
+            async for _ in self.images_pull(image):
+                pass
+            created = await create()
+        await self.containers_start(created["Id"])
+        return await self.containers_get(created["Id"])
+
+    async def containers_start(self, container_id: str) -> None:
+        """Start a container; starting a running container is a no-op."""
+        await self.request("POST", f"/containers/{quote(container_id, safe='')}/start")
+
+    async def containers_stop(self, container_id: str, timeout: int = 10) -> None:
+        """Stop a container, waiting up to ``timeout`` seconds before killing it."""
+        await self.request(
+            "POST",
+            f"/containers/{quote(container_id, safe='')}/stop",
+            params={"t": timeout},
+            timeout=self.timeout + timeout,
+        )
+
+    async def containers_remove(self, container_id: str, force: bool = False) -> None:
+        """Remove a container."""
+        await self.request(
+            "DELETE", f"/containers/{quote(container_id, safe='')}", params={"force": force}
+        )
+
+    async def containers_logs(
+        self,
+        container_id: str,
+        tail: int | str = "all",
+        since: Optional[int] = None,
+        timestamps: bool = True,
+    ) -> bytes:
+        """Fetch stdout and stderr of a container."""
+
+        async def _do() -> bytes:
+            async with self.stream(
+                "GET",
+                f"/containers/{quote(container_id, safe='')}/logs",
+                params={
+                    "stdout": True,
+                    "stderr": True,
+                    "timestamps": timestamps,
+                    "tail": tail,
+                    "since": since if since else None,
+                },
+            ) as response:
+                raw = await response.read()
+                tty = await self._logs_tty(container_id, response)
+            if tty:
+                return raw
+            output, _ = demux_log_stream(raw)
+            return output
+
+        return await asyncio.wait_for(_do(), timeout=self.timeout)
+
+    async def _logs_tty(self, container_id: str, response: _Response) -> bool:
+        """
+        Whether a log body is raw TTY output rather than framed stdout/stderr.
+
+        The daemon labels the framing since API 1.42; older daemons label both
+        kinds the same, so the container has to be inspected.
+        """
+        if response.headers.get("content-type") == MULTIPLEXED_STREAM:
+            return False
+        if api_version_at_least(response.headers.get("api-version"), LOG_CONTENT_TYPE_VERSION):
+            return True
+        container = await self.containers_get(container_id)
+        return bool(container.attrs.get("Config", {}).get("Tty"))
+
+    async def containers_logs_stream(
+        self,
+        container_id: str,
+        tail: int | str = "all",
+        since: Optional[int] = None,
+        timestamps: bool = True,
+        follow: bool = True,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream stdout and stderr of a container as they are written.
+
+        Yields raw output chunks; a chunk may end in the middle of a line.
+        """
+        async with self.stream(
+            "GET",
+            f"/containers/{quote(container_id, safe='')}/logs",
+            params={
+                "stdout": True,
+                "stderr": True,
+                "timestamps": timestamps,
+                "tail": tail,
+                "since": since if since else None,
+                "follow": follow,
+            },
+        ) as response:
+            tty = await self._logs_tty(container_id, response)
+            pending = b""
+            async for chunk in response.iter_chunks():
+                if tty:
+                    yield chunk
+                    continue
+                output, pending = demux_log_stream(pending + chunk)
+                if output:
+                    yield output
+
+    # Images
+
+    async def images_list(self) -> List[EngineImage]:
+        """List images (summary records)."""
+        items = await self.request_json("GET", "/images/json")
+        return [EngineImage(item) for item in items]
+
+    async def images_get(self, name: str) -> EngineImage:
+        """Inspect an image by ID or reference."""
+        attrs = await self.request_json(
+            "GET", f"/images/{quote(name, safe='/:')}/json", not_found=docker.errors.ImageNotFound
+        )
+        return EngineImage(attrs)
+
+    async def images_pull(self, reference: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Pull an image, yielding the daemon's progress records.
+
+        Raises:
+            docker.errors.APIError: if the daemon reports an error mid-stream
+        """
+        repository, tag = parse_repository_tag(reference)
+        async with self.stream(
+            "POST",
+            "/images/create",
+            params={"fromImage": repository, "tag": tag or "latest"},
+            not_found=docker.errors.ImageNotFound,
+            headers=await self._registry_headers(repository),
+        ) as response:
+            async for progress in response.iter_json():
+                if "error" in progress:
+                    raise docker.errors.APIError(
+                        f"pull {reference}", explanation=progress["error"]
+                    )
+                yield progress
+
+    async def images_tag(self, image: str, repository: str, tag: Optional[str] = None) -> None:
+        """Tag an image."""
+        await self.request(
+            "POST",
+            f"/images/{quote(image, safe='/:')}/tag",
+            params={"repo": repository, "tag": tag},
+            not_found=docker.errors.ImageNotFound,
+        )
+
+    async def images_remove(self, image: str, force: bool = False) -> None:
+        """Remove an image."""
+        await self.request(
+            "DELETE",
+            f"/images/{quote(image, safe='/:')}",
+            params={"force": force},
+            not_found=docker.errors.ImageNotFound,
+        )
+
+    async def distribution_inspect(self, reference: str) -> Dict[str, Any]:
+        """Ask the registry for the manifest descriptor of a reference, without pulling it."""
+        repository, _ = parse_repository_tag(reference)
+        return await self.request_json(
+            "GET",
+            f"/distribution/{quote(reference, safe='/:@')}/json",
+            not_found=docker.errors.ImageNotFound,
+            headers=await self._registry_headers(repository),
+        )
+
+
+class DockerPyEngine:
+    """
+    Fallback with the same interface as AsyncDockerEngine, backed by docker-py.
+
+    Used when the daemon isn't reachable over a local unix socket. Every call
+    runs the blocking docker-py method on the IO thread pool.
+    """
+
+    def __init__(self, client: docker.DockerClient):
+        self.client = client
+
+    async def _call(self, func, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking docker-py call on the IO thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_io_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    async def close(self) -> None:
+        """Nothing to release; docker-py manages its own connections."""
+
+    async def containers_list(self, all: bool = False, filters: Optional[Dict[str, Any]] = None):
+        return await self._call(self.client.containers.list, all=all, sparse=True, filters=filters)
+
+    async def containers_get(self, container_id: str):
+        return await self._call(self.client.containers.get, container_id)
+
+    async def containers_run(
+        self,
+        image: str,
+        name: Optional[str] = None,
+        environment: Optional[Dict[str, str]] = None,
+        ports: Optional[Dict[str, Any]] = None,
+        volumes: Optional[Dict[str, Dict[str, str]]] = None,
+        labels: Optional[Dict[str, str]] = None,
+        gpu_uuids: Optional[List[str]] = None,
+    ):
+        device_requests = None
+        if gpu_uuids:
+            device_requests = [
+                docker.types.DeviceRequest(device_ids=gpu_uuids, capabilities=[["gpu"]])
+            ]
+        return await self._call(
+            self.client.containers.run,
+            image,
+            detach=True,
+            environment=environment or {},
+            ports=ports or {},
+            volumes=volumes or {},
+            name=name,
+            labels=labels or {},
+            device_requests=device_requests,
+        )
+
+    async def containers_start(self, container_id: str) -> None:
+        await self._call(self.client.api.start, container_id)
+
+    async def containers_stop(self, container_id: str, timeout: int = 10) -> None:
+        await self._call(self.client.api.stop, container_id, timeout=timeout)
+
+    async def containers_remove(self, container_id: str, force: bool = False) -> None:
+        await self._call(self.client.api.remove_container, container_id, force=force)
+
+    async def containers_logs(
+        self,
+        container_id: str,
+        tail: int | str = "all",
+        since: Optional[int] = None,
+        timestamps: bool = True,
+    ) -> bytes:
+        return await self._call(
+            self.client.api.logs, container_id, tail=tail, since=since, timestamps=timestamps
+        )
+
+    async def containers_logs_stream(
+        self,
+        container_id: str,
+        tail: int | str = "all",
+        since: Optional[int] = None,
+        timestamps: bool = True,
+        follow: bool = True,
+    ) -> AsyncIterator[bytes]:
+        stream = await self._call(
+            self.client.api.logs,
+            container_id,
+            stream=True,
+            follow=follow,
+            tail=tail,
+            since=since,
+            timestamps=timestamps,
+        )
+        # A follow stream can block indefinitely, so it gets its own thread
+        async for chunk in iterate_in_thread(stream):
+            yield chunk
+
+    async def images_list(self):
+        return await self._call(self.client.images.list)
+
+    async def images_get(self, name: str):
+        return await self._call(self.client.images.get, name)
+
+    async def images_pull(self, reference: str) -> AsyncIterator[Dict[str, Any]]:
+        repository, tag = parse_repository_tag(reference)
+        progress = await self._call(
+            self.client.api.pull, repository, tag=tag or "latest", stream=True, decode=True
+        )
+        # Advance the blocking generator one record at a time off the loop
+        while True:
+            record = await self._call(next, progress, None)
+            if record is None:
+                return
+            if "error" in record:
+                raise docker.errors.APIError(f"pull {reference}", explanation=record["error"])
+            yield record
+
+    async def images_tag(self, image: str, repository: str, tag: Optional[str] = None) -> None:
+        await self._call(self.client.api.tag, image, repository, tag=tag)
+
+    async def images_remove(self, image: str, force: bool = False) -> None:
+        await self._call(self.client.api.remove_image, image, force=force)
+
+    async def distribution_inspect(self, reference: str) -> Dict[str, Any]:
+        return await self._call(self.client.api.inspect_distribution, reference)
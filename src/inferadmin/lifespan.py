@@ -5,6 +5,23 @@ from inferadmin.config.loader import config_manager
 from inferadmin.docker import DockerManager
 from inferadmin.common.async_utils import init_thread_pools
 from inferadmin.common.logging import logger, setup_logger
+from inferadmin.common.log_store import log_store
+from inferadmin.common.log_followers import log_follow_hub
+from inferadmin.common.container_status import container_status_watcher
+from inferadmin.common.readiness import readiness_monitor
+from inferadmin.routes.applications.support import deployed_models, resume_readiness_tracking
+from inferadmin.routes.models.index import model_index
+from inferadmin.routes.models.downloads import model_downloads
+from inferadmin.routes.models.blobs import blob_store
+from inferadmin.routes.models.prewarm import model_prewarmer
+from inferadmin.routes.models.trash import model_reaper
+from inferadmin.routes.models.quota import model_quota
+from inferadmin.routes.models.transfer import bandwidth_limiter
+from inferadmin.routes.infra.gpus.telemetry import gpu_telemetry
+from inferadmin.routes.images.inventory import image_inventory
+from inferadmin.routes.images.pull_jobs import image_pull_jobs
+from inferadmin.routes.images.prepull import image_prepull_scheduler
+from inferadmin.state.manager import StateManager
 
 
 @asynccontextmanager
@@ -25,12 +42,99 @@ async def lifespan(app: FastAPI):
         cpu_pool_size=config.cpu_thread_pool_size
     )
     
+    # Select the state backend before any manager loads its records
+    StateManager.configure(config.state_backend)
+    await StateManager.load_all()
+
+    log_store.max_lines = config.container_log_buffer_lines
+    log_follow_hub.max_followers_per_container = config.log_followers_per_container
+    log_follow_hub.queue_size = config.log_follower_queue_lines
+
+    # Index the model volume, reusing entries whose folders haven't changed
+    model_index.volume_path = config.model_storage_path
+    model_index.rescan_interval = config.model_index_rescan_interval
+    model_index.poll_interval = config.model_index_poll_interval
+    await model_index.start()
+
+    # Store files shared between models once
+    blob_store.volume_path = config.model_storage_path
+    blob_store.enabled = config.model_dedup
+
+    # Reclaim deleted models in the background, resuming after a restart
+    model_reaper.volume_path = config.model_storage_path
+    model_reaper.rate = config.model_trash_reclaim_mb * 1024 * 1024
+    await model_reaper.start()
+
+    # Read models into the page cache before their engines start
+    model_prewarmer.workers = config.model_prewarm_workers
+    model_prewarmer.chunk_size = config.model_prewarm_chunk_mb * 1024 * 1024
+
+    # Keep model storage under quota by evicting unused models
+    model_quota.volume_path = config.model_storage_path
+    model_quota.quota = int(config.model_storage_quota_gb * 1024**3)
+    model_quota.high_watermark = config.model_storage_high_watermark
+    model_quota.low_watermark = config.model_storage_low_watermark
+    model_quota.in_use = deployed_models
+
+    # Run model downloads in the background, resuming interrupted ones
+    model_downloads.concurrency = config.model_download_concurrency
+    model_downloads.workers = config.model_download_workers
+    model_downloads.chunk_size = config.model_download_chunk_mb * 1024 * 1024
+    bandwidth_limiter.rate = config.model_download_bandwidth_mb * 1024 * 1024
+    await model_downloads.start()
+
     # Initialize docker client
-    DockerManager.init()
-    logger.info("Docker client initialized")
+    DockerManager.init(
+        use_async_engine=config.docker_async_client,
+        max_connections=config.docker_max_connections,
+    )
+    logger.info(f"Docker client initialized ({type(DockerManager.engine).__name__})")
+
+    # Sample GPU state in the background instead of per request
+    gpu_telemetry.interval = config.gpu_refresh_interval
+    gpu_telemetry.history = config.gpu_history_samples
+    gpu_telemetry.backend = config.gpu_telemetry_backend
+    await gpu_telemetry.start()
+
+    # Track managed container statuses from the Docker events stream
+    container_status_watcher.refresh_interval = config.container_refresh_interval
+    await container_status_watcher.start()
+
+    # Probe deployments until they serve; pick up those still starting
+    readiness_monitor.probe_host = config.readiness_probe_host
+    readiness_monitor.probe_path = config.readiness_probe_path
+    readiness_monitor.max_backoff = config.readiness_max_backoff
+    readiness_monitor.timeout = config.readiness_timeout
+    resume_readiness_tracking()
+
+    # Keep the managed image inventory current from Docker image events
+    await image_inventory.start()
+    image_pull_jobs.concurrency = config.image_pull_concurrency
+
+    # Keep configured images pre-pulled, refreshed in the quiet window
+    image_prepull_scheduler.references = config.image_prepull_references
+    image_prepull_scheduler.window = config.image_prepull_window
+    await image_prepull_scheduler.start()
 
     yield  # run fastapi app
     
+    await image_prepull_scheduler.stop()
+    await image_pull_jobs.close()
+    await image_inventory.stop()
+    await readiness_monitor.close()
+    await container_status_watcher.stop()
+    await gpu_telemetry.stop()
+    await log_follow_hub.close()
+    await DockerManager.close()
+    await model_downloads.close()
+    await model_reaper.stop()
+    await blob_store.stop()
+    await model_prewarmer.close()
+    await model_index.stop()
+
+    # Flush pending state writes while the IO pool is still available
+    await StateManager.close_all()
+
     # Graceful shutdown: Clean up thread pools
     from inferadmin.common.async_utils import _io_executor, _cpu_executor
     
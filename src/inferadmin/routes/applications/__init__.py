@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Query
+from typing import Optional
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from inferadmin.common.sse import SSE_HEADERS
 from .models import (
     GetApplicationsResponse,
     PostApplicationRequest,
     GetApplicationLogsResponse,
     DeleteApplicationRequest,
     ApplicationIdRequest,
+    BulkApplicationRequest,
+    BulkApplicationResponse,
 )
 from .support import (
     get_all_applications,
     deploy_application,
     delete_application,
     get_container_logs,
+    follow_container_logs,
     stop_container,
     start_container,
+    resolve_bulk_targets,
+    run_bulk,
+    wait_for_ready,
 )
+from inferadmin.common.readiness import DeploymentReadiness
 
 router = APIRouter(prefix="/applications")
 
@@ -21,7 +31,7 @@ router = APIRouter(prefix="/applications")
 @router.get("/list")
 async def get_applications() -> GetApplicationsResponse:
     """Get all applications."""
-    applications = get_all_applications()
+    applications = await get_all_applications()
     return GetApplicationsResponse(applications=applications)
 
 
@@ -35,6 +45,8 @@ async def post_applications(data: PostApplicationRequest):
         host_port=data.host_port,
         environment=data.environment,
         gpu_uuids=data.gpu_uuids,
+        model=data.model,
+        prewarm=data.prewarm,
     )
     return application
 
@@ -46,10 +58,39 @@ async def delete_applications(data: DeleteApplicationRequest) -> bool:
 
 
 @router.post("/logs")
-async def get_application_logs_by_id(data: ApplicationIdRequest, tail: int = Query(100, description="Number of log lines to return")) -> GetApplicationLogsResponse:
+async def get_application_logs_by_id(
+    data: ApplicationIdRequest,
+    tail: int = Query(100, description="Number of log lines to return"),
+    since: Optional[str] = Query(None, description="Cursor from a previous response; only newer lines are returned"),
+) -> GetApplicationLogsResponse:
     """Get logs for a specific application by its container ID."""
-    logs = await get_container_logs(data.id, tail=tail)
-    return GetApplicationLogsResponse(id=data.id, logs=logs)
+    logs, cursor = await get_container_logs(data.id, tail=tail, since=since)
+    return GetApplicationLogsResponse(id=data.id, logs=logs, cursor=cursor)
+
+
+@router.get("/logs/stream")
+async def stream_application_logs(
+    id: str = Query(..., description="Container ID of the application"),
+    tail: int = Query(100, description="Number of earlier log lines to send first"),
+    since: Optional[str] = Query(None, description="Cursor to resume from; only newer lines are sent"),
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """Follow logs of an application as server-sent events."""
+    events = await follow_container_logs(id, tail=tail, since=since or last_event_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/wait")
+async def wait_for_application(
+    id: str = Query(..., description="Container ID of the application"),
+    timeout: float = Query(30, ge=0, le=300, description="Seconds to wait before returning the current state"),
+) -> DeploymentReadiness:
+    """Wait until an application is serving, has failed, or the timeout passes."""
+    return await wait_for_ready(id, timeout)
 
 
 @router.post("/start")
@@ -61,4 +102,25 @@ async def start_application(data: ApplicationIdRequest) -> bool:
 @router.post("/stop")
 async def stop_application(data: ApplicationIdRequest) -> bool:
     """Stop a running application by its container ID."""
-    return await stop_container(data.id)
\ No newline at end of file
+    return await stop_container(data.id)
+
+
+@router.post("/bulk/start")
+async def bulk_start_applications(data: BulkApplicationRequest) -> BulkApplicationResponse:
+    """Start many applications concurrently."""
+    ids = await resolve_bulk_targets(data.ids, data.labels)
+    return await run_bulk(ids, start_container, data.concurrency)
+
+
+@router.post("/bulk/stop")
+async def bulk_stop_applications(data: BulkApplicationRequest) -> BulkApplicationResponse:
+    """Stop many applications concurrently."""
+    ids = await resolve_bulk_targets(data.ids, data.labels)
+    return await run_bulk(ids, stop_container, data.concurrency)
+
+
+@router.post("/bulk/delete")
+async def bulk_delete_applications(data: BulkApplicationRequest) -> BulkApplicationResponse:
+    """Delete many applications concurrently."""
+    ids = await resolve_bulk_targets(data.ids, data.labels)
+    return await run_bulk(ids, delete_application, data.concurrency)
@@ -12,7 +12,10 @@ class Application(BaseModel):
     deployed: datetime
     host_port: int
     gpu_uuids: Optional[list[str]] = None
-    logs: Optional[str] = None
+    model: Optional[str] = Field(None, description="Repository of the model the deployment serves")
+    prewarm: bool = True
+    ready: Optional[datetime] = None
+    time_to_ready: Optional[float] = Field(None, description="Seconds from deployment to the first successful probe")
 
 
 class GetApplicationsResponse(BaseModel):
@@ -26,11 +29,18 @@ class PostApplicationRequest(BaseModel):
     host_port: int = Field(..., description="Port to expose on the host")
     environment: Optional[Dict[str, Any]] = None
     gpu_uuids: Optional[list[str]] = None
+    model: Optional[str] = Field(None, description="Repository of the model the deployment serves")
+    prewarm: bool = Field(
+        True, description="Read the model into the page cache in the background on each container start"
+    )
 
 
 class GetApplicationLogsResponse(BaseModel):
     id: str
     logs: str
+    cursor: Optional[str] = Field(
+        None, description="Timestamp of the last returned line; pass as `since` to fetch only newer lines"
+    )
 
 
 class DeleteApplicationRequest(BaseModel):
@@ -38,4 +48,26 @@ class DeleteApplicationRequest(BaseModel):
 
 
 class ApplicationIdRequest(BaseModel):
-    id: str
\ No newline at end of file
+    id: str
+
+
+class BulkApplicationRequest(BaseModel):
+    ids: Optional[list[str]] = Field(None, description="Container IDs of the applications to act on")
+    labels: Optional[Dict[str, str]] = Field(
+        None, description="Select every application whose container carries all of these labels"
+    )
+    concurrency: Optional[int] = Field(
+        None, ge=1, description="Operations to run at once; defaults to the configured limit"
+    )
+
+
+class BulkItemResult(BaseModel):
+    id: str
+    success: bool
+    detail: Optional[str] = None
+    duration_ms: float
+
+
+class BulkApplicationResponse(BaseModel):
+    results: list[BulkItemResult]
+    duration_ms: float
@@ -1,4 +1,6 @@
-from typing import Dict
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from fastapi import HTTPException
 from datetime import datetime
 from loguru import logger
@@ -11,9 +13,23 @@ from inferadmin.common.container_management import (
     start_container as start_container_base,
     run_container,
 )
+from inferadmin.common.container_status import container_status_watcher
+from inferadmin.common.readiness import CONTAINER_GONE, DeploymentReadiness, readiness_monitor
+from inferadmin.common.log_followers import log_follow_hub, LogFollowerLagged
+from inferadmin.common.log_store import (
+    LogLine,
+    log_store,
+    parse_log_timestamp,
+    split_log_lines,
+    join_log_lines,
+)
+from inferadmin.common.sse import SSE_KEEPALIVE, sse_event, with_heartbeat
 from inferadmin.state.manager import StateManager
 from inferadmin.state import STATE_DIR
-from .models import Application
+from inferadmin.config.loader import config_manager
+from inferadmin.routes.models.prewarm import model_prewarmer
+from inferadmin.routes.models.quota import model_quota
+from .models import Application, BulkItemResult, BulkApplicationResponse
 
 # Create state manager for applications
 app_manager = StateManager(STATE_DIR, "applications.json", Application)
@@ -26,6 +42,8 @@ async def deploy_application(
     host_port: int,
     environment: Dict[str, str] = None,
     gpu_uuids: list[str] = None,
+    model: Optional[str] = None,
+    prewarm: bool = True,
 ) -> Application:
     """Deploy an application container with explicit configuration."""
     ports = {}
@@ -51,6 +69,9 @@ async def deploy_application(
         raise HTTPException(
             status_code=400, detail=f"Unsupported application type: {app_type}"
         )
+    if model is not None and prewarm:
+        _start_prewarm(model)
+
     try:
         # Launch container using common utility
         container = await run_container(
@@ -62,6 +83,8 @@ async def deploy_application(
             gpu_uuids=gpu_uuids,
             labels=labels,
         )
+        if model is not None:
+            await model_quota.record_use(model, deployed=True)
 
         # Create application record
         application = Application(
@@ -72,10 +95,13 @@ async def deploy_application(
             deployed=datetime.now(),
             host_port=host_port,
             gpu_uuids=gpu_uuids,
+            model=model,
+            prewarm=prewarm,
         )
 
         # Save to state
-        app_manager.add(application)
+        await app_manager.add(application)
+        _watch_readiness(application)
 
         return application
 
@@ -88,7 +114,7 @@ async def deploy_application(
         )
 
 
-def get_all_applications() -> list[Application]:
+async def get_all_applications() -> list[Application]:
     """Get all applications with current status."""
     applications = app_manager.get_all()
 
@@ -96,6 +122,12 @@ def get_all_applications() -> list[Application]:
     if not applications:
         return applications
 
+    # Serve statuses from the events-fed table once it has synced
+    if container_status_watcher.synced:
+        for app in applications:
+            app.state = _with_readiness(app.id, container_status_watcher.get(app.id))
+        return applications
+
     # Collect all container IDs
     container_ids = [app.id for app in applications if hasattr(app, "id") and app.id]
     
@@ -103,7 +135,7 @@ def get_all_applications() -> list[Application]:
     if container_ids:
         try:
             # Get all containers at once
-            containers = DockerManager.client.containers.list(all=True, filters={"id": container_ids})
+            containers = await DockerManager.get_engine().containers_list(all=True, filters={"id": container_ids})
             
             # Create a map of container ID to status
             container_status = {
@@ -114,13 +146,13 @@ def get_all_applications() -> list[Application]:
             for app in applications:
                 if hasattr(app, "id") and app.id:
                     # Use status from map or "not_found" if container no longer exists
-                    app.state = container_status.get(app.id, "not_found")
+                    app.state = _with_readiness(app.id, container_status.get(app.id, "not_found"))
         except Exception as e:
             logger.error(f"fetching container statuses: {e}")
             # Fall back to individual status checks if batch operation fails
             for app in applications:
                 if hasattr(app, "id") and app.id:
-                    app.state = get_container_status(app.id)
+                    app.state = _with_readiness(app.id, await get_container_status(app.id))
 
     return applications
 
@@ -137,14 +169,14 @@ async def delete_application(deployment_id: str) -> bool:
     # Stop and remove the container if it exists
     if hasattr(application, "id") and application.id:
         try:
-            container = DockerManager.client.containers.get(application.id)
+            container = await DockerManager.get_engine().containers_get(application.id)
             
             # Stop if running
             if container.status == "running":
                 await stop_container_base(application.id)
                 
             # Remove container
-            container.remove(force=True)  # does not kill volumes
+            await DockerManager.get_engine().containers_remove(application.id, force=True)  # does not kill volumes
         except Exception as e:
             # If it's already a HTTPException, re-raise it
             if isinstance(e, HTTPException):
@@ -154,27 +186,168 @@ async def delete_application(deployment_id: str) -> bool:
             )
 
     # Remove from state
-    app_manager.delete(deployment_id)
+    await app_manager.delete(deployment_id)
+    log_store.drop(deployment_id)
+    readiness_monitor.forget(deployment_id)
     return True
 
 
-async def get_container_logs(id: str, tail: int = 100) -> str:
+async def _record_ready(readiness: DeploymentReadiness) -> None:
+    """Store when an application first answered its probe."""
+    application = app_manager.get_by_id(readiness.id)
+    if application is None:
+        return
+    application.ready = readiness.ready
+    application.time_to_ready = readiness.time_to_ready
+    await app_manager.update(application)
+
+
+def _watch_readiness(application: Application, started: Optional[datetime] = None) -> DeploymentReadiness:
+    """Probe an application until it is serving."""
+    return readiness_monitor.watch(
+        application.id,
+        host_port=application.host_port,
+        started=started or application.deployed,
+        on_ready=_record_ready,
+    )
+
+
+def _with_readiness(id: str, container_state: str) -> str:
+    """Report a running container as "starting" until its readiness probe passes."""
+    readiness = readiness_monitor.get(id)
+    if container_state == "running" and readiness is not None and readiness.state == "starting":
+        return "starting"
+    return container_state
+
+
+def resume_readiness_tracking() -> None:
+    """Probe every application that hadn't become ready before a restart."""
+    for application in app_manager.get_all():
+        if application.ready is None:
+            _watch_readiness(application)
+
+
+async def wait_for_ready(id: str, timeout: float) -> DeploymentReadiness:
     """
-    Retrieve logs of a container and update application state.
-    
+    Wait until an application is ready, has failed, or ``timeout`` passes.
+
+    Applications not currently being probed are probed again, which settles
+    straight away for one that is already serving.
+    """
+    application = app_manager.get_by_id(id)
+    if application is None:
+        raise HTTPException(status_code=404, detail=f"Application not found: {id}")
+
+    readiness = readiness_monitor.get(id)
+    if readiness is None or readiness.state in ("failed", "timeout"):
+        _watch_readiness(application, started=datetime.now())
+    readiness = await readiness_monitor.wait(id, timeout)
+    if readiness is None:
+        raise HTTPException(status_code=404, detail=f"Application not found: {id}")
+    return readiness
+
+
+def _parse_log_cursor(since: str) -> int:
+    """
+    The log position a cursor stands for.
+
+    Raises:
+        HTTPException: 400 if the cursor isn't a log timestamp
+    """
+    try:
+        return parse_log_timestamp(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid log cursor: {since}")
+
+
+async def _fetch_log_lines(
+    id: str, tail: int = 100, since: Optional[str] = None
+) -> List[LogLine]:
+    """Fetch the last ``tail`` lines, or every line after the ``since`` cursor."""
+    if since:
+        position = _parse_log_cursor(since)
+        # Docker's since is inclusive and whole-second, so lines up to the cursor are filtered below
+        logs = await get_logs(id, tail="all", since=position // 1_000_000_000)
+        lines = [line for line in split_log_lines(logs) if line.position > position]
+    else:
+        lines = split_log_lines(await get_logs(id, tail=tail))
+
+    log_store.extend(id, lines)
+    return lines
+
+
+async def get_container_logs(
+    id: str, tail: int = 100, since: Optional[str] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Retrieve logs of a container and buffer them in the log store.
+
     Args:
         id: Container ID
-        tail: Number of log lines to return (default: 100)
+        tail: Number of log lines to return when no cursor is given (default: 100)
+        since: Cursor from a previous call; only lines after it are returned
+
+    Returns:
+        The log text and the cursor to pass on the next call
     """
-    logs = await get_logs(id, tail=tail)
-    
-    # Update logs in application state if it exists
-    application = app_manager.get_by_id(id)
-    if application:
-        application.logs = logs
-        app_manager.update(application)
-    
-    return logs
+    lines = await _fetch_log_lines(id, tail=tail, since=since)
+    cursor = lines[-1].timestamp if lines else since
+    return join_log_lines(lines), cursor
+
+
+async def follow_container_logs(
+    id: str, tail: int = 100, since: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Follow a container's logs as server-sent events.
+
+    The cursor, the container and the follower cap are all checked, and the
+    backfill fetched, before the response starts, so failures are reported
+    with their status code. The follower joins the container's shared Docker
+    log stream before the backfill is fetched, so nothing is missed in
+    between. Each line is sent with its timestamp as the event id, which
+    EventSource replays as ``Last-Event-ID`` on reconnect. A follower that
+    falls behind receives a ``lagged`` event with its cursor and is
+    disconnected; when the container stops an ``end`` event is sent.
+
+    Args:
+        id: Container ID
+        tail: Number of earlier lines to send first when no cursor is given
+        since: Cursor to resume from; only lines after it are sent
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid, 404 if the container
+            doesn't exist, 429 if it has too many followers
+    """
+    if since:
+        _parse_log_cursor(since)
+    if await get_container_status(id) == "not_found":
+        raise HTTPException(status_code=404, detail=f"Container {id} not found")
+
+    follow = log_follow_hub.open(id)
+    try:
+        backfill = await _fetch_log_lines(id, tail=tail, since=since)
+    except BaseException:
+        follow.close()
+        raise
+
+    async def events() -> AsyncIterator[str]:
+        cursor = since
+        try:
+            async for line in with_heartbeat(follow.lines(backfill)):
+                if line is None:
+                    yield SSE_KEEPALIVE
+                    continue
+                cursor = line.timestamp
+                yield sse_event(line.text, id=line.timestamp)
+        except LogFollowerLagged:
+            yield sse_event(cursor or "", event="lagged")
+            return
+        finally:
+            follow.close()
+        yield sse_event(cursor or "", event="end")
+
+    return events()
 
 
 async def stop_container(id: str) -> bool:
@@ -182,6 +355,123 @@ async def stop_container(id: str) -> bool:
     return await stop_container_base(id)
 
 
+def deployed_models() -> Set[str]:
+    """
+    Models that deployments which may be running serve.
+
+    Only deployments whose containers are known to have stopped don't
+    count; until the status table syncs, every deployment does.
+    """
+    models = set()
+    for application in app_manager.get_all():
+        if application.model is None:
+            continue
+        if container_status_watcher.synced:
+            status = container_status_watcher.get(application.id)
+            if status in CONTAINER_GONE or status == "not_found":
+                continue
+        models.add(application.model)
+    return models
+
+
+def _start_prewarm(repo_id: str) -> None:
+    """
+    Start reading a model into the page cache alongside its engine.
+
+    The request doesn't wait for it: the engine reads the same pages and
+    gets whatever is already cached. Failures only cost speed.
+    """
+    try:
+        model_prewarmer.submit(repo_id)
+    except HTTPException as e:
+        logger.warning(f"Not prewarming {repo_id}: {e.detail}")
+
+
 async def start_container(id: str) -> bool:
     """Start an existing container."""
-    return await start_container_base(id)
\ No newline at end of file
+    application = app_manager.get_by_id(id)
+    if application is not None and application.model is not None and application.prewarm:
+        _start_prewarm(application.model)
+
+    started = datetime.now()
+    result = await start_container_base(id)
+    if application is not None and application.model is not None:
+        await model_quota.record_use(application.model, deployed=True)
+    if application is not None:
+        readiness_monitor.forget(id)
+        _watch_readiness(application, started=started)
+    return result
+
+
+async def resolve_bulk_targets(
+    ids: Optional[List[str]] = None, labels: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """
+    Resolve a bulk request to application IDs.
+
+    Args:
+        ids: Explicit application (container) IDs
+        labels: Label selector matched against managed containers
+
+    Returns:
+        De-duplicated IDs, explicit ones first
+    """
+    if not ids and not labels:
+        raise HTTPException(status_code=400, detail="Provide ids and/or labels")
+
+    targets = list(ids or [])
+    if labels:
+        label_filters = ["managed-by=inferadmin"] + [
+            f"{key}={value}" for key, value in labels.items()
+        ]
+        containers = await DockerManager.get_engine().containers_list(
+            all=True, filters={"label": label_filters}
+        )
+        # Only containers that are tracked applications
+        targets += [c.id for c in containers if app_manager.get_by_id(c.id) is not None]
+
+    return list(dict.fromkeys(targets))
+
+
+async def run_bulk(
+    ids: List[str],
+    action: Callable[[str], Awaitable[object]],
+    concurrency: Optional[int] = None,
+) -> BulkApplicationResponse:
+    """
+    Run an action on many applications concurrently.
+
+    Args:
+        ids: Application IDs to act on
+        action: Coroutine function taking an application ID
+        concurrency: Operations to run at once, defaults to the configured limit
+
+    Returns:
+        Per-item outcome and timing, in the order of ``ids``
+    """
+    limit = asyncio.Semaphore(concurrency or config_manager.get_config().bulk_operation_concurrency)
+
+    async def run_one(id: str) -> BulkItemResult:
+        async with limit:
+            started = time.perf_counter()
+            detail = None
+            try:
+                await action(id)
+            except HTTPException as e:
+                detail = str(e.detail)
+            except Exception as e:
+                logger.error(f"bulk operation on {id}: {e}")
+                detail = str(e)
+            return BulkItemResult(
+                id=id,
+                success=detail is None,
+                detail=detail,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_one(id) for id in ids))
+    return BulkApplicationResponse(
+        results=results,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
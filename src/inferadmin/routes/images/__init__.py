@@ -1,8 +1,23 @@
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from .models import GetImagesResponse, PostImageRequest, DockerImage, DeleteImageRequest
-from .support import pull_container_image, get_container_images, remove_container_image
+from inferadmin.common.sse import SSE_HEADERS, SSE_KEEPALIVE, sse_event, with_heartbeat
+from .models import (
+    GetImagesResponse,
+    PostImageRequest,
+    PostImageResponse,
+    DockerImage,
+    DeleteImageRequest,
+    GetImagePullJobsResponse,
+    ImagePullJob,
+    GetImageCatalogResponse,
+)
+from .support import get_container_images, remove_container_image
+from .pull_jobs import image_pull_jobs
+from .prepull import image_catalog, image_prepull_scheduler
 
 from datetime import datetime
 
@@ -17,7 +32,7 @@ async def get_images() -> GetImagesResponse:
     """Get all docker images managed by InferAdmin"""
     try:
         # Get InferAdmin managed images using the support function
-        managed_images = get_container_images()
+        managed_images = await get_container_images()
 
         images_list = []
 
@@ -62,20 +77,71 @@ async def get_images() -> GetImagesResponse:
 
 
 @router.post("/pull")
-async def post_images(data: PostImageRequest):
-    """Pull a docker image and mark it as managed by InferAdmin"""
-    try:
-        # Use the support function to pull and tag the image
-        image = await pull_container_image(data.repo)
+async def post_images(data: PostImageRequest) -> PostImageResponse:
+    """Start pulling a docker image in the background and mark it as managed by InferAdmin"""
+    job = image_pull_jobs.submit(data.repo)
+    return PostImageResponse(
+        status="accepted",
+        message=f"Pull of {data.repo} running as job {job.id}",
+        job=job,
+    )
 
-        # Create response using format expected by API
-        return {
-            "status": "success",
-            "message": f"Image {data.repo} pulled and tagged as {image.tags[0]}",
-        }
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to pull image: {str(e)}")
+@router.get("/jobs")
+async def get_image_pull_jobs() -> GetImagePullJobsResponse:
+    """Get recent and in-flight image pull jobs"""
+    return GetImagePullJobsResponse(jobs=image_pull_jobs.list())
+
+
+def _get_job(job_id: str) -> ImagePullJob:
+    job = image_pull_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Pull job not found: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_image_pull_job(job_id: str) -> ImagePullJob:
+    """Get the progress of an image pull job"""
+    return _get_job(job_id)
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_image_pull_job(job_id: str) -> StreamingResponse:
+    """Follow the progress of an image pull job as server-sent events"""
+    _get_job(job_id)
+
+    async def events() -> AsyncIterator[str]:
+        async for job in with_heartbeat(image_pull_jobs.watch(job_id)):
+            if job is None:
+                yield SSE_KEEPALIVE
+                continue
+            event = job.state if job.state in ("completed", "failed") else "progress"
+            yield sse_event(job.model_dump_json(), event=event)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _catalog_response() -> GetImageCatalogResponse:
+    return GetImageCatalogResponse(
+        entries=image_catalog.get_all(),
+        running=image_prepull_scheduler.running,
+        last_run=image_prepull_scheduler.last_run,
+        next_run=image_prepull_scheduler.next_run,
+    )
+
+
+@router.get("/catalog")
+async def get_image_catalog() -> GetImageCatalogResponse:
+    """Get the catalog of pre-pulled image versions"""
+    return _catalog_response()
+
+
+@router.post("/catalog/refresh")
+async def refresh_image_catalog() -> GetImageCatalogResponse:
+    """Check the pre-pulled images against the registry now and pull outdated ones in the background"""
+    image_prepull_scheduler.trigger()
+    return _catalog_response()
 
 
 @router.delete("/delete")
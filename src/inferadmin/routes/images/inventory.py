@@ -0,0 +1,220 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+import docker
+
+from inferadmin.docker import DockerManager
+from inferadmin.docker_engine import EngineImage
+from inferadmin.common.docker_events import DockerEventStream, EventSource, event_actor_id
+from inferadmin.common.logging import logger
+
+# Suffix of the tag that marks an image as managed by InferAdmin
+MANAGED_TAG_SUFFIX = "-inferadmin"
+
+
+def short_image_id(image_id: str) -> str:
+    """The 12-character ID shown to clients."""
+    return image_id.replace("sha256:", "")[:12]
+
+
+def original_image_name(tag: str) -> str:
+    """The reference an InferAdmin tag was created from."""
+    return tag.split(MANAGED_TAG_SUFFIX)[0]
+
+
+class ImageInventory:
+    """
+    In-memory inventory of local Docker images.
+
+    Populated from one listing, then kept current from Docker ``image``
+    events (pull, tag, untag, delete, ...): each event re-inspects or drops
+    just the image it names. Images are keyed by full ID, with indexes from
+    tag, short ID and original image name to ID, so listing, resolving and
+    deleting managed images are dictionary lookups. Until the first listing
+    completes ``synced`` is False and callers should ask Docker directly.
+    """
+
+    def __init__(self, event_source: Optional[EventSource] = None):
+        """
+        Initialize the inventory.
+
+        Args:
+            event_source: Source of Docker events, defaults to the daemon
+        """
+        self.event_source = event_source
+
+        self._images: Dict[str, EngineImage] = {}
+        self._by_tag: Dict[str, str] = {}
+        self._by_short_id: Dict[str, str] = {}
+        self._by_original: Dict[str, str] = {}
+        self._managed: Set[str] = set()
+        self._synced = False
+        self._events: Optional[DockerEventStream] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # References named by events while a full listing is in flight
+        self._changed_during_reload: Optional[Set[str]] = None
+
+    @property
+    def synced(self) -> bool:
+        """Whether the inventory reflects a full listing."""
+        return self._synced
+
+    async def start(self) -> None:
+        """Start following image events; the first connect triggers a full load."""
+        self._events = DockerEventStream(
+            filters={"type": "image"},
+            handler=self.handle_event,
+            on_connect=lambda: self._spawn(self.reload()),
+            source=self.event_source,
+        )
+        self._events.start()
+
+    async def stop(self) -> None:
+        """Stop following events and any refreshes in flight."""
+        if self._events is not None:
+            self._events.stop()
+            self._events = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._synced = False
+
+    def _spawn(self, coro) -> None:
+        """Run a refresh in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # Index maintenance
+
+    def _remove(self, image_id: str) -> None:
+        """Drop an image and its index entries."""
+        image = self._images.pop(image_id, None)
+        if image is None:
+            return
+        for tag in image.tags:
+            if self._by_tag.get(tag) == image_id:
+                del self._by_tag[tag]
+            original = original_image_name(tag)
+            if MANAGED_TAG_SUFFIX in tag and self._by_original.get(original) == image_id:
+                del self._by_original[original]
+        if self._by_short_id.get(short_image_id(image_id)) == image_id:
+            del self._by_short_id[short_image_id(image_id)]
+        self._managed.discard(image_id)
+
+    def _put(self, image: EngineImage) -> None:
+        """Insert or replace an image and index its tags."""
+        self._remove(image.id)
+        for tag in image.tags:
+            # A tag can only point at one image; take it from the previous owner
+            previous_id = self._by_tag.get(tag)
+            if previous_id is not None and previous_id != image.id:
+                previous = self._images[previous_id]
+                previous.attrs["RepoTags"] = [t for t in previous.tags if t != tag]
+                if not any(MANAGED_TAG_SUFFIX in t for t in previous.tags):
+                    self._managed.discard(previous_id)
+            self._by_tag[tag] = image.id
+            if MANAGED_TAG_SUFFIX in tag:
+                self._by_original[original_image_name(tag)] = image.id
+
+        self._images[image.id] = image
+        self._by_short_id[short_image_id(image.id)] = image.id
+        if any(MANAGED_TAG_SUFFIX in tag for tag in image.tags):
+            self._managed.add(image.id)
+
+    # Refreshing
+
+    async def reload(self) -> None:
+        """Rebuild the inventory from a full listing."""
+        self._changed_during_reload = set()
+        try:
+            images = await DockerManager.get_engine().images_list()
+        except Exception as e:
+            logger.error(f"listing images: {e}")
+            self._synced = False
+            return
+        finally:
+            changed, self._changed_during_reload = self._changed_during_reload, None
+
+        self._images.clear()
+        self._by_tag.clear()
+        self._by_short_id.clear()
+        self._by_original.clear()
+        self._managed.clear()
+        for image in images:
+            self._put(EngineImage(dict(image.attrs)))
+        self._synced = True
+
+        # The listing may predate these events; re-read what they named
+        for reference in changed:
+            self._spawn(self.refresh(reference))
+
+    async def refresh(self, reference: str) -> None:
+        """Re-inspect one image by ID or reference, dropping it if it's gone."""
+        try:
+            image = await DockerManager.get_engine().images_get(reference)
+        except docker.errors.ImageNotFound:
+            image_id = self._by_tag.get(reference, reference)
+            self._remove(image_id)
+            return
+        except Exception as e:
+            logger.error(f"refreshing image {reference}: {e}")
+            return
+        self._put(EngineImage(dict(image.attrs)))
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Apply a Docker image event."""
+        action = event.get("Action") or event.get("status") or ""
+        reference = event_actor_id(event)
+        if not reference:
+            return
+        if self._changed_during_reload is not None:
+            self._changed_during_reload.add(reference)
+        if action == "delete":
+            self._remove(reference)
+        else:
+            # pull, tag, untag, import, load, ...: re-read the image
+            self._spawn(self.refresh(reference))
+
+    # Lookups
+
+    def list_managed(self) -> List[EngineImage]:
+        """Every image carrying an InferAdmin tag."""
+        return [self._images[image_id] for image_id in self._managed]
+
+    def resolve(self, reference: str) -> Optional[EngineImage]:
+        """
+        Find an image by full ID, short ID, tag or original image name.
+
+        Returns:
+            The image, or None if the inventory doesn't know it
+        """
+        image_id = (
+            reference
+            if reference in self._images
+            else self._by_short_id.get(short_image_id(reference))
+            or self._by_tag.get(reference)
+            or self._by_original.get(reference)
+        )
+        if image_id is None and ":" not in reference.rsplit("/", 1)[-1]:
+            # Docker normalizes untagged references to :latest
+            image_id = self._by_tag.get(f"{reference}:latest")
+        return self._images.get(image_id) if image_id else None
+
+    def resolve_managed(self, reference: str) -> Optional[EngineImage]:
+        """
+        Find a managed image by reference, falling back to the original image
+        name when the reference itself now points at an unmanaged image.
+        """
+        image = self.resolve(reference)
+        if image is not None and image.id in self._managed:
+            return image
+        image_id = self._by_original.get(reference)
+        return self._images.get(image_id) if image_id else None
+
+    def discard(self, image_id: str) -> None:
+        """Drop an image right away, ahead of its delete event."""
+        self._remove(image_id)
+
+
+# Shared inventory, started from the application lifespan
+image_inventory = ImageInventory()
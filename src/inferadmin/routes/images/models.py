@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Dict, Literal, Optional
 
 
 class DockerImage(BaseModel):
@@ -20,4 +21,56 @@ class PostImageRequest(BaseModel):
 
 
 class DeleteImageRequest(BaseModel):
-    id: str
\ No newline at end of file
+    id: str
+
+class ImageLayerProgress(BaseModel):
+    id: str
+    status: str
+    current: int = 0
+    total: int = 0
+
+
+class ImagePullJob(BaseModel):
+    id: str
+    reference: str
+    state: Literal["queued", "pulling", "completed", "failed"] = "queued"
+    created: datetime
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
+    layers: Dict[str, ImageLayerProgress] = Field(default_factory=dict)
+    current_bytes: int = Field(0, description="Bytes downloaded so far across all layers")
+    total_bytes: int = Field(0, description="Size of every layer whose size is known yet")
+    image_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PostImageResponse(BaseModel):
+    status: str
+    message: str
+    job: ImagePullJob
+
+
+class GetImagePullJobsResponse(BaseModel):
+    jobs: list[ImagePullJob]
+
+
+class ImageCatalogEntry(BaseModel):
+    id: str = Field(..., description="Normalized image reference")
+    repository: str
+    tag: str
+    image_id: Optional[str] = None
+    digest: Optional[str] = Field(None, description="Repository digest of the local image")
+    remote_digest: Optional[str] = Field(None, description="Digest the registry reported at the last check")
+    size: Optional[int] = Field(None, description="Size of the local image in bytes")
+    created: Optional[datetime] = None
+    pulled: Optional[datetime] = None
+    checked: Optional[datetime] = None
+    up_to_date: bool = False
+    error: Optional[str] = None
+
+
+class GetImageCatalogResponse(BaseModel):
+    entries: list[ImageCatalogEntry]
+    running: bool
+    last_run: Optional[datetime] = None
+    next_run: Optional[datetime] = None
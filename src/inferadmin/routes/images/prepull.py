@@ -0,0 +1,209 @@
+import asyncio
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+import docker
+from docker.utils import parse_repository_tag
+
+from inferadmin.docker import DockerManager
+from inferadmin.common.logging import logger
+from inferadmin.state.manager import StateManager
+from inferadmin.state import STATE_DIR
+from inferadmin.routes.images.models import ImageCatalogEntry
+from inferadmin.routes.images.pull_jobs import image_pull_jobs, normalize_reference
+
+# Local catalog of pre-pulled image references
+image_catalog = StateManager(STATE_DIR, "image_catalog.json", ImageCatalogEntry)
+
+
+def parse_window(spec: str) -> Tuple[time, time]:
+    """
+    Parse a daily "HH:MM-HH:MM" window.
+
+    Raises:
+        ValueError: if the window is malformed
+    """
+    start, _, end = spec.partition("-")
+    return time.fromisoformat(start.strip()), time.fromisoformat(end.strip())
+
+
+def in_window(now: datetime, window: Tuple[time, time]) -> bool:
+    """Whether ``now`` falls inside a daily window, which may wrap past midnight."""
+    start, end = window
+    if start <= end:
+        return start <= now.time() < end
+    return now.time() >= start or now.time() < end
+
+
+def next_window_start(now: datetime, window: Tuple[time, time]) -> datetime:
+    """The first time the window opens strictly after ``now``."""
+    start = datetime.combine(now.date(), window[0])
+    return start if start > now else start + timedelta(days=1)
+
+
+def _repo_digest(image) -> Optional[str]:
+    """Digest part of the first repository digest of a local image."""
+    repo_digests = image.attrs.get("RepoDigests") or []
+    return repo_digests[0].rpartition("@")[2] if repo_digests else None
+
+
+class ImagePrepullScheduler:
+    """
+    Keeps a configured set of images pulled ahead of deployment.
+
+    Once a day, when the quiet window opens, each reference is checked
+    against the registry's manifest digest and pulled through the shared
+    pull jobs only if the local copy is missing or stale, so deploys find
+    the image already on disk. The results are recorded in a persistent
+    catalog of references with their local image ID, digests and size,
+    which backs the version choices offered to clients.
+    """
+
+    def __init__(self, references: Optional[List[str]] = None, window: str = "02:00-05:00"):
+        """
+        Initialize the scheduler.
+
+        Args:
+            references: Image references to keep pre-pulled
+            window: Daily quiet window, "HH:MM-HH:MM" in local time
+        """
+        self.references = references or []
+        self.window = window
+
+        self.last_run: Optional[datetime] = None
+        self.next_run: Optional[datetime] = None
+        self._scheduler: Optional[asyncio.Task] = None
+        self._run: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a catalog refresh is in progress."""
+        return self._run is not None and not self._run.done()
+
+    async def start(self) -> None:
+        """
+        Start the daily schedule.
+
+        Raises:
+            ValueError: if the window is malformed
+        """
+        parse_window(self.window)
+        self._scheduler = asyncio.create_task(self._schedule())
+
+    async def stop(self) -> None:
+        """Stop the schedule and any refresh in progress."""
+        for task in (self._scheduler, self._run):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._scheduler = self._run = None
+
+    def trigger(self, pull: bool = True) -> asyncio.Task:
+        """
+        Refresh the catalog now, outside the schedule.
+
+        Joins the refresh already in progress if there is one.
+        """
+        if self._run is None or self._run.done():
+            self._run = asyncio.create_task(self.refresh(pull=pull))
+        return self._run
+
+    async def _schedule(self) -> None:
+        """Refresh whenever the quiet window opens."""
+        window = parse_window(self.window)
+        # Record what is already local; started inside the window, pull now
+        # rather than wait a day
+        await self.trigger(pull=in_window(datetime.now(), window))
+
+        while True:
+            now = datetime.now()
+            self.next_run = next_window_start(now, window)
+            await asyncio.sleep((self.next_run - now).total_seconds())
+            run = self._run
+            if run is None or run.done():
+                run = self._run = asyncio.create_task(self.refresh(pull=True, window=window))
+            await run
+
+    async def refresh(self, pull: bool = True, window: Optional[Tuple[time, time]] = None) -> None:
+        """
+        Check every configured reference and pull the stale ones.
+
+        Args:
+            pull: Pull missing or outdated images; otherwise only record local state
+            window: Stop starting new pulls once outside this window
+        """
+        for reference in self.references:
+            allow_pull = pull and (window is None or in_window(datetime.now(), window))
+            try:
+                await self.refresh_reference(reference, pull=allow_pull)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"refreshing catalog entry {reference}: {e}")
+        self.last_run = datetime.now()
+
+    async def refresh_reference(self, reference: str, pull: bool = True) -> ImageCatalogEntry:
+        """Update one catalog entry, pulling the image if it is missing or stale."""
+        key = normalize_reference(reference)
+        entry = image_catalog.get_by_id(key)
+        if entry is None:
+            repository, tag = parse_repository_tag(key)
+            entry = ImageCatalogEntry(id=key, repository=repository, tag=tag)
+        entry.checked = datetime.now()
+        entry.error = None
+
+        # The registry's current digest; a failure keeps the last known one
+        try:
+            descriptor = await DockerManager.get_engine().distribution_inspect(key)
+            entry.remote_digest = descriptor["Descriptor"]["digest"]
+        except Exception as e:
+            entry.error = f"registry check failed: {e}"
+
+        image = await self._local_image(key)
+        if pull and (image is None or not self._matches_remote(image, entry)):
+            job = await image_pull_jobs.wait(image_pull_jobs.submit(reference).id)
+            if job is not None and job.state == "completed":
+                entry.pulled = job.finished
+                image = await self._local_image(key)
+            elif job is not None:
+                entry.error = f"pull failed: {job.error}"
+
+        if image is not None:
+            # Validated so the daemon's timestamp string becomes a datetime
+            entry = ImageCatalogEntry.model_validate(
+                {
+                    **entry.model_dump(),
+                    "image_id": image.id,
+                    "digest": _repo_digest(image),
+                    "size": image.attrs.get("Size"),
+                    "created": image.attrs.get("Created"),
+                }
+            )
+        entry.up_to_date = image is not None and self._matches_remote(image, entry)
+
+        await image_catalog.update(entry)
+        return entry
+
+    @staticmethod
+    async def _local_image(reference: str):
+        """The local image for a reference, or None if it hasn't been pulled."""
+        try:
+            return await DockerManager.get_engine().images_get(reference)
+        except docker.errors.ImageNotFound:
+            return None
+
+    @staticmethod
+    def _matches_remote(image, entry: ImageCatalogEntry) -> bool:
+        """Whether the local image is the one the registry last reported."""
+        if entry.remote_digest is None:
+            # Registry unreachable: whatever is local is the best we have
+            return True
+        repo_digests = image.attrs.get("RepoDigests") or []
+        return any(digest.endswith(f"@{entry.remote_digest}") for digest in repo_digests)
+
+
+# Shared scheduler, configured and started from the application lifespan
+image_prepull_scheduler = ImagePrepullScheduler()
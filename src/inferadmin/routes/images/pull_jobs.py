@@ -0,0 +1,205 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from docker.utils import parse_repository_tag
+from fastapi import HTTPException
+
+from inferadmin.common.logging import logger
+from inferadmin.routes.images.models import ImageLayerProgress, ImagePullJob
+from inferadmin.routes.images.support import pull_container_image
+
+# Layer statuses after which the whole layer is on disk
+LAYER_DOWNLOADED = {"Verifying Checksum", "Download complete", "Pull complete", "Already exists"}
+
+FINISHED_STATES = {"completed", "failed"}
+
+
+def normalize_reference(reference: str) -> str:
+    """Canonical form of an image reference, so ``repo`` and ``repo:latest`` match."""
+    repository, tag = parse_repository_tag(reference)
+    if "@" in reference:
+        return f"{repository}@{tag}"
+    return f"{repository}:{tag or 'latest'}"
+
+
+def apply_pull_progress(job: ImagePullJob, record: Dict[str, Any]) -> None:
+    """Fold one progress record from the daemon into a job's layer table."""
+    # Only per-layer records carry progressDetail; the rest are pull-wide messages
+    layer_id = record.get("id")
+    if not layer_id or "progressDetail" not in record:
+        return
+
+    status = record.get("status", "")
+    detail = record.get("progressDetail") or {}
+    layer = job.layers.get(layer_id)
+    if layer is None:
+        layer = job.layers[layer_id] = ImageLayerProgress(id=layer_id, status=status)
+    layer.status = status
+
+    if status == "Downloading":
+        layer.current = detail.get("current", layer.current)
+        layer.total = detail.get("total", layer.total)
+    elif status in LAYER_DOWNLOADED:
+        layer.current = layer.total
+
+    job.current_bytes = sum(layer.current for layer in job.layers.values())
+    job.total_bytes = sum(layer.total for layer in job.layers.values())
+
+
+class _PullTask:
+    """A job record plus the machinery to run it and notify its watchers."""
+
+    def __init__(self, job: ImagePullJob):
+        self.job = job
+        self.task: Optional[asyncio.Task] = None
+        self.changed = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake every watcher; each new wait gets a fresh event."""
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class ImagePullJobs:
+    """
+    Background image pulls, tracked as jobs.
+
+    Submitting a pull returns a job right away; the pull itself runs as a
+    task streaming the daemon's per-layer progress into the job record.
+    Concurrent requests for the same reference share one in-flight job, and
+    at most ``concurrency`` pulls run at once while the rest stay queued.
+    Finished jobs are kept for polling until ``history`` newer ones replace
+    them.
+    """
+
+    def __init__(self, concurrency: int = 2, history: int = 100):
+        """
+        Initialize the job table.
+
+        Args:
+            concurrency: Pulls allowed to run at once
+            history: Finished jobs kept for polling
+        """
+        self.concurrency = concurrency
+        self.history = history
+
+        self._jobs: "OrderedDict[str, _PullTask]" = OrderedDict()
+        # Normalized reference -> ID of its queued or running job
+        self._active: Dict[str, str] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(self, reference: str) -> ImagePullJob:
+        """
+        Start pulling an image, or join the job already pulling it.
+
+        Returns:
+            The job pulling ``reference``
+        """
+        key = normalize_reference(reference)
+        job_id = self._active.get(key)
+        if job_id is not None:
+            return self._jobs[job_id].job
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+
+        entry = _PullTask(
+            ImagePullJob(id=uuid.uuid4().hex, reference=reference, created=datetime.now())
+        )
+        self._jobs[entry.job.id] = entry
+        self._active[key] = entry.job.id
+        entry.task = asyncio.create_task(self._run(entry, key, self._slots))
+        self._trim()
+        return entry.job
+
+    async def _run(self, entry: _PullTask, key: str, slots: asyncio.Semaphore) -> None:
+        """Wait for one of ``slots``, then pull the image while recording progress."""
+        job = entry.job
+        try:
+            async with slots:
+                job.state = "pulling"
+                job.started = datetime.now()
+                entry.notify()
+
+                def on_progress(record: Dict[str, Any]) -> None:
+                    apply_pull_progress(job, record)
+                    entry.notify()
+
+                image = await pull_container_image(job.reference, on_progress=on_progress)
+                job.image_id = image.id
+                job.state = "completed"
+        except asyncio.CancelledError:
+            job.state = "failed"
+            job.error = "cancelled"
+            raise
+        except HTTPException as e:
+            job.state = "failed"
+            job.error = str(e.detail)
+        except Exception as e:
+            logger.error(f"pulling image {job.reference}: {e}")
+            job.state = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = datetime.now()
+            if self._active.get(key) == job.id:
+                del self._active[key]
+            entry.notify()
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond ``history``."""
+        finished = [
+            job_id for job_id, entry in self._jobs.items()
+            if entry.job.state in FINISHED_STATES
+        ]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[ImagePullJob]:
+        """A job by ID, or None if it is unknown or has been forgotten."""
+        entry = self._jobs.get(job_id)
+        return entry.job if entry else None
+
+    def list(self) -> List[ImagePullJob]:
+        """Every known job, oldest first."""
+        return [entry.job for entry in self._jobs.values()]
+
+    async def watch(self, job_id: str) -> AsyncIterator[ImagePullJob]:
+        """
+        Yield a job each time it changes, ending once it has finished.
+
+        Updates that arrive while the consumer is busy are coalesced into the
+        next yield, so a slow watcher never holds the pull back.
+        """
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return
+        while True:
+            changed = entry.changed
+            yield entry.job
+            if entry.job.state in FINISHED_STATES:
+                return
+            await changed.wait()
+
+    async def wait(self, job_id: str) -> Optional[ImagePullJob]:
+        """Wait for a job to finish and return it."""
+        job = None
+        async for job in self.watch(job_id):
+            pass
+        return job
+
+    async def close(self) -> None:
+        """Cancel every pull still queued or running."""
+        tasks: Set[asyncio.Task] = {
+            entry.task for entry in self._jobs.values()
+            if entry.task is not None and not entry.task.done()
+        }
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Shared job table, configured from the application lifespan
+image_pull_jobs = ImagePullJobs()
@@ -1,26 +1,38 @@
+from typing import Any, Callable, Dict, Optional
+
 import docker
 from fastapi import HTTPException, status
 from loguru import logger
 
 from inferadmin.docker import DockerManager
-from inferadmin.common.async_utils import to_async_io
+from inferadmin.docker_engine import EngineImage
+from inferadmin.routes.images.inventory import MANAGED_TAG_SUFFIX, image_inventory
 
 INFERADMIN_LABEL = "managed-by-inferadmin"
 
 
-@to_async_io  # Using IO-optimized thread pool for Docker API operations
-def pull_container_image(image_name: str):
+async def pull_container_image(
+    image_name: str, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+):
     """
     Pull a Docker image from the Docker registry and mark it as managed by InferAdmin.
+
+    Args:
+        image_name: Reference of the image to pull
+        on_progress: Called with each progress record the daemon reports
     """
     try:
-        # Pull the image
         logger.info(f"Pulling image: {image_name}")
-        image = DockerManager.client.images.pull(image_name)
+        async for progress in DockerManager.get_engine().images_pull(image_name):
+            if on_progress is not None:
+                on_progress(progress)
 
         # Tag the image to identify it as managed by InferAdmin
-        tag_name = f"{image_name}-inferadmin"
-        image.tag(tag_name)
+        tag_name = f"{image_name}{MANAGED_TAG_SUFFIX}"
+        await DockerManager.get_engine().images_tag(image_name, tag_name)
+        image = await DockerManager.get_engine().images_get(tag_name)
+        # Visible right away, ahead of the tag event
+        await image_inventory.refresh(tag_name)
 
         logger.info(f"Image {image_name} pulled and tagged successfully.")
         return image
@@ -32,7 +44,7 @@ def pull_container_image(image_name: str):
         )
 
 
-def get_image_name_by_id(image_id: str):
+async def get_image_name_by_id(image_id: str):
     """
     Get the image name by its ID.
 
@@ -43,14 +55,18 @@ def get_image_name_by_id(image_id: str):
         The name of the image.
     """
     try:
-        image = DockerManager.client.images.get(image_id)
+        image = image_inventory.resolve(image_id) if image_inventory.synced else None
+        if image is None:
+            image = await DockerManager.get_engine().images_get(image_id)
         # check if the image is managed by InferAdmin
-        if not any("-inferadmin" in tag for tag in image.tags):
+        if not any(MANAGED_TAG_SUFFIX in tag for tag in image.tags):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Image with ID {image_id} is not managed by InferAdmin.",
             )
         return image.tags[0] if image.tags else None
+    except HTTPException:
+        raise
     except docker.errors.ImageNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -70,14 +86,17 @@ def get_image_name_by_id(image_id: str):
         )
 
 
-def get_container_images():
+async def get_container_images():
     """
     Get a list of all Docker images managed by InferAdmin.
     """
+    if image_inventory.synced:
+        return image_inventory.list_managed()
+
     try:
-        images = DockerManager.client.images.list()
+        images = await DockerManager.get_engine().images_list()
         inferadmin_images = [
-            image for image in images if any("-inferadmin" in tag for tag in image.tags)
+            image for image in images if any(MANAGED_TAG_SUFFIX in tag for tag in image.tags)
         ]
         return inferadmin_images
     except docker.errors.APIError as e:
@@ -94,8 +113,42 @@ def get_container_images():
         )
 
 
-@to_async_io  # Using IO-optimized thread pool for Docker API operations
-def remove_container_image(image_id: str):
+async def _find_managed_image(image_id: str, scan: bool = True) -> Optional[EngineImage]:
+    """
+    Find a managed image by ID, tag or original image name by asking Docker.
+
+    Args:
+        image_id: The ID or name of the image
+        scan: Also scan the full image list; unnecessary once the inventory has synced
+    """
+    # First check if this is a direct image ID
+    try:
+        image = await DockerManager.get_engine().images_get(image_id)
+        if any(MANAGED_TAG_SUFFIX in tag for tag in image.tags):
+            return image
+    except docker.errors.ImageNotFound:
+        # Not a direct ID, try to find by name/tag
+        pass
+
+    if not scan:
+        return None
+
+    # Then check if it's a tag name
+    for image in await DockerManager.get_engine().images_list():
+        inferadmin_tag = next(
+            (tag for tag in image.tags if MANAGED_TAG_SUFFIX in tag), None
+        )
+        if not inferadmin_tag:
+            continue
+
+        # Check if requested image_id matches any tag or the original image name
+        original_tag = inferadmin_tag.split(MANAGED_TAG_SUFFIX)[0]
+        if image_id == original_tag or image_id in image.tags:
+            return image
+    return None
+
+
+async def remove_container_image(image_id: str):
     """
     Remove a Docker image from the local system only if it is managed by InferAdmin.
 
@@ -103,34 +156,17 @@ def remove_container_image(image_id: str):
         image_id: The ID or name of the image to remove
     """
     try:
-        # First check if this is a direct image ID
-        try:
-            image = DockerManager.client.images.get(image_id)
-            # Check if any tag for this image contains -inferadmin
-            if any("-inferadmin" in tag for tag in image.tags):
-                DockerManager.client.images.remove(image.id, force=True)
-                logger.info(f"Image with ID {image_id} removed successfully.")
-                return
-        except docker.errors.ImageNotFound:
-            # Not a direct ID, try to find by name/tag
-            pass
-
-        # Then check if it's a tag name
-        images = DockerManager.client.images.list()
-        for image in images:
-            # Check if this image is managed by InferAdmin
-            inferadmin_tag = next(
-                (tag for tag in image.tags if "-inferadmin" in tag), None
-            )
-            if not inferadmin_tag:
-                continue
-
-            # Check if requested image_id matches any tag or the original image name
-            original_tag = inferadmin_tag.split("-inferadmin")[0]
-            if image_id == original_tag or image_id in image.tags:
-                DockerManager.client.images.remove(image.id, force=True)
-                logger.info(f"Image {image_id} removed successfully.")
-                return
+        image = None
+        if image_inventory.synced:
+            image = image_inventory.resolve_managed(image_id)
+        if image is None:
+            image = await _find_managed_image(image_id, scan=not image_inventory.synced)
+
+        if image is not None and any(MANAGED_TAG_SUFFIX in tag for tag in image.tags):
+            await DockerManager.get_engine().images_remove(image.id, force=True)
+            image_inventory.discard(image.id)
+            logger.info(f"Image {image_id} removed successfully.")
+            return
 
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
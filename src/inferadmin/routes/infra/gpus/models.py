@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -11,3 +13,20 @@ class GpuState(BaseModel):
 
 class GetGpusResponse(BaseModel):
     gpus: list[GpuState]
+
+
+class GpuSample(BaseModel):
+    timestamp: datetime
+    total_vram: float
+    used_vram: float
+    utilization: float
+    power_consumption: float
+
+
+class GpuHistory(BaseModel):
+    uuid: str
+    samples: list[GpuSample]
+
+
+class GetGpuHistoryResponse(BaseModel):
+    gpus: list[GpuHistory]
@@ -0,0 +1,177 @@
+import asyncio
+import shutil
+from typing import AsyncIterator, Dict, List, Optional, Set, cast
+
+from fastapi import HTTPException
+
+from inferadmin.common.logging import logger
+from .models import GpuState
+
+# Fields queried from nvidia-smi, in the order parse_gpu_row expects
+GPU_QUERY_FIELDS = "uuid,utilization.gpu,power.draw,memory.total,memory.used"
+
+
+def nvidia_smi_path() -> str:
+    """
+    Where nvidia-smi is installed.
+
+    Raises:
+        HTTPException: 500 if it isn't on the PATH
+    """
+    nvidia_smi = shutil.which("nvidia-smi")
+    if nvidia_smi is None:
+        raise HTTPException(status_code=500, detail="nvidia-smi not found")
+    return nvidia_smi
+
+
+def query_command(nvidia_smi: str, interval_ms: Optional[int] = None) -> List[str]:
+    """The nvidia-smi command line, repeating every ``interval_ms`` if given."""
+    command = [nvidia_smi, f"--query-gpu={GPU_QUERY_FIELDS}", "--format=csv,noheader,nounits"]
+    if interval_ms is not None:
+        command += ["-lms", str(interval_ms)]
+    return command
+
+
+def parse_gpu_row(line: str) -> Optional[GpuState]:
+    """
+    Parse one ``--format=csv,noheader,nounits`` row of GPU_QUERY_FIELDS.
+
+    Returns:
+        The GPU's state, or None for comments and rows nvidia-smi can't
+        fill (e.g. "[N/A]" power on some boards)
+    """
+    if not line or line.startswith("#"):
+        return None
+    try:
+        uuid, utilization, power, total, used = (field.strip() for field in line.split(","))
+        return GpuState(
+            uuid=uuid,
+            total_vram=float(total),
+            used_vram=float(used),
+            utilization=float(utilization),
+            power_consumption=float(power),
+        )
+    except ValueError:
+        return None
+
+
+def parse_gpu_csv(output: str) -> List[GpuState]:
+    """Parse every row of one nvidia-smi query."""
+    return [gpu for gpu in map(parse_gpu_row, output.splitlines()) if gpu is not None]
+
+
+async def query_gpus() -> List[GpuState]:
+    """
+    Run nvidia-smi once and parse its output.
+
+    Raises:
+        HTTPException: 500 if nvidia-smi is missing or fails
+    """
+    process = await asyncio.create_subprocess_exec(
+        *query_command(nvidia_smi_path()),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        output, _ = await process.communicate()
+    except asyncio.CancelledError:
+        # Don't leave nvidia-smi behind when sampling stops mid-query
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        raise HTTPException(
+            status_code=500, detail=f"nvidia-smi failed: {output.decode(errors='replace')}"
+        )
+    return parse_gpu_csv(output.decode(errors="replace"))
+
+
+class NvidiaSmiStream:
+    """
+    One long-lived ``nvidia-smi -lms`` process, read as a stream of samples.
+
+    nvidia-smi prints one row per GPU every interval. Rows are parsed as
+    they arrive and grouped into samples: a sample is complete once the
+    GPUs of the previous sample have all reported, or when a GPU reports
+    twice, which also re-learns the GPU set.
+    If the process dies it is restarted, waiting longer after each failure
+    up to ``max_backoff`` seconds; a process that delivered samples resets
+    the wait.
+    """
+
+    def __init__(self, interval: float, max_backoff: float = 30.0):
+        """
+        Initialize the stream.
+
+        Args:
+            interval: Seconds between samples
+            max_backoff: Longest wait before restarting a failed process
+        """
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.restarts = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def samples(self) -> AsyncIterator[List[GpuState]]:
+        """
+        Yield every GPU's state each interval, restarting nvidia-smi as needed.
+
+        Raises:
+            HTTPException: 500 if nvidia-smi is missing
+        """
+        backoff = self.interval
+        while True:
+            delivered = False
+            try:
+                async for sample in self._run_once():
+                    delivered = True
+                    yield sample
+            except OSError as e:
+                logger.warning(f"starting nvidia-smi: {e}")
+
+            backoff = self.interval if delivered else min(backoff * 2, self.max_backoff)
+            self.restarts += 1
+            logger.warning(f"nvidia-smi exited; restarting in {backoff:.1f}s")
+            await asyncio.sleep(backoff)
+
+    async def _run_once(self) -> AsyncIterator[List[GpuState]]:
+        """Run one nvidia-smi process until it exits, yielding its samples."""
+        command = query_command(nvidia_smi_path(), max(int(self.interval * 1000), 1))
+        self._process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        # Always set, since it is piped
+        stdout = cast(asyncio.StreamReader, self._process.stdout)
+        pending: Dict[str, GpuState] = {}
+        # GPUs seen in the last sample closed by a repeat
+        gpus: Set[str] = set()
+        try:
+            while True:
+                line = await stdout.readline()
+                if not line:
+                    break
+                gpu = parse_gpu_row(line.decode(errors="replace").rstrip("\r\n"))
+                if gpu is None:
+                    continue
+                if gpu.uuid in pending:
+                    # A GPU reporting again starts the next sample
+                    gpus = set(pending)
+                    yield list(pending.values())
+                    pending = {}
+                pending[gpu.uuid] = gpu
+                if pending.keys() == gpus:
+                    yield list(pending.values())
+                    pending = {}
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop the running process, if any."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
@@ -0,0 +1,220 @@
+import array
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from inferadmin.common.logging import logger
+from .models import GpuHistory, GpuSample, GpuState
+from .nvidia_smi import NvidiaSmiStream, query_gpus
+
+
+class GpuRing:
+    """
+    Fixed-size history of one GPU's samples.
+
+    Each metric is a preallocated ``array('d')`` written in place at a
+    rotating head, so recording a sample allocates nothing and the memory
+    used is fixed by ``capacity``.
+    """
+
+    FIELDS = ("timestamp", "total_vram", "used_vram", "utilization", "power_consumption")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._columns = {field: array.array("d", bytes(8 * capacity)) for field in self.FIELDS}
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, state: GpuState) -> None:
+        """Record a sample, overwriting the oldest once full."""
+        head = self._head
+        self._columns["timestamp"][head] = timestamp
+        self._columns["total_vram"][head] = state.total_vram
+        self._columns["used_vram"][head] = state.used_vram
+        self._columns["utilization"][head] = state.utilization
+        self._columns["power_consumption"][head] = state.power_consumption
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def last(self, n: Optional[int] = None) -> List[GpuSample]:
+        """The newest ``n`` samples (all if None), oldest first."""
+        n = self._count if n is None else max(0, min(n, self._count))
+        samples = []
+        for back in range(n, 0, -1):
+            i = (self._head - back) % self.capacity
+            samples.append(
+                GpuSample(
+                    timestamp=datetime.fromtimestamp(self._columns["timestamp"][i]),
+                    total_vram=self._columns["total_vram"][i],
+                    used_vram=self._columns["used_vram"][i],
+                    utilization=self._columns["utilization"][i],
+                    power_consumption=self._columns["power_consumption"][i],
+                )
+            )
+        return samples
+
+
+class GpuTelemetry:
+    """
+    Samples GPU state in the background and keeps a short history.
+
+    With the "stream" backend one long-lived ``nvidia-smi -lms`` process
+    reports every ``interval`` seconds and its output is parsed as it
+    arrives; with "poll" nvidia-smi is run once per sample. Either way it
+    runs as an asyncio subprocess, so the event loop never blocks on it.
+    Each GPU's samples go into a fixed-size ring buffer of ``history``
+    entries. Requests are served from the latest sample without running
+    anything.
+    """
+
+    def __init__(self, interval: float = 1.0, history: int = 600, backend: str = "stream"):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            history: Samples kept per GPU
+            backend: "stream" or "poll"
+        """
+        self.interval = interval
+        self.history = history
+        self.backend = backend
+
+        self._rings: Dict[str, GpuRing] = {}
+        self._latest: List[GpuState] = []
+        self._sampled: Optional[float] = None
+        self._error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stream: Optional[NvidiaSmiStream] = None
+
+    @property
+    def synced(self) -> bool:
+        """Whether at least one sample has been taken."""
+        return self._sampled is not None
+
+    async def start(self) -> None:
+        """Start sampling in the background."""
+        self._task = asyncio.create_task(self._sample_loop())
+
+    async def stop(self) -> None:
+        """Stop sampling, including any nvidia-smi process."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._stream is not None:
+            await self._stream.close()
+
+    # Lookups
+
+    def latest(self) -> List[GpuState]:
+        """
+        Every GPU's state as of the latest sample.
+
+        Raises:
+            HTTPException: 500 if no sample could be taken yet
+        """
+        if self._sampled is None:
+            raise HTTPException(status_code=500, detail=self._error or "No GPU sample taken yet")
+        return self._latest
+
+    def recent(self, samples: Optional[int] = None, uuid: Optional[str] = None) -> List[GpuHistory]:
+        """
+        The newest samples of every GPU, or of one.
+
+        Raises:
+            HTTPException: 404 if ``uuid`` is unknown
+        """
+        if uuid is not None:
+            ring = self._rings.get(uuid)
+            if ring is None:
+                raise HTTPException(status_code=404, detail=f"GPU not found: {uuid}")
+            return [GpuHistory(uuid=uuid, samples=ring.last(samples))]
+        return [
+            GpuHistory(uuid=gpu_uuid, samples=ring.last(samples))
+            for gpu_uuid, ring in self._rings.items()
+        ]
+
+    # Sampling
+
+    def record(self, gpus: List[GpuState], timestamp: Optional[float] = None) -> None:
+        """Store one sample of every GPU."""
+        timestamp = time.time() if timestamp is None else timestamp
+        for gpu in gpus:
+            ring = self._rings.get(gpu.uuid)
+            if ring is None:
+                ring = self._rings[gpu.uuid] = GpuRing(self.history)
+            ring.append(timestamp, gpu)
+        self._latest = gpus
+        self._sampled = timestamp
+        self._error = None
+
+    async def sample(self) -> List[GpuState]:
+        """
+        Query nvidia-smi once and record the result.
+
+        Raises:
+            HTTPException: 500 if nvidia-smi is missing or fails
+        """
+        gpus = await query_gpus()
+        self.record(gpus)
+        return gpus
+
+    def _record_error(self, detail: str) -> None:
+        """Keep the latest failure for requests, logging each new one once."""
+        if self._error != detail:
+            logger.warning(f"sampling GPUs: {detail}")
+        self._error = detail
+
+    async def _sample_loop(self) -> None:
+        """Sample with the configured backend until stopped."""
+        if self.backend == "stream":
+            await self._stream_loop()
+        else:
+            await self._poll_loop()
+
+    async def _stream_loop(self) -> None:
+        """Record every sample of a long-lived nvidia-smi process."""
+        self._stream = NvidiaSmiStream(self.interval)
+        try:
+            while True:
+                try:
+                    async for gpus in self._stream.samples():
+                        self.record(gpus)
+                except HTTPException as e:
+                    # nvidia-smi isn't installed; check again now and then
+                    self._record_error(e.detail)
+                    await asyncio.sleep(self._stream.max_backoff)
+        finally:
+            await self._stream.close()
+            self._stream = None
+
+    async def _poll_loop(self) -> None:
+        """Run nvidia-smi once per sample, at a fixed rate measured from each start."""
+        next_sample = time.monotonic()
+        while True:
+            try:
+                await self.sample()
+            except HTTPException as e:
+                self._record_error(e.detail)
+            except Exception as e:
+                logger.error(f"sampling GPUs: {e}")
+                self._error = str(e)
+
+            next_sample += self.interval
+            delay = next_sample - time.monotonic()
+            if delay < 0:
+                # Fell behind; skip the missed samples rather than bursting
+                next_sample = time.monotonic()
+                delay = 0
+            await asyncio.sleep(delay)
+
+
+# Shared sampler, configured and started from the application lifespan
+gpu_telemetry = GpuTelemetry()
@@ -7,6 +7,7 @@ import shutil
 from .models import Volume
 
 from inferadmin.config.loader import config_manager
+from inferadmin.routes.models.trash import model_reaper
 
 router = APIRouter(prefix="/volumes")
 
@@ -23,11 +24,15 @@ async def get_volumes() -> GetVolumesResponse:
     # Convert to datetime
     date_created = datetime.fromtimestamp(date_created)
 
+    trash = model_reaper.status
     volume = Volume(
         name=volume_path.name,
         total_volume_size=total_space,
         volume_size_used=used_space,
         date_created=date_created,
+        trash_folders=trash.folders,
+        trash_pending_size=trash.pending_bytes / (1024**3),
+        trash_reclaimed_size=trash.reclaimed_bytes / (1024**3),
     )
     response = GetVolumesResponse(volumes=[volume])
     return response
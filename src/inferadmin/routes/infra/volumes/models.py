@@ -7,6 +7,10 @@ class Volume(BaseModel):
     total_volume_size: float
     volume_size_used: float
     date_created: datetime
+    # Deleted models still being reclaimed in the background; sizes in GB
+    trash_folders: int = 0
+    trash_pending_size: float = 0.0
+    trash_reclaimed_size: float = 0.0
 
 
 class GetVolumesResponse(BaseModel):
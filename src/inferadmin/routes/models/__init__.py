@@ -1,26 +1,145 @@
+import os
+
 from fastapi import APIRouter
-from .models import GetModelsResponse, PostModelRequest, DeleteModelRequest
+from .models import (
+    GetModelsResponse,
+    PostModelRequest,
+    PostModelResponse,
+    DeleteModelRequest,
+    GetModelDownloadsResponse,
+    ModelDownloadJob,
+    ModelDownloadIdRequest,
+    ModelVerification,
+    ModelDedupJob,
+    ModelDedupReport,
+    VerifyModelRequest,
+    GetModelResidencyResponse,
+    GetModelPrewarmJobsResponse,
+    ModelPrewarmJob,
+    ModelPrewarmIdRequest,
+    PrewarmModelRequest,
+    EvictionPlan,
+)
 
-from .support import scan_hf_models_directory, delete_model, download_hf_model
+from inferadmin.config.loader import config_manager
+from .support import scan_hf_models_directory
+from .index import model_index
+from .downloads import model_downloads
+from .verify import model_verifier
+from .blobs import blob_store
+from .prewarm import model_prewarmer
+from .quota import model_quota, remove_model
 
 router = APIRouter(prefix="/models")
 
 
 @router.get("/list")
 async def get_models() -> GetModelsResponse:
-    models = await scan_hf_models_directory()
+    if model_index.synced:
+        models = model_index.list_models()
+    else:
+        models = await scan_hf_models_directory()
+    for model in models:
+        model.integrity = model_verifier.integrity(os.path.basename(model.path))
     response = GetModelsResponse(models=models)
     return response
 
 
 @router.post("/pull")
-async def post_models(data: PostModelRequest):
-    repo_id = data.repo_id
-    source = data.source
-    if source == "Huggingface":
-        await download_hf_model(repo_id)
+async def post_models(data: PostModelRequest) -> PostModelResponse:
+    """Start downloading a model in the background"""
+    job = await model_downloads.submit(
+        data.repo_id,
+        workers=data.workers,
+        allow_patterns=data.allow_patterns,
+        ignore_patterns=data.ignore_patterns,
+    )
+    return PostModelResponse(
+        status="accepted",
+        message=f"Download of {data.repo_id} running as job {job.id}",
+        job=job,
+    )
+
+
+@router.get("/downloads")
+async def get_model_downloads() -> GetModelDownloadsResponse:
+    """Get every model download job"""
+    return GetModelDownloadsResponse(jobs=model_downloads.list())
+
+
+@router.get("/downloads/{job_id}")
+async def get_model_download(job_id: str) -> ModelDownloadJob:
+    """Get the progress of a model download job"""
+    return model_downloads.require(job_id)
+
+
+@router.post("/downloads/cancel")
+async def cancel_model_download(data: ModelDownloadIdRequest) -> ModelDownloadJob:
+    """Cancel a model download, keeping partial files so it can be resumed"""
+    return await model_downloads.cancel(data.id)
+
+
+@router.post("/downloads/resume")
+async def resume_model_download(data: ModelDownloadIdRequest) -> ModelDownloadJob:
+    """Resume a cancelled or failed model download"""
+    return await model_downloads.resume(data.id)
+
+
+@router.post("/verify")
+async def verify_model(data: VerifyModelRequest) -> ModelVerification:
+    """Check a model's files against the repository's sizes and hashes"""
+    return await model_verifier.verify(data.repo_id)
+
+
+@router.get("/dedup")
+async def get_dedup_report() -> ModelDedupReport:
+    """Get the bytes the blob store saves, and the deduplication job's progress"""
+    return await blob_store.report()
+
+
+@router.post("/dedup")
+async def dedup_models() -> ModelDedupJob:
+    """Start linking every model folder through the blob store in the background"""
+    return blob_store.dedup_all()
+
+
+@router.get("/residency")
+async def get_model_residency() -> GetModelResidencyResponse:
+    """Get how much of each model is in the page cache"""
+    models = await model_prewarmer.residency(config_manager.get_config().model_storage_path)
+    return GetModelResidencyResponse(models=models)
+
+
+@router.post("/prewarm")
+async def prewarm_model(data: PrewarmModelRequest) -> ModelPrewarmJob:
+    """Start reading a model into the page cache in the background"""
+    return model_prewarmer.submit(data.repo_id)
+
+
+@router.get("/prewarm")
+async def get_prewarm_jobs() -> GetModelPrewarmJobsResponse:
+    """Get every prewarm job"""
+    return GetModelPrewarmJobsResponse(jobs=model_prewarmer.list())
+
+
+@router.get("/prewarm/{job_id}")
+async def get_prewarm_job(job_id: str) -> ModelPrewarmJob:
+    """Get the progress of a prewarm job"""
+    return model_prewarmer.require(job_id)
+
+
+@router.post("/prewarm/cancel")
+async def cancel_prewarm_job(data: ModelPrewarmIdRequest) -> ModelPrewarmJob:
+    """Stop a prewarm job"""
+    return await model_prewarmer.cancel(data.id)
+
+
+@router.get("/eviction")
+async def get_eviction_plan(needed_gb: float = 0.0) -> EvictionPlan:
+    """Dry run: which models making room for a download of this size would evict"""
+    return await model_quota.plan(int(needed_gb * 1024**3))
 
 
 @router.post("/delete")
 async def delete_models(data: DeleteModelRequest):
-    await delete_model(data.repo_id)
+    await remove_model(data.repo_id)
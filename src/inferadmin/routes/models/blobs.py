@@ -0,0 +1,323 @@
+import asyncio
+import os
+import threading
+from stat import S_ISREG
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from inferadmin.common.async_utils import get_cpu_executor, get_io_executor
+from inferadmin.common.logging import logger
+from .models import FileVerification, ModelDedupJob, ModelDedupReport
+from .support import RESERVED_PREFIX
+from .transfer import PARTIAL_DIR
+from .verify import hash_file, model_verifier
+
+# The blob store, relative to the model volume; blobs are named by the
+# SHA256 of their content and sharded by its first two hex digits
+BLOB_DIR = ".blobs"
+
+
+def blob_path(volume_path: str, sha256: str) -> str:
+    """Where the blob with this content hash is stored."""
+    return os.path.join(volume_path, BLOB_DIR, sha256[:2], sha256)
+
+
+def link_file(volume_path: str, path: str, sha256: str) -> int:
+    """
+    Put a file in the blob store, or swap it for a link to the stored copy.
+
+    A new blob is a second link to the file itself, so storing costs
+    nothing. A duplicate is replaced atomically by a hard link to the blob.
+    Blobs are made read-only, since every link shares the same inode; that
+    includes the model file a blob was created from. A file that already
+    has other hard links keeps its mode, since the change would show
+    through them too.
+
+    Args:
+        volume_path: The model storage path
+        path: The file
+        sha256: The SHA256 of its content
+
+    Returns:
+        The bytes saved: the file's size if it was a duplicate, else 0
+    """
+    blob = blob_path(volume_path, sha256)
+    stat = os.stat(path)
+    while True:
+        try:
+            blob_stat = os.stat(blob)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            try:
+                os.link(path, blob)
+            except FileExistsError:
+                # Stored by another folder in the meantime
+                continue
+            if stat.st_nlink == 1:
+                os.chmod(blob, 0o444)
+            return 0
+
+        if (blob_stat.st_dev, blob_stat.st_ino) == (stat.st_dev, stat.st_ino):
+            return 0
+        if blob_stat.st_size != stat.st_size:
+            logger.warning(f"blob {sha256} has the wrong size, not linking {path}")
+            return 0
+
+        staging = path + ".inferadmin-link"
+        try:
+            os.link(blob, staging)
+        except FileNotFoundError:
+            # Collected in the meantime
+            continue
+        os.replace(staging, path)
+        return stat.st_size
+
+
+def stored_inodes(volume_path: str) -> Set[Tuple[int, int]]:
+    """The (device, inode) of every blob, to tell files already in the store."""
+    inodes: Set[Tuple[int, int]] = set()
+    try:
+        shards = list(os.scandir(os.path.join(volume_path, BLOB_DIR)))
+    except FileNotFoundError:
+        return inodes
+    for shard in shards:
+        with os.scandir(shard.path) as blobs:
+            for blob in blobs:
+                try:
+                    stat = blob.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                inodes.add((stat.st_dev, stat.st_ino))
+    return inodes
+
+
+def dedup_folder(
+    volume_path: str,
+    folder: str,
+    known: Dict[str, FileVerification],
+    stop: Optional[threading.Event] = None,
+) -> Tuple[int, int]:
+    """
+    Link every file of a model folder through the blob store.
+
+    Files that already are a link to a blob are skipped, and hashes from
+    verification results are reused while the file's size and mtime still
+    match, so shards are rarely read twice. Files hard linked elsewhere,
+    e.g. by the user, are hashed and stored like any other.
+
+    Args:
+        volume_path: The model storage path
+        folder: The model folder
+        known: Verification results by relative path
+        stop: Set to stop between files
+
+    Returns:
+        Files replaced by links, and the bytes that saved
+    """
+    linked = saved = 0
+    stored = stored_inodes(volume_path)
+    partial_root = PARTIAL_DIR.split(os.sep)[0]
+    for root, dirs, files in os.walk(folder):
+        if root == folder and partial_root in dirs:
+            # Partial downloads change underneath us
+            dirs.remove(partial_root)
+        for name in files:
+            if stop is not None and stop.is_set():
+                return linked, saved
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path, follow_symlinks=False)
+                if not S_ISREG(stat.st_mode) or stat.st_size == 0:
+                    continue
+                if stat.st_nlink > 1 and (stat.st_dev, stat.st_ino) in stored:
+                    # Already in the store
+                    continue
+                result = known.get(os.path.relpath(path, folder))
+                if (
+                    result is not None
+                    and result.sha256
+                    and (result.size, result.mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+                ):
+                    sha256 = result.sha256
+                else:
+                    sha256 = hash_file(path, stat.st_size, sha256=True)
+                freed = link_file(volume_path, path, sha256)
+            except OSError as e:
+                logger.warning(f"deduplicating {path}: {e}")
+                continue
+            if freed:
+                linked += 1
+                saved += freed
+    return linked, saved
+
+
+def collect_garbage(volume_path: str) -> Tuple[int, int]:
+    """
+    Remove blobs that no model folder links to any more.
+
+    A blob's link count is its reference count: the store's own link plus
+    one per model file sharing it.
+
+    Returns:
+        The blobs removed and the bytes freed
+    """
+    removed = freed = 0
+    try:
+        shards = list(os.scandir(os.path.join(volume_path, BLOB_DIR)))
+    except FileNotFoundError:
+        return 0, 0
+    for shard in shards:
+        with os.scandir(shard.path) as blobs:
+            for blob in blobs:
+                try:
+                    stat = blob.stat(follow_symlinks=False)
+                    if stat.st_nlink == 1:
+                        os.unlink(blob.path)
+                        removed += 1
+                        freed += stat.st_size
+                except FileNotFoundError:
+                    continue
+    return removed, freed
+
+
+def survey_blobs(volume_path: str) -> Tuple[int, int, int, int]:
+    """
+    Measure the blob store.
+
+    Returns:
+        The number of blobs, the bytes they store, the bytes they would take
+        as separate copies, and the number of unreferenced blobs
+    """
+    count = stored = referenced = unreferenced = 0
+    try:
+        shards = list(os.scandir(os.path.join(volume_path, BLOB_DIR)))
+    except FileNotFoundError:
+        return 0, 0, 0, 0
+    for shard in shards:
+        with os.scandir(shard.path) as blobs:
+            for blob in blobs:
+                try:
+                    stat = blob.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                count += 1
+                stored += stat.st_size
+                references = stat.st_nlink - 1
+                referenced += stat.st_size * references
+                if references == 0:
+                    unreferenced += 1
+    return count, stored, referenced, unreferenced
+
+
+class BlobStore:
+    """
+    Content-addressed store that deduplicates files across model folders.
+
+    Every file in a model folder is hard linked to a blob named by its
+    SHA256 in a hidden folder of the volume, so identical tokenizers and
+    shared base shards are stored once however many fine-tunes use them.
+    Links keep each model folder a plain directory for inference engines.
+    Downloads are linked as they complete; a background job links folders
+    that predate the store. Deleting a model only drops its links, and
+    blobs whose last reference is gone are collected afterwards.
+    """
+
+    def __init__(self, volume_path: str = "", enabled: bool = True):
+        """
+        Initialize the store.
+
+        Args:
+            volume_path: The model storage path
+            enabled: Whether files are deduplicated at all
+        """
+        self.volume_path = volume_path
+        self.enabled = enabled
+        self.job = ModelDedupJob()
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+
+    async def stop(self) -> None:
+        """Stop the background job after the file it is on."""
+        self._stop.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def store_folder(self, name: str) -> Tuple[int, int]:
+        """
+        Link a model folder's files through the store, e.g. after a download.
+
+        Returns:
+            Files replaced by links, and the bytes that saved
+        """
+        if not self.enabled:
+            return 0, 0
+        record = model_verifier.records.get_by_id(name)
+        known = record.results if record is not None else {}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_cpu_executor(),
+            dedup_folder,
+            self.volume_path,
+            os.path.join(self.volume_path, name),
+            known,
+            self._stop,
+        )
+
+    async def collect(self) -> Tuple[int, int]:
+        """Remove unreferenced blobs, e.g. after a model was deleted."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_io_executor(), collect_garbage, self.volume_path)
+
+    async def report(self) -> ModelDedupReport:
+        """How much the store saves, and the background job's progress."""
+        loop = asyncio.get_running_loop()
+        count, stored, referenced, unreferenced = await loop.run_in_executor(
+            get_io_executor(), survey_blobs, self.volume_path
+        )
+        return ModelDedupReport(
+            blobs=count,
+            stored_bytes=stored,
+            referenced_bytes=referenced,
+            saved_bytes=max(referenced - stored, 0),
+            unreferenced_blobs=unreferenced,
+            job=self.job,
+        )
+
+    def dedup_all(self) -> ModelDedupJob:
+        """Start deduplicating every model folder in the background, unless already running."""
+        if self._task is not None and not self._task.done():
+            return self.job
+        self._stop.clear()
+        self.job = ModelDedupJob(state="running", started=datetime.now())
+        self._task = asyncio.create_task(self._dedup_all(self.job))
+        return self.job
+
+    async def _dedup_all(self, job: ModelDedupJob) -> None:
+        try:
+            with os.scandir(self.volume_path) as entries:
+                names = [
+                    entry.name for entry in entries
+                    if entry.is_dir() and not entry.name.startswith(RESERVED_PREFIX)
+                ]
+            job.folders_total = len(names)
+            for name in names:
+                if self._stop.is_set():
+                    job.state = "cancelled"
+                    break
+                linked, saved = await self.store_folder(name)
+                job.files_linked += linked
+                job.saved_bytes += saved
+                job.folders_done += 1
+            else:
+                job.state = "completed"
+            await self.collect()
+        except Exception as e:
+            logger.error(f"deduplicating model volume: {e}")
+            job.state = "failed"
+            job.error = str(e)
+        job.finished = datetime.now()
+
+
+# Shared store, configured from the application lifespan
+blob_store = BlobStore()
@@ -0,0 +1,345 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from inferadmin.common.logging import logger
+from inferadmin.state.manager import StateManager
+from inferadmin.state import STATE_DIR
+from .blobs import blob_store
+from .index import model_index
+from .models import ModelDownloadJob
+from .quota import model_quota
+from .support import download_hf_model, model_folder, plan_hf_download
+from .transfer import DownloadCancelled
+from .verify import expected_files, model_verifier
+
+ACTIVE_STATES = {"queued", "downloading", "verifying"}
+
+
+class _DownloadTask:
+    """A job being run, with the event that stops its download thread."""
+
+    def __init__(
+        self, job: ModelDownloadJob, run: Callable[["_DownloadTask"], Coroutine[Any, Any, None]]
+    ):
+        self.job = job
+        self.stop = threading.Event()
+        # Set when a client cancelled, as opposed to a shutdown
+        self.cancelled_by_user = False
+        self.task = asyncio.create_task(run(self))
+
+
+class ModelDownloads:
+    """
+    Background model downloads, tracked as persistent jobs.
+
+    Submitting a download returns its job right away. Up to ``concurrency``
+    jobs download at once, each on a dedicated download thread so the IO
+    pool stays free for requests; the rest wait in a queue. Within a job,
+    files are split into byte ranges fetched by parallel workers. A job
+    records byte-level progress per file and chunk, and its throughput, and
+    is checkpointed to the state store as it goes. Finished files are
+    checked against the repository's sizes and hashes before the job
+    completes; files that fail are removed so a resume fetches them again.
+    Verified files are then linked through the blob store.
+    Jobs can be cancelled and resumed, partial files are continued where
+    they stopped, and jobs interrupted by a shutdown resume on the next
+    start. Concurrent requests for the same repository share a job.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        workers: int = 4,
+        chunk_size: int = 64 * 1024 * 1024,
+        checkpoint_interval: float = 5.0,
+    ):
+        """
+        Initialize the job table.
+
+        Args:
+            concurrency: Downloads allowed to run at once
+            workers: Default number of ranges a job fetches in parallel
+            chunk_size: Bytes per range; also the granularity of resumes
+            checkpoint_interval: Seconds between progress checkpoints of a running job
+        """
+        self.concurrency = concurrency
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.checkpoint_interval = checkpoint_interval
+
+        self.jobs = StateManager(STATE_DIR, "model_downloads.json", ModelDownloadJob)
+        # Job ID -> queued or running download
+        self._running: Dict[str, _DownloadTask] = {}
+        # Repository -> ID of its queued or running job
+        self._active: Dict[str, str] = {}
+        # Replaced on start, once the concurrency is configured
+        self._slots = asyncio.Semaphore(concurrency)
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    async def start(self) -> None:
+        """Start the download threads and resume jobs a shutdown interrupted."""
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="inferadmin-download-"
+        )
+        for job in self.jobs.get_all():
+            if job.state in ACTIVE_STATES:
+                logger.info(f"Resuming download of {job.repo_id}")
+                job.state = "queued"
+                self._launch(job)
+
+    async def close(self) -> None:
+        """Stop every download, leaving them queued to resume on the next start."""
+        entries = list(self._running.values())
+        for entry in entries:
+            entry.stop.set()
+            entry.task.cancel()
+        await asyncio.gather(*(e.task for e in entries), return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # Lookups
+
+    def get(self, job_id: str) -> Optional[ModelDownloadJob]:
+        """A job by ID, with live progress if it is running."""
+        entry = self._running.get(job_id)
+        return entry.job if entry else self.jobs.get_by_id(job_id)
+
+    def list(self) -> List[ModelDownloadJob]:
+        """Every job, oldest first, with live progress for running ones."""
+        jobs = [self.get(job.id) for job in self.jobs.get_all()]
+        return sorted((job for job in jobs if job is not None), key=lambda job: job.created)
+
+    def require(self, job_id: str) -> ModelDownloadJob:
+        """
+        A job by ID.
+
+        Raises:
+            HTTPException: 404 if the job is unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Download job not found: {job_id}")
+        return job
+
+    # Control
+
+    async def submit(
+        self,
+        repo_id: str,
+        workers: Optional[int] = None,
+        allow_patterns: Optional[List[str]] = None,
+        ignore_patterns: Optional[List[str]] = None,
+    ) -> ModelDownloadJob:
+        """
+        Start downloading a repository, or join the job already downloading it.
+
+        Args:
+            repo_id: The HF repo name
+            workers: Ranges to fetch in parallel, defaults to ``self.workers``
+            allow_patterns: Only fetch files matching one of these globs
+            ignore_patterns: Skip files matching any of these globs
+        """
+        job_id = self._active.get(repo_id)
+        if job_id is not None:
+            return self._running[job_id].job
+
+        job = ModelDownloadJob(
+            id=uuid.uuid4().hex,
+            repo_id=repo_id,
+            created=datetime.now(),
+            workers=workers or self.workers,
+            chunk_size=self.chunk_size,
+            allow_patterns=allow_patterns,
+            ignore_patterns=ignore_patterns,
+        )
+        await self.jobs.add(job)
+        self._launch(job)
+        return job
+
+    async def cancel(self, job_id: str) -> ModelDownloadJob:
+        """
+        Cancel a queued or running job, keeping partial files for a resume.
+
+        Raises:
+            HTTPException: 404 if the job is unknown
+        """
+        entry = self._running.get(job_id)
+        if entry is None:
+            return self.require(job_id)
+
+        entry.cancelled_by_user = True
+        entry.stop.set()
+        if entry.job.state != "downloading":
+            # Waiting for a slot or for verification; no download thread to stop
+            entry.task.cancel()
+        await asyncio.gather(entry.task, return_exceptions=True)
+        return entry.job
+
+    async def resume(self, job_id: str) -> ModelDownloadJob:
+        """
+        Queue a cancelled or failed job again; finished files aren't refetched.
+
+        Raises:
+            HTTPException: 404 if the job is unknown, 409 if it completed
+        """
+        job = self.require(job_id)
+        if job.state in ACTIVE_STATES:
+            return job
+        if job.state == "completed":
+            raise HTTPException(status_code=409, detail=f"Download job {job_id} already completed")
+        if job.repo_id in self._active:
+            # Another job picked the repository up in the meantime
+            return self._running[self._active[job.repo_id]].job
+
+        job.state = "queued"
+        job.error = None
+        job.finished = None
+        await self.jobs.update(job)
+        self._launch(job)
+        return job
+
+    def _launch(self, job: ModelDownloadJob) -> None:
+        entry = _DownloadTask(job, self._run)
+        self._running[job.id] = entry
+        self._active[job.repo_id] = job.id
+
+    # Running
+
+    async def _download(self, job: ModelDownloadJob, stop: threading.Event) -> None:
+        """Plan the job if needed, then download while checkpointing progress."""
+        loop = asyncio.get_running_loop()
+        if not job.files:
+            job.revision, job.files = await loop.run_in_executor(
+                self._executor,
+                plan_hf_download,
+                job.repo_id,
+                job.allow_patterns,
+                job.ignore_patterns,
+            )
+            job.total_bytes = sum(file.size or 0 for file in job.files)
+        await self.jobs.update(job)
+
+        # Evict unused models first if the download would overrun the quota,
+        # and hold the space until the model is indexed so that concurrent
+        # downloads can't count on it too
+        async with model_quota.reserve(
+            job.repo_id, job.total_bytes, lambda: job.downloaded_bytes
+        ):
+            await self._fetch(job, stop)
+            await model_index.refresh(job.repo_id.replace("/", "_"))
+
+    async def _fetch(self, job: ModelDownloadJob, stop: threading.Event) -> None:
+        """Download, verify and deduplicate the planned files."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, download_hf_model, job, stop)
+        last_time, last_bytes = time.monotonic(), job.transferred_bytes
+        try:
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=self.checkpoint_interval)
+                now, transferred = time.monotonic(), job.transferred_bytes
+                self._record_throughput(job, now - last_time, transferred - last_bytes)
+                last_time, last_bytes = now, transferred
+                if done:
+                    break
+                await self.jobs.update(job)
+        finally:
+            job.current_throughput = 0.0
+        future.result()
+
+        job.state = "verifying"
+        await self.jobs.update(job)
+        verification = await model_verifier.verify(
+            job.repo_id, expected_files(job.files), job.revision
+        )
+        if verification.failed_files:
+            await loop.run_in_executor(
+                self._executor, self._discard_files, job, verification.failed_files
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"Integrity check failed: {'; '.join(verification.problems)}",
+            )
+
+        try:
+            linked, saved = await blob_store.store_folder(job.repo_id.replace("/", "_"))
+            if linked:
+                logger.info(f"Linked {linked} files of {job.repo_id} to stored copies, saving {saved} bytes")
+        except Exception as e:
+            # The model is usable either way
+            logger.warning(f"deduplicating {job.repo_id}: {e}")
+
+    @staticmethod
+    def _discard_files(job: ModelDownloadJob, paths: List[str]) -> None:
+        """Remove files that failed verification so a resume fetches them again."""
+        folder = model_folder(job.repo_id)
+        for file in job.files:
+            if file.path not in paths:
+                continue
+            try:
+                os.remove(os.path.join(folder, file.path))
+            except FileNotFoundError:
+                pass
+            job.downloaded_bytes -= file.downloaded
+            file.downloaded = 0
+            file.chunks = []
+            file.done = False
+
+    @staticmethod
+    def _record_throughput(job: ModelDownloadJob, elapsed: float, transferred: int) -> None:
+        """Fold one checkpoint interval into the job's throughput figures."""
+        if elapsed <= 0:
+            return
+        job.active_seconds += elapsed
+        job.current_throughput = transferred / elapsed
+        job.average_throughput = job.transferred_bytes / job.active_seconds
+
+    async def _run(self, entry: _DownloadTask) -> None:
+        """Wait for a slot, download, and record the outcome."""
+        job = entry.job
+        cancelled = False
+        try:
+            async with self._slots:
+                job.state = "downloading"
+                job.started = datetime.now()
+                await self._download(job, entry.stop)
+            job.state = "completed"
+        except asyncio.CancelledError:
+            # Recorded below, then raised again so the task ends cancelled
+            cancelled = True
+            job.state = "cancelled" if entry.cancelled_by_user else "queued"
+        except DownloadCancelled:
+            # A shutdown leaves the job queued so the next start resumes it
+            job.state = "cancelled" if entry.cancelled_by_user else "queued"
+        except HTTPException as e:
+            job.state = "failed"
+            job.error = str(e.detail)
+        except Exception as e:
+            logger.error(f"downloading model {job.repo_id}: {e}")
+            job.state = "failed"
+            job.error = str(e)
+        finally:
+            del self._running[job.id]
+            if self._active.get(job.repo_id) == job.id:
+                del self._active[job.repo_id]
+
+        if job.state != "queued":
+            job.finished = datetime.now()
+        await self.jobs.update(job)
+        if cancelled:
+            raise asyncio.CancelledError()
+        if job.state == "completed":
+            await model_quota.record_use(job.repo_id)
+
+
+# Shared job table, configured and started from the application lifespan
+model_downloads = ModelDownloads()
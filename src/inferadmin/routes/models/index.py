@@ -0,0 +1,346 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from inferadmin.common.async_utils import get_io_executor
+from inferadmin.common.inotify import (
+    IN_CONTENT_CHANGES,
+    IN_IGNORED,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+)
+from inferadmin.common.logging import logger
+from inferadmin.state.manager import StateManager
+from inferadmin.state import STATE_DIR
+from .models import Model, ModelFile, ModelIndexEntry
+from .safetensors import read_weights
+from .support import RESERVED_PREFIX, scan_model_folder
+
+# Bumped when what entries record changes, so older entries are re-indexed
+INDEX_VERSION = 2
+
+
+def index_model_folder(name: str, path: str) -> Optional[ModelIndexEntry]:
+    """
+    Walk one model folder into an index entry.
+
+    Invalid folders are recorded without a walk, marked only by the folder's
+    own mtime so that adding the missing files triggers a re-index.
+
+    Returns:
+        The entry, or None if the folder no longer exists
+    """
+    scan = scan_model_folder(path)
+    if scan is None:
+        try:
+            folder_mtime_ns = os.stat(path).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return ModelIndexEntry(
+            id=name,
+            path=path,
+            valid=False,
+            markers={"": folder_mtime_ns},
+            version=INDEX_VERSION,
+            indexed=datetime.now(),
+        )
+
+    return ModelIndexEntry(
+        id=name,
+        path=path,
+        valid=True,
+        total_bytes=scan.total_bytes,
+        last_modified=datetime.fromtimestamp(scan.last_modified),
+        files=[ModelFile(path=f.path, size=f.size, mtime=f.mtime) for f in scan.files],
+        markers=scan.directories,
+        weights=read_weights(path, [f.path for f in scan.files]),
+        version=INDEX_VERSION,
+        indexed=datetime.now(),
+    )
+
+
+def markers_unchanged(entry: ModelIndexEntry) -> bool:
+    """Whether every directory of an indexed folder still has its recorded mtime."""
+    try:
+        return all(
+            os.stat(os.path.join(entry.path, relative)).st_mtime_ns == mtime_ns
+            for relative, mtime_ns in entry.markers.items()
+        )
+    except OSError:
+        return False
+
+
+def survey_volume(
+    volume_path: str, entries: Dict[str, ModelIndexEntry], full: bool
+) -> Tuple[List[str], Dict[str, Optional[ModelIndexEntry]]]:
+    """
+    List the model folders on the volume and re-index those that changed.
+
+    Args:
+        volume_path: The model storage path
+        entries: Current index entries by folder name
+        full: Re-index every folder, even if its markers are unchanged
+
+    Returns:
+        The folder names present, and fresh entries for re-indexed folders
+    """
+    try:
+        with os.scandir(volume_path) as folders:
+            names = [
+                folder.name for folder in folders
+                if folder.is_dir() and not folder.name.startswith(RESERVED_PREFIX)
+            ]
+    except FileNotFoundError:
+        return [], {}
+
+    changed: Dict[str, Optional[ModelIndexEntry]] = {}
+    for name in names:
+        entry = entries.get(name)
+        if (
+            full
+            or entry is None
+            or entry.version != INDEX_VERSION
+            or not markers_unchanged(entry)
+        ):
+            changed[name] = index_model_folder(name, os.path.join(volume_path, name))
+    return names, changed
+
+
+def to_model(entry: ModelIndexEntry) -> Model:
+    """The API record of an indexed model."""
+    return Model(
+        repo_id=entry.id.replace("_", "/"),
+        path=entry.path,
+        size_gb=round(entry.total_bytes / (1024**3), 2),
+        last_updated=entry.last_modified,
+        # The entry is shared with the index; the weights summary is small to copy
+        weights=entry.weights.model_copy(deep=True) if entry.weights is not None else None,
+    )
+
+
+class ModelIndex:
+    """
+    Persistent index of the model folders on the model volume.
+
+    Each folder's validity, size, newest mtime, file manifest and weights
+    summary (from its safetensors headers) are stored with the mtimes of
+    its directories. On startup an entry is reused as long as those markers
+    are unchanged, so only folders that changed are walked again. While running, inotify watches on every directory mark
+    folders dirty as files change and they are re-indexed shortly after; a
+    periodic full rescan catches what inotify can't see, such as changes
+    made by other hosts on a network mount. Without inotify the markers are
+    polled instead. Listing reads the index only.
+    """
+
+    def __init__(
+        self,
+        volume_path: str = "",
+        rescan_interval: float = 3600.0,
+        poll_interval: float = 60.0,
+        debounce: float = 1.0,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            volume_path: The model storage path
+            rescan_interval: Seconds between full rescans
+            poll_interval: Seconds between marker checks when inotify is unavailable
+            debounce: Seconds to let a folder's changes settle before re-indexing it
+        """
+        self.volume_path = volume_path
+        self.rescan_interval = rescan_interval
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+
+        self.entries = StateManager(STATE_DIR, "model_index.json", ModelIndexEntry)
+        self._synced = False
+        self._inotify: Optional[Inotify] = None
+        self._root_wd: Optional[int] = None
+        # Watch descriptor -> folder name
+        self._watches: Dict[int, str] = {}
+        self._dirty: Set[str] = set()
+        self._flush_scheduled = False
+        self._rescan_now = asyncio.Event()
+        self._scanner: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def synced(self) -> bool:
+        """Whether the index reflects at least one survey of the volume."""
+        return self._synced
+
+    async def start(self) -> None:
+        """Start watching the volume and keeping the index current."""
+        if Inotify.available():
+            try:
+                self._inotify = Inotify(self._handle_event)
+                self._inotify.start()
+                self._root_wd = self._inotify.add_watch(
+                    self.volume_path, IN_CONTENT_CHANGES | IN_ONLYDIR
+                )
+            except OSError as e:
+                logger.warning(f"watching model volume, falling back to polling: {e}")
+                self._close_inotify()
+        self._scanner = asyncio.create_task(self._scan_loop())
+
+    async def stop(self) -> None:
+        """Stop watching and cancel any re-index in flight."""
+        if self._scanner is not None:
+            self._scanner.cancel()
+            self._scanner = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._close_inotify()
+        self._synced = False
+
+    def _close_inotify(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+        self._inotify = None
+        self._root_wd = None
+        self._watches.clear()
+
+    def _spawn(self, coro) -> None:
+        """Run a re-index in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # Lookups
+
+    def list_models(self) -> List[Model]:
+        """
+        Every valid model folder, from the index.
+
+        Entries are read without copying their file manifests, so listing
+        costs O(models) however many files they hold.
+        """
+        return [to_model(entry) for entry in self.entries.view_all() if entry.valid]
+
+    def get(self, name: str) -> Optional[ModelIndexEntry]:
+        """The index entry of a model folder."""
+        return self.entries.get_by_id(name)
+
+    # Re-indexing
+
+    def _watch(self, entry: ModelIndexEntry) -> None:
+        """Watch every directory of an indexed folder."""
+        if self._inotify is None:
+            return
+        for relative in entry.markers:
+            try:
+                wd = self._inotify.add_watch(
+                    os.path.join(entry.path, relative), IN_CONTENT_CHANGES | IN_ONLYDIR
+                )
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"watching {entry.path}, falling back to polling: {e}")
+                self._close_inotify()
+                return
+            self._watches[wd] = entry.id
+
+    async def _apply(self, name: str, entry: Optional[ModelIndexEntry]) -> None:
+        """Store a fresh entry, or drop the folder if it is gone."""
+        if entry is None:
+            for wd in [wd for wd, folder in self._watches.items() if folder == name]:
+                del self._watches[wd]
+            await self.entries.delete(name)
+            return
+        self._watch(entry)
+        await self.entries.update(entry)
+
+    async def rescan(self, full: bool = False) -> None:
+        """
+        Survey the volume, re-indexing new and changed folders.
+
+        Args:
+            full: Re-index every folder instead of trusting unchanged markers
+        """
+        # Stored entries are replaced, never changed, so the survey thread can read them
+        current = {entry.id: entry for entry in self.entries.view_all()}
+        loop = asyncio.get_running_loop()
+        names, changed = await loop.run_in_executor(
+            get_io_executor(), survey_volume, self.volume_path, current, full
+        )
+
+        for name, entry in changed.items():
+            await self._apply(name, entry)
+        for name in set(current) - set(names):
+            await self._apply(name, None)
+        if self._inotify is not None and not full:
+            # Reused entries still need watches after a restart
+            for name in set(names) - set(changed):
+                self._watch(current[name])
+        self._synced = True
+
+    async def refresh(self, name: str) -> None:
+        """Re-index one folder now, e.g. right after a download or delete."""
+        self._dirty.discard(name)
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(
+            get_io_executor(), index_model_folder, name, os.path.join(self.volume_path, name)
+        )
+        await self._apply(name, entry)
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        """Mark the folder an inotify event belongs to as dirty."""
+        if mask & IN_Q_OVERFLOW:
+            # Events were lost; only a full rescan can tell what changed
+            self._rescan_now.set()
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+
+        folder = name if wd == self._root_wd else self._watches.get(wd)
+        if not folder or folder.startswith(RESERVED_PREFIX):
+            return
+        self._dirty.add(folder)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_later(
+                self.debounce, lambda: self._spawn(self._flush_dirty())
+            )
+
+    async def _flush_dirty(self) -> None:
+        """Re-index every folder marked dirty since the last flush."""
+        self._flush_scheduled = False
+        dirty, self._dirty = self._dirty, set()
+        for name in dirty:
+            try:
+                await self.refresh(name)
+            except Exception as e:
+                logger.error(f"re-indexing model folder {name}: {e}")
+
+    async def _scan_loop(self) -> None:
+        """Survey on start, then rescan periodically or when events were lost."""
+        last_full = time.monotonic()
+        full = False
+        while True:
+            self._rescan_now.clear()
+            try:
+                await self.rescan(full=full)
+            except Exception as e:
+                logger.error(f"indexing model volume: {e}")
+                self._synced = False
+            if full:
+                last_full = time.monotonic()
+
+            # Inotify covers local changes between full rescans; without it
+            # the markers are polled in between
+            interval = self.rescan_interval if self._inotify is not None else self.poll_interval
+            try:
+                await asyncio.wait_for(self._rescan_now.wait(), timeout=interval)
+                # Woken early because inotify events were lost
+                full = True
+            except asyncio.TimeoutError:
+                full = time.monotonic() - last_full >= self.rescan_interval
+
+
+# Shared index, configured and started from the application lifespan
+model_index = ModelIndex()
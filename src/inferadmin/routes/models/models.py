@@ -1,13 +1,32 @@
-from typing import Literal
-from pydantic import BaseModel
+from typing import Dict, Literal
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 
+class ModelIntegrity(BaseModel):
+    state: Literal["unverified", "verifying", "verified", "failed"]
+    checked: datetime | None = None
+    problems: list[str] = []
+
+
+class ModelWeights(BaseModel):
+    parameters: int
+    # Parameters stored in each safetensors dtype, e.g. {"BF16": 8030261248}
+    dtypes: Dict[str, int]
+    weight_bytes: int
+    weight_vram_gb: float = Field(
+        ..., description="GPU memory the weights take as stored; excludes KV cache and activations"
+    )
+    shards: int
+
+
 class Model(BaseModel):
     repo_id: str
     path: str
     size_gb: float
     last_updated: datetime | None
+    integrity: ModelIntegrity | None = None
+    weights: ModelWeights | None = None
 
 
 class GetModelsResponse(BaseModel):
@@ -17,7 +36,225 @@ class GetModelsResponse(BaseModel):
 class PostModelRequest(BaseModel):
     repo_id: str
     source: Literal["Huggingface"]
+    workers: int | None = Field(
+        None, ge=1, le=64, description="Files or chunks fetched in parallel; defaults to the configured count"
+    )
+    allow_patterns: list[str] | None = Field(
+        None, description="Only fetch files matching one of these globs, e.g. [\"*.safetensors\", \"*.json\"]"
+    )
+    ignore_patterns: list[str] | None = Field(
+        None, description="Skip files matching any of these globs, e.g. [\"*.bin\"]"
+    )
 
 
 class DeleteModelRequest(BaseModel):
-    repo_id: str
\ No newline at end of file
+    repo_id: str
+
+
+class VerifyModelRequest(BaseModel):
+    repo_id: str
+
+class ModelFile(BaseModel):
+    path: str
+    size: int
+    mtime: float
+
+
+class ModelIndexEntry(BaseModel):
+    id: str = Field(..., description="Name of the model folder")
+    path: str
+    valid: bool
+    total_bytes: int = 0
+    last_modified: datetime | None = None
+    files: list[ModelFile] = []
+    # mtime_ns of each directory in the folder, by relative path
+    markers: Dict[str, int] = {}
+    weights: ModelWeights | None = None
+    # Entries written by an older index format are re-indexed
+    version: int = 0
+    indexed: datetime
+
+
+class ModelFileProgress(BaseModel):
+    path: str
+    size: int | None = None
+    downloaded: int = 0
+    done: bool = False
+    # Bytes of each chunk known to be on disk, for resuming
+    chunks: list[int] = []
+    # What the repository records for the file: the SHA256 of LFS files
+    # (their etag), and the git blob ID, which hashes the content of the rest
+    sha256: str | None = None
+    blob_id: str | None = None
+
+
+class ModelDownloadJob(BaseModel):
+    id: str
+    repo_id: str
+    revision: str | None = Field(None, description="Commit the files are pinned to, once resolved")
+    state: Literal["queued", "downloading", "verifying", "completed", "failed", "cancelled"] = "queued"
+    created: datetime
+    started: datetime | None = None
+    finished: datetime | None = None
+    workers: int = 1
+    chunk_size: int = 64 * 1024 * 1024
+    allow_patterns: list[str] | None = None
+    ignore_patterns: list[str] | None = None
+    files: list[ModelFileProgress] = []
+    downloaded_bytes: int = 0
+    total_bytes: int = 0
+    # Throughput: bytes fetched over the network (excluding resumed ones),
+    # time spent downloading, and the resulting rates in bytes per second
+    transferred_bytes: int = 0
+    active_seconds: float = 0.0
+    average_throughput: float = 0.0
+    current_throughput: float = 0.0
+    error: str | None = None
+
+
+class ExpectedModelFile(BaseModel):
+    size: int | None = None
+    sha256: str | None = None
+    blob_id: str | None = None
+
+
+class FileVerification(BaseModel):
+    # The file as it was hashed; a different size or mtime means re-hashing
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+    blob_id: str | None = None
+
+
+class ModelVerification(BaseModel):
+    id: str = Field(..., description="Name of the model folder")
+    repo_id: str
+    revision: str | None = None
+    expected: Dict[str, ExpectedModelFile] = {}
+    results: Dict[str, FileVerification] = {}
+    state: Literal["unverified", "verifying", "verified", "failed"] = "unverified"
+    checked: datetime | None = None
+    problems: list[str] = []
+    # Files failing the last check, by relative path
+    failed_files: list[str] = []
+    # Bytes hashed by the last check; unchanged files are served from cache
+    hashed_bytes: int = 0
+
+
+class ModelDedupJob(BaseModel):
+    state: Literal["idle", "running", "completed", "failed", "cancelled"] = "idle"
+    started: datetime | None = None
+    finished: datetime | None = None
+    folders_total: int = 0
+    folders_done: int = 0
+    files_linked: int = 0
+    # Bytes no longer stored twice thanks to this run
+    saved_bytes: int = 0
+    error: str | None = None
+
+
+class ModelDedupReport(BaseModel):
+    blobs: int
+    # Bytes the blobs take on disk, once each
+    stored_bytes: int
+    # Bytes the model folders would take with a copy per reference
+    referenced_bytes: int
+    saved_bytes: int
+    # Blobs no model folder links to any more, awaiting collection
+    unreferenced_blobs: int
+    job: ModelDedupJob
+
+
+class ModelResidency(BaseModel):
+    repo_id: str
+    path: str
+    total_bytes: int
+    # Bytes of the model's files currently in the page cache
+    resident_bytes: int
+    resident_percent: float
+
+
+class GetModelResidencyResponse(BaseModel):
+    models: list[ModelResidency]
+
+
+class ModelPrewarmJob(BaseModel):
+    id: str
+    repo_id: str
+    state: Literal["queued", "running", "completed", "failed", "cancelled"] = "queued"
+    created: datetime
+    started: datetime | None = None
+    finished: datetime | None = None
+    total_bytes: int = 0
+    read_bytes: int = 0
+    # Bytes per second read while running
+    throughput: float = 0.0
+    resident_percent_before: float | None = None
+    resident_percent_after: float | None = None
+    error: str | None = None
+
+
+class PrewarmModelRequest(BaseModel):
+    repo_id: str
+
+
+class ModelPrewarmIdRequest(BaseModel):
+    id: str
+
+
+class GetModelPrewarmJobsResponse(BaseModel):
+    jobs: list[ModelPrewarmJob]
+
+
+class ModelTrashStatus(BaseModel):
+    # Deleted folders still being reclaimed
+    folders: int = 0
+    # Bytes those folders will free, as far as measured so far
+    pending_bytes: int = 0
+    # Bytes freed since startup
+    reclaimed_bytes: int = 0
+    current: str | None = None
+
+
+class ModelUsage(BaseModel):
+    id: str = Field(..., description="Name of the model folder")
+    repo_id: str
+    last_used: datetime | None = None
+    last_deployed: datetime | None = None
+
+
+class EvictionCandidate(BaseModel):
+    repo_id: str
+    size_bytes: int
+    last_used: datetime | None = None
+    last_deployed: datetime | None = None
+
+
+class EvictionPlan(BaseModel):
+    # Includes the space reserved by downloads in progress
+    used_bytes: int
+    reserved_bytes: int = 0
+    capacity_bytes: int
+    high_watermark_bytes: int
+    low_watermark_bytes: int
+    # Space the caller is about to write
+    needed_bytes: int
+    # Least recently used first; empty when the download fits below the high watermark
+    evict: list[EvictionCandidate] = []
+    freed_bytes: int = 0
+    # Whether evicting these makes room for the download
+    sufficient: bool
+
+
+class PostModelResponse(BaseModel):
+    status: str
+    message: str
+    job: ModelDownloadJob
+
+
+class GetModelDownloadsResponse(BaseModel):
+    jobs: list[ModelDownloadJob]
+
+
+class ModelDownloadIdRequest(BaseModel):
+    id: str
@@ -0,0 +1,343 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from inferadmin.common.async_utils import get_io_executor
+from inferadmin.common.logging import logger
+from inferadmin.common.pagecache import advise_sequential, resident_bytes, residency_available
+from .models import ModelPrewarmJob, ModelResidency
+from .quota import model_quota
+from .support import RESERVED_PREFIX, model_folder
+from .transfer import PARTIAL_DIR
+
+FINISHED_STATES = {"completed", "failed", "cancelled"}
+
+# Bytes per read into the worker's buffer
+READ_SIZE = 4 * 1024 * 1024
+
+
+def model_files(folder: str) -> List[Tuple[str, int]]:
+    """Every regular file of a model folder with its size, largest first."""
+    partial_root = PARTIAL_DIR.split(os.sep)[0]
+    files = []
+    for root, dirs, names in os.walk(folder):
+        if root == folder and partial_root in dirs:
+            dirs.remove(partial_root)
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                if os.path.isfile(path):
+                    files.append((path, os.path.getsize(path)))
+            except FileNotFoundError:
+                continue
+    return sorted(files, key=lambda f: f[1], reverse=True)
+
+
+def folder_residency(folder: str) -> Tuple[int, int]:
+    """
+    How much of a model folder is in the page cache.
+
+    Returns:
+        Resident bytes and total bytes
+    """
+    resident = total = 0
+    for path, size in model_files(folder):
+        total += size
+        try:
+            resident += resident_bytes(path)
+        except OSError:
+            continue
+    return resident, total
+
+
+def volume_residency(volume_path: str) -> List[ModelResidency]:
+    """Page-cache residency of every model folder on the volume."""
+    try:
+        with os.scandir(volume_path) as entries:
+            folders = [
+                entry for entry in entries
+                if entry.is_dir() and not entry.name.startswith(RESERVED_PREFIX)
+            ]
+    except FileNotFoundError:
+        return []
+    models = []
+    for folder in folders:
+        resident, total = folder_residency(folder.path)
+        models.append(
+            ModelResidency(
+                repo_id=folder.name.replace("_", "/"),
+                path=folder.path,
+                total_bytes=total,
+                resident_bytes=resident,
+                resident_percent=_percent(resident, total),
+            )
+        )
+    return models
+
+
+def _percent(part: int, whole: int) -> float:
+    return round(100.0 * part / whole, 1) if whole else 100.0
+
+
+_buffers = threading.local()
+
+
+def read_chunk(
+    path: str,
+    offset: int,
+    length: int,
+    stop: threading.Event,
+    on_bytes: Callable[[int], None],
+) -> None:
+    """
+    Read a byte range of a file into the page cache.
+
+    The range is announced with ``posix_fadvise`` so the kernel reads ahead
+    in large sequential requests, then read with ``preadv`` into a
+    per-thread buffer, which releases the GIL and guarantees the pages are
+    resident when it returns.
+    """
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _buffers.buffer = bytearray(READ_SIZE)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        advise_sequential(fd, offset, length)
+        end = offset + length
+        while offset < end:
+            if stop.is_set():
+                return
+            view = memoryview(buffer)[: min(READ_SIZE, end - offset)]
+            read = os.preadv(fd, [view], offset)
+            if not read:
+                return
+            offset += read
+            on_bytes(read)
+    finally:
+        os.close(fd)
+
+
+class _PrewarmTask:
+    """A job record plus the event that stops its readers."""
+
+    def __init__(
+        self, job: ModelPrewarmJob, run: Callable[["_PrewarmTask"], Coroutine[Any, Any, None]]
+    ):
+        self.job = job
+        self.stop = threading.Event()
+        self.task = asyncio.create_task(run(self))
+
+
+class ModelPrewarmer:
+    """
+    Reads model weights into the page cache ahead of a deployment.
+
+    An inference engine's cold start is dominated by reading its weights
+    from the volume. A prewarm job reads every file of a model folder in
+    ``chunk_size`` ranges on ``workers`` threads, each range hinted to the
+    kernel as sequential so it is fetched in large requests, and records
+    the bytes read and the throughput. Residency before and after is
+    measured with ``mincore``. Jobs for the same model share one run, one
+    job reads at a time so prewarms don't compete for the disk, and
+    finished jobs are kept until ``history`` newer ones replace them.
+    """
+
+    def __init__(self, workers: int = 4, chunk_size: int = 64 * 1024 * 1024, history: int = 100):
+        """
+        Initialize the job table.
+
+        Args:
+            workers: Threads reading ranges in parallel
+            chunk_size: Bytes per range handed to a thread
+            history: Finished jobs kept for polling
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.history = history
+
+        self._jobs: "OrderedDict[str, _PrewarmTask]" = OrderedDict()
+        # Repository -> ID of its queued or running job
+        self._active: Dict[str, str] = {}
+        self._slot = asyncio.Lock()
+
+    # Lookups
+
+    def get(self, job_id: str) -> Optional[ModelPrewarmJob]:
+        """A job by ID, or None if it is unknown or has been forgotten."""
+        entry = self._jobs.get(job_id)
+        return entry.job if entry else None
+
+    def list(self) -> List[ModelPrewarmJob]:
+        """Every known job, oldest first."""
+        return [entry.job for entry in self._jobs.values()]
+
+    def require(self, job_id: str) -> ModelPrewarmJob:
+        """
+        A job by ID.
+
+        Raises:
+            HTTPException: 404 if the job is unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Prewarm job not found: {job_id}")
+        return job
+
+    async def residency(self, volume_path: str) -> List[ModelResidency]:
+        """
+        Page-cache residency of every model on the volume.
+
+        Raises:
+            HTTPException: 501 if the platform can't report residency
+        """
+        if not residency_available():
+            raise HTTPException(status_code=501, detail="Page-cache residency is not available on this platform")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_io_executor(), volume_residency, volume_path)
+
+    # Control
+
+    def submit(self, repo_id: str) -> ModelPrewarmJob:
+        """
+        Start prewarming a model, or join the job already prewarming it.
+
+        Raises:
+            HTTPException: 404 if the model isn't on the volume
+        """
+        job_id = self._active.get(repo_id)
+        if job_id is not None:
+            return self._jobs[job_id].job
+        if not os.path.isdir(model_folder(repo_id)):
+            raise HTTPException(status_code=404, detail=f"Model not found: {repo_id}")
+
+        entry = _PrewarmTask(
+            ModelPrewarmJob(id=uuid.uuid4().hex, repo_id=repo_id, created=datetime.now()),
+            self._run,
+        )
+        self._jobs[entry.job.id] = entry
+        self._active[repo_id] = entry.job.id
+        self._trim()
+        return entry.job
+
+    async def wait(self, job_id: str) -> ModelPrewarmJob:
+        """Wait for a job to finish and return it."""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return self.require(job_id)
+        await asyncio.gather(asyncio.shield(entry.task), return_exceptions=True)
+        return entry.job
+
+    async def prewarm(self, repo_id: str) -> ModelPrewarmJob:
+        """Prewarm a model and wait for it, e.g. right before starting its engine."""
+        return await self.wait(self.submit(repo_id).id)
+
+    async def cancel(self, job_id: str) -> ModelPrewarmJob:
+        """
+        Stop a queued or running job.
+
+        Raises:
+            HTTPException: 404 if the job is unknown
+        """
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return self.require(job_id)
+        entry.stop.set()
+        if entry.job.state == "queued":
+            entry.task.cancel()
+        await asyncio.gather(entry.task, return_exceptions=True)
+        return entry.job
+
+    async def close(self) -> None:
+        """Stop every job still queued or running."""
+        entries = [e for e in self._jobs.values() if not e.task.done()]
+        for entry in entries:
+            entry.stop.set()
+            entry.task.cancel()
+        await asyncio.gather(*(e.task for e in entries), return_exceptions=True)
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond ``history``."""
+        finished = [
+            job_id for job_id, entry in self._jobs.items()
+            if entry.job.state in FINISHED_STATES
+        ]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    # Running
+
+    def _read_all(self, job: ModelPrewarmJob, stop: threading.Event) -> None:
+        """Read every file of the model on the worker threads."""
+        folder = model_folder(job.repo_id)
+        files = model_files(folder)
+        job.total_bytes = sum(size for _, size in files)
+        if residency_available():
+            resident, _ = folder_residency(folder)
+            job.resident_percent_before = _percent(resident, job.total_bytes)
+
+        lock = threading.Lock()
+
+        def on_bytes(size: int) -> None:
+            with lock:
+                job.read_bytes += size
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="inferadmin-prewarm-"
+        ) as pool:
+            futures = [
+                pool.submit(read_chunk, path, offset, min(self.chunk_size, size - offset), stop, on_bytes)
+                for path, size in files
+                for offset in range(0, size, self.chunk_size)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+        job.throughput = job.read_bytes / elapsed if elapsed > 0 else 0.0
+
+        if residency_available():
+            resident, _ = folder_residency(folder)
+            job.resident_percent_after = _percent(resident, job.total_bytes)
+
+    async def _run(self, entry: _PrewarmTask) -> None:
+        """Wait for the disk, then read the model while recording progress."""
+        job = entry.job
+        try:
+            async with self._slot:
+                job.state = "running"
+                job.started = datetime.now()
+                loop = asyncio.get_running_loop()
+                # The loop's default executor, not the IO pool: reading a
+                # large model takes minutes
+                await loop.run_in_executor(None, self._read_all, job, entry.stop)
+            job.state = "cancelled" if entry.stop.is_set() else "completed"
+            if job.state == "completed":
+                logger.info(
+                    f"Prewarmed {job.repo_id}: {job.read_bytes} bytes "
+                    f"at {job.throughput / 1024**2:.0f} MiB/s"
+                )
+                await model_quota.record_use(job.repo_id)
+        except asyncio.CancelledError:
+            # Recorded, then raised again so the task ends cancelled
+            job.state = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"prewarming model {job.repo_id}: {e}")
+            job.state = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = datetime.now()
+            if self._active.get(job.repo_id) == job.id:
+                del self._active[job.repo_id]
+
+
+# Shared job table, configured from the application lifespan
+model_prewarmer = ModelPrewarmer()
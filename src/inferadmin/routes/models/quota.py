@@ -0,0 +1,339 @@
+import asyncio
+import os
+import shutil
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+
+from inferadmin.common.async_utils import get_io_executor
+from inferadmin.common.logging import logger
+from inferadmin.state.manager import StateManager
+from inferadmin.state import STATE_DIR
+from .blobs import stored_inodes
+from .index import model_index
+from .models import EvictionCandidate, EvictionPlan, ModelIndexEntry, ModelUsage
+from .support import delete_model
+from .trash import model_reaper
+from .verify import model_verifier
+
+# A file's (device, inode), or its path when it can't be stat'ed
+FileKey = Tuple
+
+
+class LinkSurvey:
+    """
+    Which files of the indexed models share storage through hard links.
+
+    Every file is keyed by its inode, so a blob linked into several model
+    folders is counted once, and a folder only frees the inodes that no
+    other folder, nor anything outside the model folders, still links to.
+    Links from the blob store don't hold storage, since unreferenced blobs
+    are collected once a deleted model is reclaimed.
+    """
+
+    def __init__(self, volume_path: str, entries: List[ModelIndexEntry]):
+        """
+        Stat every file of the given entries.
+
+        Args:
+            volume_path: The model storage path
+            entries: Valid index entries
+        """
+        # Folder -> links it holds to each file
+        self.folders: Dict[str, Dict[FileKey, int]] = {}
+        self.sizes: Dict[FileKey, int] = {}
+        # Links from model folders to each file
+        self.refs: Dict[FileKey, int] = {}
+        # Files also linked from outside the model folders, which evicting never frees
+        self.pinned: Set[FileKey] = set()
+
+        links: Dict[FileKey, int] = {}
+        for entry in entries:
+            held = self.folders.setdefault(entry.id, {})
+            for file in entry.files:
+                path = os.path.join(entry.path, file.path)
+                try:
+                    stat = os.stat(path, follow_symlinks=False)
+                    key: FileKey = (stat.st_dev, stat.st_ino)
+                    size, nlink = stat.st_size, stat.st_nlink
+                except OSError:
+                    key, size, nlink = (path,), file.size, 1
+                held[key] = held.get(key, 0) + 1
+                self.sizes[key] = size
+                self.refs[key] = self.refs.get(key, 0) + 1
+                links[key] = nlink
+
+        blobs = stored_inodes(volume_path)
+        for key, nlink in links.items():
+            if nlink > self.refs[key] + (1 if key in blobs else 0):
+                self.pinned.add(key)
+
+    def used(self) -> int:
+        """Bytes the files take, each counted once."""
+        return sum(self.sizes.values())
+
+    def exclusive(self, name: str) -> int:
+        """Bytes that evicting only this folder would free."""
+        return sum(
+            self.sizes[key]
+            for key, count in self.folders.get(name, {}).items()
+            if count == self.refs[key] and key not in self.pinned
+        )
+
+    def evict(self, name: str) -> int:
+        """Drop a folder's links, returning the bytes that frees."""
+        freed = 0
+        for key, count in self.folders.pop(name, {}).items():
+            self.refs[key] -= count
+            if self.refs[key] == 0 and key not in self.pinned:
+                freed += self.sizes[key]
+        return freed
+
+
+class ModelQuota:
+    """
+    Storage quota for the model volume, enforced by evicting unused models.
+
+    Usage is measured against ``quota`` bytes of indexed models, or against
+    the filesystem itself when no quota is set, so that other writers on
+    the disk count too. Before a download starts, if it would take usage
+    past the high watermark, the least recently used models that no running
+    deployment references are deleted until usage plus the download fits
+    under the low watermark. Files hard linked between models, e.g. through
+    the blob store, count once and are only freed with the last model that
+    links them. A download then holds a reservation for what it has still
+    to write until it is indexed, so concurrent downloads can't count on
+    the same free space. Last-used and last-deployed times are kept per
+    model in the state store.
+    """
+
+    def __init__(
+        self,
+        volume_path: str = "",
+        quota: int = 0,
+        high_watermark: float = 0.9,
+        low_watermark: float = 0.8,
+    ):
+        """
+        Initialize the quota.
+
+        Args:
+            volume_path: The model storage path
+            quota: Bytes models may use, 0 for the whole filesystem
+            high_watermark: Fraction of the capacity that triggers eviction
+            low_watermark: Fraction of the capacity eviction frees down to
+        """
+        self.volume_path = volume_path
+        self.quota = quota
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        # Repositories referenced by running deployments, which are never evicted
+        self.in_use: Callable[[], Set[str]] = set
+
+        self.usage = StateManager(STATE_DIR, "model_usage.json", ModelUsage)
+        self._lock = asyncio.Lock()
+        # Repository -> size of its download in progress, and the bytes written so far
+        self._reservations: Dict[str, Tuple[int, Callable[[], int]]] = {}
+
+    # Usage tracking
+
+    async def record_use(self, repo_id: str, deployed: bool = False) -> None:
+        """
+        Mark a model as just used, e.g. downloaded, prewarmed or deployed.
+
+        Args:
+            repo_id: The HF repo name
+            deployed: Whether a deployment started with it
+        """
+        name = repo_id.replace("/", "_")
+        now = datetime.now()
+        usage = self.usage.get_by_id(name)
+        if usage is None:
+            usage = ModelUsage(id=name, repo_id=repo_id, last_used=now)
+            if deployed:
+                usage.last_deployed = now
+            await self.usage.add(usage)
+            return
+        usage.last_used = now
+        if deployed:
+            usage.last_deployed = now
+        await self.usage.update(usage)
+
+    async def forget(self, repo_id: str) -> None:
+        """Drop the usage record of a deleted model."""
+        await self.usage.delete(repo_id.replace("/", "_"))
+
+    # Planning
+
+    def _measure(self, entries: List[ModelIndexEntry]) -> Tuple[int, int, LinkSurvey]:
+        """
+        Bytes used, the capacity they count against, and how models share files.
+
+        Runs on the IO thread pool, so it is given the valid index entries
+        rather than reading the index while the event loop updates it.
+        """
+        links = LinkSurvey(self.volume_path, entries)
+        if self.quota > 0:
+            return links.used(), self.quota, links
+        disk = shutil.disk_usage(self.volume_path)
+        # Trash being reclaimed is as good as free
+        return max(disk.used - model_reaper.status.pending_bytes, 0), disk.total, links
+
+    def _outstanding(self, total_bytes: int, written: Callable[[], int]) -> int:
+        """Bytes a download has yet to add to the measured usage."""
+        # Under a quota only indexed models count, and a partial download isn't indexed
+        return total_bytes if self.quota > 0 else max(total_bytes - written(), 0)
+
+    def _reserved(self, exclude: Optional[str] = None) -> int:
+        """Space held by downloads in progress."""
+        return sum(
+            self._outstanding(total_bytes, written)
+            for repo_id, (total_bytes, written) in self._reservations.items()
+            if repo_id != exclude
+        )
+
+    def _candidates(
+        self, exclude: Optional[str], entries: List[ModelIndexEntry], links: LinkSurvey
+    ) -> List[EvictionCandidate]:
+        """Evictable models, least recently used first, sized by what evicting each alone frees."""
+        protected = set(self.in_use())
+        if exclude is not None:
+            protected.add(exclude)
+        candidates = []
+        for entry in entries:
+            usage = self.usage.view_by_id(entry.id)
+            repo_id = usage.repo_id if usage else entry.id.replace("_", "/")
+            if repo_id in protected:
+                continue
+            candidates.append(
+                EvictionCandidate(
+                    repo_id=repo_id,
+                    size_bytes=links.exclusive(entry.id),
+                    # Never used since download: the download itself is the last use
+                    last_used=(usage.last_used if usage else None) or entry.last_modified,
+                    last_deployed=usage.last_deployed if usage else None,
+                )
+            )
+        return sorted(candidates, key=lambda c: c.last_used or datetime.min)
+
+    async def plan(self, needed_bytes: int = 0, exclude: Optional[str] = None) -> EvictionPlan:
+        """
+        What making room for ``needed_bytes`` would evict, without evicting.
+
+        Args:
+            needed_bytes: Space about to be written
+            exclude: A repository never to evict, e.g. the one being downloaded
+        """
+        loop = asyncio.get_running_loop()
+        # Stored entries are replaced, never changed, so a snapshot of them is safe to share
+        entries = [entry for entry in model_index.entries.view_all() if entry.valid]
+        used, capacity, links = await loop.run_in_executor(
+            get_io_executor(), self._measure, entries
+        )
+        reserved = self._reserved(exclude)
+        used += reserved
+        high = int(capacity * self.high_watermark)
+        low = int(capacity * self.low_watermark)
+
+        evict: List[EvictionCandidate] = []
+        freed = 0
+        if used + needed_bytes > high:
+            for candidate in self._candidates(exclude, entries, links):
+                if used - freed + needed_bytes <= low:
+                    break
+                # Files shared with models evicted earlier are freed with the last of them
+                candidate.size_bytes = links.evict(candidate.repo_id.replace("/", "_"))
+                evict.append(candidate)
+                freed += candidate.size_bytes
+
+        return EvictionPlan(
+            used_bytes=used,
+            reserved_bytes=reserved,
+            capacity_bytes=capacity,
+            high_watermark_bytes=high,
+            low_watermark_bytes=low,
+            needed_bytes=needed_bytes,
+            evict=evict,
+            freed_bytes=freed,
+            sufficient=used - freed + needed_bytes <= high,
+        )
+
+    async def make_room(self, needed_bytes: int, exclude: Optional[str] = None) -> EvictionPlan:
+        """
+        Evict models until ``needed_bytes`` fit, e.g. before a download.
+
+        Raises:
+            HTTPException: 507 if evicting every candidate wouldn't make room
+        """
+        async with self._lock:
+            return await self._make_room(needed_bytes, exclude)
+
+    @asynccontextmanager
+    async def reserve(
+        self, repo_id: str, total_bytes: int, written: Callable[[], int]
+    ) -> AsyncIterator[EvictionPlan]:
+        """
+        Make room for a download and hold the space while it runs.
+
+        Keep the context open until the model is indexed, so that its size
+        is counted throughout.
+
+        Args:
+            repo_id: The repository being downloaded, which is never evicted
+            total_bytes: Size of the download
+            written: Returns the bytes of it already on disk
+
+        Raises:
+            HTTPException: 507 if evicting every candidate wouldn't make room
+        """
+        async with self._lock:
+            plan = await self._make_room(self._outstanding(total_bytes, written), repo_id)
+            self._reservations[repo_id] = (total_bytes, written)
+        try:
+            yield plan
+        finally:
+            self._reservations.pop(repo_id, None)
+
+    async def _make_room(self, needed_bytes: int, exclude: Optional[str]) -> EvictionPlan:
+        """Evict the plan for ``needed_bytes``; the caller holds the lock."""
+        plan = await self.plan(needed_bytes, exclude)
+        if not plan.sufficient:
+            raise HTTPException(
+                status_code=507,
+                detail=(
+                    f"Not enough model storage: {needed_bytes} bytes needed, "
+                    f"{plan.used_bytes} of {plan.capacity_bytes} used"
+                ),
+            )
+        for candidate in plan.evict:
+            logger.info(
+                f"Evicting model {candidate.repo_id} ({candidate.size_bytes} bytes, "
+                f"last used {candidate.last_used}) to make room"
+            )
+            try:
+                await remove_model(candidate.repo_id)
+            except HTTPException as e:
+                logger.warning(f"evicting {candidate.repo_id}: {e.detail}")
+        return plan
+
+
+# Shared quota, configured from the application lifespan
+model_quota = ModelQuota()
+
+
+async def remove_model(repo_id: str) -> None:
+    """
+    Delete a model and what InferAdmin keeps about it.
+
+    The folder moves to the trash at once and its space is reclaimed in
+    the background.
+
+    Raises:
+        HTTPException: 404 if the model isn't on the volume
+    """
+    model_reaper.enqueue(await delete_model(repo_id))
+    await model_index.refresh(repo_id.replace("/", "_"))
+    await model_verifier.forget(repo_id)
+    await model_quota.forget(repo_id)
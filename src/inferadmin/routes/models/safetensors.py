@@ -0,0 +1,112 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional
+
+from inferadmin.common.logging import logger
+from .models import ModelWeights
+
+# Sharded checkpoints list which shard holds each tensor here
+SHARD_INDEX_FILE = "model.safetensors.index.json"
+
+# The format caps headers at 100 MB; anything larger is a corrupt file
+MAX_HEADER_SIZE = 100 * 1000 * 1000
+
+_HEADER_LENGTH = struct.Struct("<Q")
+
+
+def read_header(path: str) -> Dict[str, dict]:
+    """
+    Read the JSON header of a safetensors file.
+
+    Only the header is mapped: an 8-byte little-endian length followed by
+    that many bytes of JSON. Tensor data is never read, so this costs
+    milliseconds however large the shard.
+
+    Raises:
+        ValueError: if the file isn't a valid safetensors file
+        OSError: if it can't be read
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_HEADER_LENGTH.size)
+        if len(prefix) != _HEADER_LENGTH.size:
+            raise ValueError(f"{path}: too short for a safetensors header")
+        (length,) = _HEADER_LENGTH.unpack(prefix)
+        if length > MAX_HEADER_SIZE or length > os.fstat(f.fileno()).st_size - _HEADER_LENGTH.size:
+            raise ValueError(f"{path}: header length {length} out of range")
+        with mmap.mmap(f.fileno(), _HEADER_LENGTH.size + length, access=mmap.ACCESS_READ) as mapped:
+            header = json.loads(mapped[_HEADER_LENGTH.size :])
+    if not isinstance(header, dict):
+        raise ValueError(f"{path}: header is not a JSON object")
+    return header
+
+
+def weight_files(folder: str, names: Iterable[str]) -> List[str]:
+    """
+    The safetensors files holding a model's weights, relative to its folder.
+
+    Sharded checkpoints are read from their index, so stray shards from an
+    older revision don't count; otherwise every top-level safetensors file.
+    """
+    index_path = os.path.join(folder, SHARD_INDEX_FILE)
+    try:
+        with open(index_path) as f:
+            weight_map = json.load(f).get("weight_map", {})
+        return sorted(set(weight_map.values()))
+    except (FileNotFoundError, ValueError, AttributeError):
+        return sorted(name for name in names if "/" not in name and name.endswith(".safetensors"))
+
+
+def summarize_weights(folder: str, names: Iterable[str]) -> Optional[ModelWeights]:
+    """
+    Count a model's parameters from its safetensors headers.
+
+    Args:
+        folder: The model folder
+        names: Paths of the folder's files, relative to it
+
+    Returns:
+        Parameter count, per-dtype breakdown and weight bytes, or None if
+        the model has no readable safetensors weights
+
+    Raises:
+        ValueError: if a header is malformed
+        OSError: if a weight file can't be read
+    """
+    files = weight_files(folder, names)
+    if not files:
+        return None
+
+    parameters = 0
+    weight_bytes = 0
+    dtypes: Dict[str, int] = {}
+    for name in files:
+        header = read_header(os.path.join(folder, name))
+        for tensor_name, tensor in header.items():
+            if tensor_name == "__metadata__":
+                continue
+            count = 1
+            for dimension in tensor["shape"]:
+                count *= dimension
+            start, end = tensor["data_offsets"]
+            parameters += count
+            weight_bytes += end - start
+            dtypes[tensor["dtype"]] = dtypes.get(tensor["dtype"], 0) + count
+
+    return ModelWeights(
+        parameters=parameters,
+        dtypes=dtypes,
+        weight_bytes=weight_bytes,
+        weight_vram_gb=round(weight_bytes / (1024**3), 2),
+        shards=len(files),
+    )
+
+
+def read_weights(folder: str, names: Iterable[str]) -> Optional[ModelWeights]:
+    """``summarize_weights``, logging unreadable headers instead of raising."""
+    try:
+        return summarize_weights(folder, names)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"reading safetensors headers in {folder}: {e}")
+        return None
@@ -1,117 +1,136 @@
 import os
 from pathlib import Path
-from huggingface_hub import HfApi
-from huggingface_hub.utils import RepositoryNotFoundError
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+import threading
+from huggingface_hub import HfApi, hf_hub_url
+from huggingface_hub.utils import RepositoryNotFoundError, build_hf_headers, filter_repo_objects
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import time
-import shutil
+import uuid
 from fastapi import HTTPException
-from .models import Model
+from .models import Model, ModelDownloadJob, ModelFileProgress
+from .safetensors import read_weights
+from .transfer import DownloadCancelled, PARTIAL_DIR, chunk_ranges, fetch_range, partial_path
 from inferadmin.common.async_utils import to_async_io
 from inferadmin.config.loader import config_manager
 from inferadmin.common.logging import logger
 
 
-def check_hf_model_exists(model_path):
-    """
-    Check if a complete Hugging Face model exists at the given path.
+# Files a complete Hugging Face model folder holds at its top level
+REQUIRED_MODEL_FILES = {
+    "generation_config.json",
+    "config.json",
+    "tokenizer.json",
+    "special_tokens_map.json",
+    "tokenizer_config.json",
+}
+# Plus at least one weights file with this suffix
+WEIGHTS_SUFFIX = ".safetensors"
 
-    Returns:
-        bool: True if valid model, False otherwise
-    """
-    path = Path(model_path)
+# Folders on the volume starting with this hold InferAdmin's own data
+# (e.g. the blob store), never a model
+RESERVED_PREFIX = "."
 
-    # Check if the directory exists
-    if not path.exists() or not path.is_dir():
-        return False
-    # Check if the directory is empty
-    if not any(path.iterdir()):
-        return False
+# Deleted model folders wait here, on the same filesystem, to be reclaimed
+TRASH_DIR = ".trash"
 
-    # Required files to check
-    required_files = [
-        "*.safetensors",  # At least one safetensors file
-        "generation_config.json",
-        "config.json",
-        "tokenizer.json",
-        "special_tokens_map.json",
-        "tokenizer_config.json",
-    ]
-
-    # Check each required file
-    for file_pattern in required_files:
-        if "*" in file_pattern:
-            # Handle wildcard pattern (for safetensors)
-            if not list(path.glob(file_pattern)):
-                return False
-        else:
-            # Handle exact filename
-            if not (path / file_pattern).exists():
-                return False
 
-    return True
+class ModelFileInfo(NamedTuple):
+    """One file found in a model folder."""
 
+    path: str  # relative to the model folder
+    size: int  # 0 for symlinks, which don't count towards the folder size
+    mtime: float
 
-def get_folder_size_gb(folder_path):
-    """
-    Calculate the total size of all files in a folder and its subfolders in GB.
 
-    Args:
-        folder_path (str): Path to the folder
+class ModelFolderScan(NamedTuple):
+    """What one pass over a model folder found."""
 
-    Returns:
-        float: Size in gigabytes
-    """
-    path = Path(folder_path)
+    total_bytes: int
+    last_modified: float  # newest file mtime, as a timestamp
+    files: List[ModelFileInfo]
+    # mtime_ns of every directory, keyed by path relative to the folder
+    # ("" is the folder itself); any entry added, removed or renamed in a
+    # directory changes its mtime
+    directories: Dict[str, int]
 
-    if not path.exists() or not path.is_dir():
-        return 0.0
 
-    total_size = 0
+def _has_required_files(names: Set[str]) -> bool:
+    """Whether a folder's top-level names make up a complete model."""
+    return REQUIRED_MODEL_FILES <= names and any(
+        name.endswith(WEIGHTS_SUFFIX) for name in names
+    )
 
-    # Walk through all files in the directory and subdirectories
-    for dirpath, dirnames, filenames in os.walk(path):
-        for filename in filenames:
-            file_path = os.path.join(dirpath, filename)
-            # Skip if it's a symlink
-            if not os.path.islink(file_path):
-                total_size += os.path.getsize(file_path)
 
-    # Convert bytes to GB
-    size_gb = total_size / (1024**3)
+def check_hf_model_exists(model_path):
+    """
+    Check if a complete Hugging Face model exists at the given path.
 
-    return round(size_gb, 2)
+    Returns:
+        bool: True if valid model, False otherwise
+    """
+    try:
+        with os.scandir(model_path) as entries:
+            return _has_required_files({entry.name for entry in entries})
+    except (FileNotFoundError, NotADirectoryError):
+        return False
 
 
-def get_most_recent_modified_date(folder_path):
+def scan_model_folder(folder_path) -> Optional[ModelFolderScan]:
     """
-    Get the most recent modification date of any file in the directory.
+    Validate a model folder and measure it in a single pass.
 
-    Args:
-        folder_path (str): Path to the folder
+    The top-level listing decides validity, so invalid folders are never
+    walked. Valid ones are walked once with ``os.scandir``, taking size and
+    mtime from each entry's cached stat; symlinked files count towards the
+    mtime but not the size. Partial downloads are left out, so a folder
+    being downloaded into doesn't change with every chunk.
 
     Returns:
-        datetime
+        The folder's size, newest mtime and contents, or None if it isn't a complete model
     """
-    most_recent_time = 0
-
-    # Walk through all files in the directory and subdirectories
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        for filename in filenames:
-            file_path = os.path.join(dirpath, filename)
-            if os.path.isfile(file_path):
-                file_mtime = os.path.getmtime(file_path)
-                if file_mtime > most_recent_time:
-                    most_recent_time = file_mtime
-
-    # If no files were found, return current time
-    if most_recent_time == 0:
-        most_recent_time = time.time()
-
-    # Convert to datetime
-    modified_date = datetime.fromtimestamp(most_recent_time)
+    try:
+        folder_mtime_ns = os.stat(folder_path).st_mtime_ns
+        with os.scandir(folder_path) as scan:
+            top_level = list(scan)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not _has_required_files({entry.name for entry in top_level}):
+        return None
+
+    total_bytes = 0
+    last_modified = 0.0
+    files: List[ModelFileInfo] = []
+    directories = {"": folder_mtime_ns}
+    pending = [("", top_level)]
+    while pending:
+        prefix, entries = pending.pop()
+        for entry in entries:
+            relative = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if relative == PARTIAL_DIR:
+                        continue
+                    directories[relative] = entry.stat(follow_symlinks=False).st_mtime_ns
+                    with os.scandir(entry.path) as children:
+                        pending.append((relative + "/", list(children)))
+                elif entry.is_symlink():
+                    if entry.is_file():
+                        mtime = entry.stat().st_mtime
+                        files.append(ModelFileInfo(relative, 0, mtime))
+                        last_modified = max(last_modified, mtime)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append(ModelFileInfo(relative, stat.st_size, stat.st_mtime))
+                    total_bytes += stat.st_size
+                    last_modified = max(last_modified, stat.st_mtime)
+            except FileNotFoundError:
+                # Removed while we were walking
+                continue
+
+    return ModelFolderScan(total_bytes, last_modified or time.time(), files, directories)
 
-    return modified_date
 
 @to_async_io  # Using IO-optimized thread pool for file system operations
 def scan_hf_models_directory():
@@ -119,7 +138,7 @@ def scan_hf_models_directory():
     Scan a directory for Hugging Face models and collect info about each valid model.
 
     Returns:
-        list: List of dictionaries with model info (repo_id, path, size_gb, last_updated)
+        list: List of Model records (repo_id, path, size_gb, last_updated, weights)
     """
     volume_path = Path(config_manager.get_config().model_storage_path)
 
@@ -128,48 +147,48 @@ def scan_hf_models_directory():
 
     model_info_list = []
 
-    # Get all subdirectories in the base path
-    subdirs = [d for d in volume_path.iterdir() if d.is_dir()]
-
-    for folder in subdirs:
-        # Get folder name
-        folder_name = folder.name
-        folder_path = str(folder)
-
-        # Check if it's a valid HF model
-        is_valid_model = check_hf_model_exists(folder_path)
-
-        # Get folder size
-        size_gb = get_folder_size_gb(folder_path)
-
-        # Get the most recent modification date of any file in the directory
-        last_updated = get_most_recent_modified_date(folder_path)
-
-        # create Model object
-        model_info = Model(
-            repo_id=folder_name.replace("_", "/"),
-            path=folder_path,
-            size_gb=size_gb,
-            last_updated=last_updated,
+    with os.scandir(volume_path) as entries:
+        folders = [
+            entry for entry in entries
+            if entry.is_dir() and not entry.name.startswith(RESERVED_PREFIX)
+        ]
+
+    for folder in folders:
+        scan = scan_model_folder(folder.path)
+        if scan is None:
+            continue
+
+        model_info_list.append(
+            Model(
+                repo_id=folder.name.replace("_", "/"),
+                path=folder.path,
+                size_gb=round(scan.total_bytes / (1024**3), 2),
+                last_updated=datetime.fromtimestamp(scan.last_modified),
+                weights=read_weights(folder.path, [f.path for f in scan.files]),
+            )
         )
 
-        if is_valid_model:
-            model_info_list.append(model_info)
-
     return model_info_list
 
 
 @to_async_io  # Using IO-optimized thread pool for file system operations
-def delete_model(repo_id: str):
+def delete_model(repo_id: str) -> str:
     """
-    Delete a model from the storage path and all its contents.
+    Delete a model by moving its folder into the volume's trash.
+
+    The rename is atomic and instant however large the model; the space is
+    reclaimed afterwards by the trash reaper.
 
     Args:
         model_name (str): hf_model name
+
+    Returns:
+        The folder's path in the trash
     """
     folder_name = repo_id.replace("/", "_")
     logger.info(f"Deleting model folder: {folder_name}")
-    folder_path = f"{config_manager.get_config().model_storage_path}/{folder_name}"
+    volume_path = config_manager.get_config().model_storage_path
+    folder_path = f"{volume_path}/{folder_name}"
     logger.info(f"Folder path: {folder_path}")
 
     path = Path(folder_path)
@@ -185,36 +204,165 @@ def delete_model(repo_id: str):
             status_code=404, detail=f"Path is not a directory: {folder_path}"
         )
 
+    trash_path = os.path.join(volume_path, TRASH_DIR, f"{folder_name}-{uuid.uuid4().hex[:8]}")
     try:
-        # Remove the directory and all its contents
-        shutil.rmtree(folder_path)
+        os.makedirs(os.path.dirname(trash_path), exist_ok=True)
+        os.rename(folder_path, trash_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting model: {str(e)}")
+    return trash_path
 
 
-@to_async_io  # Using IO-optimized thread pool for network and file operations
-def download_hf_model(repo_id: str):
+def model_folder(repo_id: str) -> str:
+    """Path of the folder a repository is stored in."""
+    return f"{config_manager.get_config().model_storage_path}/{repo_id.replace('/', '_')}"
+
+
+def plan_hf_download(
+    repo_id: str,
+    allow_patterns: Optional[List[str]] = None,
+    ignore_patterns: Optional[List[str]] = None,
+) -> Tuple[Optional[str], List[ModelFileProgress]]:
     """
-    Downloads the given model to the local directory from huggingface.
+    Resolve a repository's current commit and the files to fetch.
+
+    Files that complete a model folder are ordered last, so a folder is
+    only recognised as a model once everything else has arrived.
 
     Args:
-        repo_id (str): the HF repo name of thing to download
+        repo_id: The HF repo name
+        allow_patterns: Only fetch files matching one of these globs
+        ignore_patterns: Skip files matching any of these globs
+
+    Returns:
+        The commit hash, if the Hub reports one, and one progress record per file
     """
     hf = HfApi(token=config_manager.get_config().hf_token)
-
-    volume_path = config_manager.get_config().model_storage_path
-    file_name = repo_id.replace("/", "_")
-    target_path = f"{volume_path}/{file_name}"
-
     try:
-        hf.snapshot_download(repo_id=repo_id, repo_type="model", local_dir=target_path)
-
+        info = hf.model_info(repo_id, files_metadata=True)
     except RepositoryNotFoundError as _:
         raise HTTPException(
             status_code=404, detail=f"HuggingFace Repository not found: {repo_id}"
         )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error downloading model: {str(e)}"
+    siblings = filter_repo_objects(
+        info.siblings or [],
+        allow_patterns=allow_patterns,
+        ignore_patterns=ignore_patterns,
+        key=lambda sibling: sibling.rfilename,
+    )
+    files = [
+        ModelFileProgress(
+            path=sibling.rfilename,
+            size=sibling.size,
+            sha256=sibling.lfs.sha256 if sibling.lfs else None,
+            blob_id=sibling.blob_id,
+        )
+        for sibling in siblings
+    ]
+    files.sort(key=lambda f: f.path in REQUIRED_MODEL_FILES)
+    return info.sha, files
+
+
+def _finish_file(folder: str, file: ModelFileProgress) -> None:
+    """Move a file whose chunks are all on disk into place."""
+    part = partial_path(folder, file.path)
+    if not os.path.exists(part):
+        # Zero-length files never open their part file
+        open(part, "wb").close()
+    if file.size is not None:
+        # A part file reused from an older plan may run past the end
+        os.truncate(part, file.size)
+    target = os.path.join(folder, file.path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(part, target)
+    file.done = True
+
+
+def download_hf_model(job: ModelDownloadJob, stop: threading.Event):
+    """
+    Downloads the files of a job to the local directory from huggingface.
+
+    Runs on a download thread. Files are split into ``job.chunk_size``
+    ranges fetched by ``job.workers`` threads in parallel, under the shared
+    bandwidth limit. Progress is recorded on ``job`` as bytes arrive; the
+    durable bytes of each chunk are what a resume continues from. Files
+    that complete the folder are fetched after everything else.
+
+    Args:
+        job: The download job, planned with ``plan_hf_download``
+        stop: Set to stop every worker between reads
+
+    Raises:
+        DownloadCancelled: if ``stop`` was set
+    """
+    target_path = model_folder(job.repo_id)
+    headers = build_hf_headers(token=config_manager.get_config().hf_token)
+    lock = threading.Lock()
+
+    def fetch_chunk(file: ModelFileProgress, index: int, start: int, end: Optional[int]) -> None:
+        def on_bytes(size: int) -> None:
+            with lock:
+                file.downloaded += size
+                job.downloaded_bytes += size
+                job.transferred_bytes += size
+
+        def on_durable(done: int) -> None:
+            file.chunks[index] = done
+
+        fetch_range(
+            hf_hub_url(job.repo_id, file.path, revision=job.revision),
+            headers,
+            partial_path(target_path, file.path),
+            start,
+            end,
+            file.chunks[index],
+            on_bytes,
+            on_durable,
+            stop,
         )
+
+    pending = [file for file in job.files if not file.done]
+    for file in pending:
+        ranges = chunk_ranges(file.size, job.chunk_size)
+        if len(file.chunks) != len(ranges):
+            file.chunks = [0] * len(ranges)
+        # Bytes that weren't durable are fetched again
+        file.downloaded = sum(file.chunks)
+    job.downloaded_bytes = sum(file.downloaded for file in job.files)
+    os.makedirs(os.path.join(target_path, PARTIAL_DIR), exist_ok=True)
+
+    phases = [
+        [file for file in pending if file.path not in REQUIRED_MODEL_FILES],
+        [file for file in pending if file.path in REQUIRED_MODEL_FILES],
+    ]
+    with ThreadPoolExecutor(
+        max_workers=job.workers, thread_name_prefix="inferadmin-download-worker-"
+    ) as workers:
+        for phase in phases:
+            futures = []
+            for file in phase:
+                target = os.path.join(target_path, file.path)
+                if file.size is not None and os.path.isfile(target) and os.path.getsize(target) == file.size:
+                    # Already in place from an earlier download
+                    file.done = True
+                    continue
+                os.makedirs(os.path.dirname(partial_path(target_path, file.path)), exist_ok=True)
+                for index, (start, end) in enumerate(chunk_ranges(file.size, job.chunk_size)):
+                    futures.append(workers.submit(fetch_chunk, file, index, start, end))
+
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except DownloadCancelled:
+                raise
+            except Exception as e:
+                # Stop the other workers; the job is failing anyway
+                stop.set()
+                raise HTTPException(
+                    status_code=500, detail=f"Error downloading model: {str(e)}"
+                )
+
+            for file in phase:
+                if not file.done:
+                    _finish_file(target_path, file)
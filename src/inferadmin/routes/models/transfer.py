@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Bytes read per request read; also how often cancellation is checked
+READ_SIZE = 1024 * 1024
+
+# Written bytes are fsync'd at least this often before being reported as
+# durable, so a resume never trusts data that only reached the page cache
+DURABLE_EVERY = 64 * 1024 * 1024
+
+# Partial downloads live here, relative to the model folder, until complete
+PARTIAL_DIR = os.path.join(".cache", "inferadmin")
+
+
+class DownloadCancelled(Exception):
+    """Raised when a transfer is stopped through its stop event."""
+
+
+class BandwidthLimiter:
+    """
+    Token-bucket style limit on the combined rate of every transfer.
+
+    Each read reserves the time its bytes take at ``rate`` and waits until
+    its reservation starts, so concurrent workers share the budget evenly.
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float = 0.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Bytes per second allowed across all transfers, 0 for unlimited
+        """
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def delay(self, size: int) -> float:
+        """Reserve ``size`` bytes and return the seconds to wait before using them."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + size / self.rate
+        return start - now
+
+
+# Shared by every download, configured from the application lifespan
+bandwidth_limiter = BandwidthLimiter()
+
+
+class _StripAuthOnRedirect(urllib.request.HTTPRedirectHandler):
+    """Follow redirects, but never send credentials to a different host (e.g. the CDN)."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        new = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if new is not None and urlparse(newurl).netloc != urlparse(req.full_url).netloc:
+            new.remove_header("Authorization")
+        return new
+
+
+_opener = urllib.request.build_opener(_StripAuthOnRedirect)
+
+
+def partial_path(folder: str, filename: str) -> str:
+    """Where the incomplete copy of a file is kept."""
+    return os.path.join(folder, PARTIAL_DIR, filename + ".part")
+
+
+def chunk_ranges(size: Optional[int], chunk_size: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split a file into ``[start, end)`` byte ranges of ``chunk_size``.
+
+    A file of unknown size is a single open-ended range.
+    """
+    if size is None:
+        return [(0, None)]
+    if size == 0:
+        return [(0, 0)]
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+def fetch_range(
+    url: str,
+    headers: dict,
+    part: str,
+    start: int,
+    end: Optional[int],
+    done: int,
+    on_bytes: Callable[[int], None],
+    on_durable: Callable[[int], None],
+    stop: threading.Event,
+    limiter: BandwidthLimiter = bandwidth_limiter,
+    timeout: float = 60.0,
+) -> None:
+    """
+    Download bytes ``[start + done, end)`` of a file into its part file.
+
+    Bytes are written in place with ``pwrite``, so any number of ranges of
+    one file can be fetched concurrently into the same sparse part file.
+
+    Args:
+        url: Where to fetch the file from
+        headers: Request headers, e.g. authorization
+        part: The part file
+        start: First byte of the range
+        end: End of the range (exclusive), None to read to the end of the file
+        done: Bytes of the range already durably on disk, skipped
+        on_bytes: Called with the size of each block written
+        on_durable: Called with the range's bytes known to be on disk
+        stop: Set to stop between reads
+
+    Raises:
+        DownloadCancelled: if ``stop`` was set
+        urllib.error.URLError: on network or HTTP errors
+    """
+    position = start + done
+    if end is not None and position >= end:
+        return
+
+    request = urllib.request.Request(url, headers=dict(headers))
+    if position or end is not None:
+        last = "" if end is None else str(end - 1)
+        request.add_header("Range", f"bytes={position}-{last}")
+
+    fd = os.open(part, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        with _opener.open(request, timeout=timeout) as response:
+            if response.status != 206 and position:
+                raise urllib.error.URLError(f"server ignored the range request for {url}")
+
+            unsynced = 0
+            while end is None or position < end:
+                if stop.is_set():
+                    raise DownloadCancelled(part)
+                block = response.read(READ_SIZE if end is None else min(READ_SIZE, end - position))
+                if not block:
+                    break
+                os.pwrite(fd, block, position)
+                position += len(block)
+                unsynced += len(block)
+                on_bytes(len(block))
+                if unsynced >= DURABLE_EVERY:
+                    os.fsync(fd)
+                    on_durable(position - start)
+                    unsynced = 0
+                wait = limiter.delay(len(block))
+                if wait > 0 and stop.wait(wait):
+                    raise DownloadCancelled(part)
+    finally:
+        # Whatever was written is valid; make it count for the next resume
+        os.fsync(fd)
+        os.close(fd)
+        on_durable(position - start)
+
+    if end is not None and position != end:
+        raise urllib.error.URLError(f"{url}: range ended at byte {position} of {end}")
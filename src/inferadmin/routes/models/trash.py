@@ -0,0 +1,225 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISDIR, S_ISREG
+from typing import Callable, Dict, List, Optional
+
+from inferadmin.common.async_utils import get_io_executor
+from inferadmin.common.logging import logger
+from .blobs import blob_store
+from .models import ModelTrashStatus
+from .support import TRASH_DIR
+from .transfer import BandwidthLimiter
+
+# Large files are shrunk in steps of this many bytes before the unlink, so
+# the filesystem frees their extents a little at a time
+TRUNCATE_STEP = 1024 * 1024 * 1024
+
+
+def measure_folder(path: str) -> int:
+    """Bytes reclaiming a folder frees; files still linked elsewhere free nothing."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.lstat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            if S_ISREG(stat.st_mode) and stat.st_nlink == 1:
+                total += stat.st_size
+    return total
+
+
+def reclaim_folder(
+    path: str,
+    limiter: BandwidthLimiter,
+    stop: threading.Event,
+    on_bytes: Callable[[int], None],
+) -> bool:
+    """
+    Remove a folder while pacing the space freed to ``limiter``.
+
+    Files only this folder links to are truncated in steps before being
+    unlinked; files shared with the blob store are just unlinked, since
+    truncating them would destroy every other copy.
+
+    Returns:
+        True once the folder is gone, False if ``stop`` interrupted it
+    """
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                stat = os.lstat(file_path)
+                freed = stat.st_size if S_ISREG(stat.st_mode) and stat.st_nlink == 1 else 0
+                size = freed
+                while size > TRUNCATE_STEP:
+                    size -= TRUNCATE_STEP
+                    if stop.wait(limiter.delay(TRUNCATE_STEP)):
+                        return False
+                    os.truncate(file_path, size)
+                    on_bytes(TRUNCATE_STEP)
+                if stop.wait(limiter.delay(size)):
+                    return False
+                os.unlink(file_path)
+                on_bytes(size)
+            except FileNotFoundError:
+                continue
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            try:
+                if S_ISDIR(os.lstat(dir_path).st_mode):
+                    os.rmdir(dir_path)
+                else:
+                    # os.walk lists symlinks to directories among dirs
+                    os.unlink(dir_path)
+            except FileNotFoundError:
+                continue
+    os.rmdir(path)
+    return True
+
+
+class ModelReaper:
+    """
+    Reclaims the space of deleted models in the background.
+
+    Deleting a model only renames its folder into the volume's trash, so
+    requests return at once however large it is. The reaper then removes
+    trashed folders one at a time on its own thread, pacing the bytes
+    freed to ``rate`` so the unlinks don't starve inference engines reading
+    the same volume. Each folder is measured as it is queued, so the
+    pending bytes cover the whole queue. Blobs the folder was the last to
+    reference are collected afterwards. Trash left by a crash or shutdown
+    is picked up again on start.
+    """
+
+    def __init__(self, volume_path: str = "", rate: float = 0.0):
+        """
+        Initialize the reaper.
+
+        Args:
+            volume_path: The model storage path
+            rate: Bytes per second to free, 0 for unlimited
+        """
+        self.volume_path = volume_path
+        self.limiter = BandwidthLimiter(rate)
+        self.status = ModelTrashStatus()
+
+        self._queue: List[str] = []
+        # Queued folder -> measurement of the bytes reclaiming it frees
+        self._measures: Dict[str, asyncio.Future] = {}
+        # Guards the status counters, which the reclaiming thread updates
+        self._status_lock = threading.Lock()
+        # Bytes freed so far from the folder being reclaimed
+        self._current_reclaimed = 0
+        self._wake = asyncio.Event()
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def rate(self) -> float:
+        return self.limiter.rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        self.limiter.rate = rate
+
+    async def start(self) -> None:
+        """Resume reclaiming whatever is in the trash."""
+        self._stop.clear()
+        # Reclaiming a large folder takes minutes, so it gets its own thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inferadmin-reaper-")
+        trash = os.path.join(self.volume_path, TRASH_DIR)
+        try:
+            with os.scandir(trash) as entries:
+                leftovers = [entry.path for entry in entries]
+        except FileNotFoundError:
+            leftovers = []
+        if leftovers:
+            logger.info(f"Resuming reclamation of {len(leftovers)} deleted model folders")
+        for path in leftovers:
+            self.enqueue(path)
+        self._task = asyncio.create_task(self._reap_loop())
+
+    async def stop(self) -> None:
+        """Stop between files; the rest stays in the trash for the next start."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for measure in self._measures.values():
+            measure.cancel()
+        self._measures.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def enqueue(self, path: str) -> None:
+        """Queue a trashed folder for reclamation."""
+        if path in self._queue:
+            return
+        self._queue.append(path)
+        self.status.folders = len(self._queue)
+        self._measures[path] = asyncio.ensure_future(self._measure(path))
+        self._wake.set()
+
+    async def _measure(self, path: str) -> int:
+        """Add a queued folder's size to the pending bytes, returning it."""
+        loop = asyncio.get_running_loop()
+        size = await loop.run_in_executor(get_io_executor(), measure_folder, path)
+        with self._status_lock:
+            self.status.pending_bytes += size
+        return size
+
+    def _add_reclaimed(self, size: int) -> None:
+        with self._status_lock:
+            self.status.reclaimed_bytes += size
+            self._current_reclaimed += size
+            self.status.pending_bytes = max(self.status.pending_bytes - size, 0)
+
+    async def _reap_loop(self) -> None:
+        """Reclaim queued folders in order, waiting when the trash is empty."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._queue:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            path = self._queue[0]
+            self.status.current = os.path.basename(path)
+            measured = 0
+            self._current_reclaimed = 0
+            try:
+                measured = await self._measures[path]
+                done = await loop.run_in_executor(
+                    self._executor,
+                    reclaim_folder,
+                    path,
+                    self.limiter,
+                    self._stop,
+                    self._add_reclaimed,
+                )
+                if not done:
+                    return
+                await blob_store.collect()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"reclaiming deleted model folder {path}: {e}")
+                # Left in the trash; retried on the next start
+            self._queue.pop(0)
+            del self._measures[path]
+            with self._status_lock:
+                # Whatever the measurement counted that wasn't reclaimed is no longer pending
+                unreclaimed = max(measured - self._current_reclaimed, 0)
+                self.status.pending_bytes = max(self.status.pending_bytes - unreclaimed, 0)
+            self.status.folders = len(self._queue)
+            self.status.current = None
+
+
+# Shared reaper, configured and started from the application lifespan
+model_reaper = ModelReaper()
@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from inferadmin.common.async_utils import get_cpu_executor, get_io_executor
+from inferadmin.common.logging import logger
+from inferadmin.state.manager import StateManager
+from inferadmin.state import STATE_DIR
+from .models import (
+    ExpectedModelFile,
+    FileVerification,
+    ModelFileProgress,
+    ModelIntegrity,
+    ModelVerification,
+)
+from .support import REQUIRED_MODEL_FILES, WEIGHTS_SUFFIX, model_folder, plan_hf_download
+
+# Bytes hashed per read; hashlib releases the GIL for each update, so
+# several files hash in parallel on the CPU pool
+HASH_BLOCK = 1024 * 1024
+
+
+def expected_files(files: List[ModelFileProgress]) -> Dict[str, ExpectedModelFile]:
+    """What a download plan records for each file."""
+    return {
+        file.path: ExpectedModelFile(size=file.size, sha256=file.sha256, blob_id=file.blob_id)
+        for file in files
+    }
+
+
+def hash_file(path: str, size: int, sha256: bool) -> str:
+    """
+    Hash a file the way the Hub identifies it.
+
+    Args:
+        path: The file
+        size: Its size, which git prefixes to a blob's content
+        sha256: SHA256 of the content (LFS files), otherwise the git blob SHA1
+
+    Returns:
+        The hex digest
+    """
+    if sha256:
+        digest = hashlib.sha256()
+    else:
+        digest = hashlib.sha1(f"blob {size}\0".encode())
+    buffer = bytearray(HASH_BLOCK)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def check_file(
+    folder: str, path: str, expected: ExpectedModelFile, cached: Optional[FileVerification]
+) -> Tuple[Optional[FileVerification], Optional[str], int]:
+    """
+    Check one file against what the repository records.
+
+    Sizes are compared first, so truncated files fail without being read.
+    A file whose size and mtime match the cached result isn't hashed again.
+
+    Returns:
+        The result to cache (None if the file is missing), a problem
+        description or None, and the bytes hashed
+    """
+    try:
+        stat = os.stat(os.path.join(folder, path))
+    except FileNotFoundError:
+        return None, f"{path}: missing", 0
+    if expected.size is not None and stat.st_size != expected.size:
+        return None, f"{path}: {stat.st_size} bytes, expected {expected.size}", 0
+
+    result = cached
+    if result is None or result.size != stat.st_size or result.mtime_ns != stat.st_mtime_ns:
+        result = FileVerification(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    else:
+        result = result.model_copy()
+
+    hashed = 0
+    if expected.sha256:
+        if result.sha256 is None:
+            result.sha256 = hash_file(os.path.join(folder, path), stat.st_size, sha256=True)
+            hashed = stat.st_size
+        if result.sha256 != expected.sha256:
+            return result, f"{path}: SHA256 {result.sha256} does not match {expected.sha256}", hashed
+    elif expected.blob_id:
+        if result.blob_id is None:
+            result.blob_id = hash_file(os.path.join(folder, path), stat.st_size, sha256=False)
+            hashed = stat.st_size
+        if result.blob_id != expected.blob_id:
+            return result, f"{path}: blob {result.blob_id} does not match {expected.blob_id}", hashed
+    return result, None, hashed
+
+
+def hub_manifest(repo_id: str) -> Tuple[Optional[str], Dict[str, ExpectedModelFile]]:
+    """
+    What the Hub records for a model that wasn't downloaded by a job.
+
+    Only files that are present, plus those any model needs, are expected,
+    since the folder may have been fetched with patterns.
+    """
+    folder = model_folder(repo_id)
+    revision, files = plan_hf_download(repo_id)
+    expected = {
+        path: file
+        for path, file in expected_files(files).items()
+        if path in REQUIRED_MODEL_FILES
+        or path.endswith(WEIGHTS_SUFFIX)
+        or os.path.exists(os.path.join(folder, path))
+    }
+    return revision, expected
+
+
+class ModelVerifier:
+    """
+    Integrity checks of model folders against the repository's records.
+
+    Every file's size is compared with the recorded one, and its content
+    hashed and compared with the LFS SHA256 etag, or the git blob ID for
+    small files. Files are hashed in parallel on the CPU pool. Results are
+    persisted per file, keyed by size and mtime, so a file that hasn't
+    changed since it was last hashed is never read again. Checks of the
+    same folder share one run. The summary shown with each listed model is
+    kept in memory apart from the per-file records, so listing doesn't
+    read them.
+    """
+
+    def __init__(self):
+        """Initialize the result store."""
+        self.records = StateManager(STATE_DIR, "model_verification.json", ModelVerification)
+        self._running: Dict[str, asyncio.Task] = {}
+        # Folder name -> summary of its record, built on first use
+        self._summaries: Optional[Dict[str, ModelIntegrity]] = None
+
+    @staticmethod
+    def _summarize(record: ModelVerification) -> ModelIntegrity:
+        return ModelIntegrity(
+            state=record.state, checked=record.checked, problems=list(record.problems)
+        )
+
+    def _integrity(self) -> Dict[str, ModelIntegrity]:
+        """The summary of every record, built from the store once."""
+        if self._summaries is None:
+            self._summaries = {
+                record.id: self._summarize(record) for record in self.records.view_all()
+            }
+        return self._summaries
+
+    def integrity(self, name: str) -> Optional[ModelIntegrity]:
+        """The summary shown on a model folder's record, if it was ever checked."""
+        summary = self._integrity().get(name)
+        if summary is None:
+            return None
+        if name in self._running:
+            return summary.model_copy(update={"state": "verifying"})
+        return summary.model_copy()
+
+    async def verify(
+        self,
+        repo_id: str,
+        expected: Optional[Dict[str, ExpectedModelFile]] = None,
+        revision: Optional[str] = None,
+    ) -> ModelVerification:
+        """
+        Check a model folder, or wait for the check already running.
+
+        Args:
+            repo_id: The HF repo name
+            expected: The files to check against, e.g. from a download plan;
+                defaults to what was recorded before, or else to the Hub's
+                current records
+            revision: The commit ``expected`` describes
+
+        Raises:
+            HTTPException: 404 if the folder or repository doesn't exist
+        """
+        name = repo_id.replace("/", "_")
+        task = self._running.get(name)
+        if task is None:
+            task = asyncio.create_task(self._verify(repo_id, name, expected, revision))
+            self._running[name] = task
+            task.add_done_callback(lambda _: self._running.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def forget(self, repo_id: str) -> None:
+        """Drop the results of a deleted model."""
+        name = repo_id.replace("/", "_")
+        await self.records.delete(name)
+        self._integrity().pop(name, None)
+
+    async def _verify(
+        self,
+        repo_id: str,
+        name: str,
+        expected: Optional[Dict[str, ExpectedModelFile]],
+        revision: Optional[str],
+    ) -> ModelVerification:
+        folder = model_folder(repo_id)
+        if not os.path.isdir(folder):
+            raise HTTPException(status_code=404, detail=f"Model not found: {repo_id}")
+
+        loop = asyncio.get_running_loop()
+        record = self.records.get_by_id(name)
+        if expected is None:
+            if record is not None and record.expected:
+                expected = record.expected
+                revision = record.revision
+            else:
+                revision, manifest = await loop.run_in_executor(
+                    get_io_executor(), hub_manifest, repo_id
+                )
+                expected = manifest
+        if record is None:
+            record = ModelVerification(id=name, repo_id=repo_id)
+        record.expected = expected
+        record.revision = revision
+
+        # Largest files first, so the longest hashes start right away
+        paths = sorted(expected, key=lambda p: expected[p].size or 0, reverse=True)
+        checks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    get_cpu_executor(),
+                    check_file,
+                    folder,
+                    path,
+                    expected[path],
+                    record.results.get(path),
+                )
+                for path in paths
+            )
+        )
+
+        record.results = {}
+        record.problems = []
+        record.failed_files = []
+        record.hashed_bytes = 0
+        for path, (result, problem, hashed) in zip(paths, checks):
+            if result is not None:
+                record.results[path] = result
+            if problem is not None:
+                record.problems.append(problem)
+                record.failed_files.append(path)
+            record.hashed_bytes += hashed
+        record.state = "failed" if record.problems else "verified"
+        record.checked = datetime.now()
+        await self.records.update(record)
+        self._integrity()[name] = self._summarize(record)
+
+        if record.problems:
+            logger.warning(f"model {repo_id} failed verification: {'; '.join(record.problems)}")
+        return record
+
+
+# Shared verifier; results persist through the state store
+model_verifier = ModelVerifier()
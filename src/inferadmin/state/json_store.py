@@ -0,0 +1,161 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+from loguru import logger
+
+from .stores import StateOp, fsync_dir
+
+# Compact the journal into a fresh snapshot once it grows past this size
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+
+class JsonStateStore:
+    """
+    Persists records as a JSON array snapshot plus an append-only journal.
+
+    In journaled mode (the default) each commit is appended as JSON lines to
+    ``<filename>.journal``. Once the journal passes ``compact_threshold``
+    bytes it is folded into a new snapshot written via rename. Loading
+    replays the snapshot plus journal, dropping a torn trailing record if the
+    process died mid-append.
+    """
+
+    def __init__(
+        self,
+        state_dir: Path,
+        filename: str,
+        journaled: bool = True,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+    ):
+        """
+        Initialize a JSON state store.
+
+        Args:
+            state_dir: Directory to store state files
+            filename: Name of the snapshot file
+            journaled: Append mutations to a journal instead of rewriting the file
+            compact_threshold: Journal size in bytes that triggers compaction
+        """
+        self.state_dir = state_dir
+        self.state_file = state_dir / filename
+        self.journal_file = state_dir / f"{filename}.journal"
+        self.journaled = journaled
+        self.compact_threshold = compact_threshold
+        self._journal_size = 0
+
+    def exists(self) -> bool:
+        """Whether any state has been written by this store."""
+        return self.state_file.exists() or self.journal_file.exists()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the snapshot and replay the journal, returning records by id."""
+        records = self._load_snapshot()
+        self._replay_journal(records)
+        return records
+
+    def _load_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Read the snapshot file."""
+        try:
+            with open(self.state_file, "r") as f:
+                data = json.load(f)
+            return {record["id"]: record for record in data}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"reading state file: {e}")
+            # Keep the unreadable file around rather than overwriting it later
+            backup = self.state_file.with_name(
+                f"{self.state_file.name}.corrupt-{int(datetime.now().timestamp())}"
+            )
+            os.replace(self.state_file, backup)
+            logger.error(f"moved unreadable state file to {backup}")
+            return {}
+
+    def _replay_journal(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Apply journal records on top of the snapshot."""
+        if not self.journal_file.exists():
+            return
+
+        good_offset = 0
+        with open(self.journal_file, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                    if record["op"] == "put":
+                        records[record["item"]["id"]] = record["item"]
+                    elif record["op"] == "delete":
+                        records.pop(record["id"], None)
+                except Exception as e:
+                    # Only the tail can be torn; anything after it is unusable
+                    logger.warning(
+                        f"discarding journal tail of {self.journal_file} at byte {good_offset}: {e}"
+                    )
+                    break
+                good_offset += len(line)
+
+        if good_offset != self.journal_file.stat().st_size:
+            os.truncate(self.journal_file, good_offset)
+        self._journal_size = good_offset
+
+    def _write_snapshot(self, encoded: Dict[str, str]) -> None:
+        """Atomically replace the snapshot with the given encoded items."""
+        tmp_file = self.state_file.with_name(f"{self.state_file.name}.tmp")
+        with open(tmp_file, "w") as f:
+            f.write("[" + ", ".join(encoded.values()) + "]")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+        fsync_dir(self.state_dir)
+
+    def compact(self, encoded: Dict[str, str]) -> None:
+        """Fold the journal into a new snapshot and truncate it."""
+        self._write_snapshot(encoded)
+        # The snapshot already contains every journaled mutation
+        if self.journal_file.exists():
+            os.truncate(self.journal_file, 0)
+        self._journal_size = 0
+
+    def commit(self, ops: List[StateOp]) -> None:
+        """
+        Durably append a batch of mutations to the journal.
+
+        Without journaling the caller is expected to compact() instead, see
+        needs_compaction().
+
+        Args:
+            ops: Mutations to persist, in order
+        """
+        if not self.journaled:
+            return
+
+        lines = []
+        for op, id, data in ops:
+            if op == "put":
+                lines.append(f'{{"op": "put", "item": {data}}}\n')
+            else:
+                lines.append(json.dumps({"op": "delete", "id": id}) + "\n")
+
+        # One write and one fsync for the whole batch
+        with open(self.journal_file, "a") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_size = f.tell()
+
+    def needs_compaction(self) -> bool:
+        """Whether the journal has grown past the threshold, or is disabled."""
+        return not self.journaled or self._journal_size >= self.compact_threshold
+
+    def retire(self) -> None:
+        """Move the files aside after their contents were migrated elsewhere."""
+        for path in (self.state_file, self.journal_file):
+            if path.exists():
+                os.replace(path, path.with_name(f"{path.name}.migrated"))
+        fsync_dir(self.state_dir)
+
+    def close(self) -> None:
+        """Nothing to release; files are opened per commit."""
@@ -1,110 +1,314 @@
+import asyncio
 import json
 import os
 from pathlib import Path
-from typing import Any, List, Optional, TypeVar, Generic, Type
+from typing import Any, Dict, List, Optional, TypeVar, Generic, Type
 from datetime import datetime
 from pydantic import BaseModel
-from contextlib import asynccontextmanager
 from loguru import logger
 
+from inferadmin.common.async_utils import get_io_executor
+from .json_store import JsonStateStore, DEFAULT_COMPACT_THRESHOLD
+from .sqlite_store import SqliteStateStore
+from .stores import StateOp, StateStore, state_backends
+
 T = TypeVar("T", bound=BaseModel)
 
+# How long a commit waits for further writes to coalesce with, in seconds
+DEFAULT_COMMIT_WINDOW = 0.005
+
+# Longest wait between attempts to persist after a failed write, in seconds
+MAX_RETRY_DELAY = 5.0
+
 
 class StateManager(Generic[T]):
-    """Manages state for deployments using JSON files."""
+    """
+    Manages state for deployments.
+
+    Items are loaded and validated once, then kept in memory in a dict
+    indexed by ``id``. Reads are served from memory as copies, or as the
+    stored items themselves for internal read-only callers that can't
+    afford a copy per read. Mutations update the index and write through
+    to a durable store: a journaled JSON file or a SQLite table, chosen
+    with ``StateManager.configure`` before first use.
+
+    Mutations are async. They apply to the index immediately and then wait
+    for a group commit: writes arriving within ``commit_window`` seconds are
+    persisted together by a single writer, in one fsync'd batch on the IO
+    thread pool, so the event loop never blocks on disk. If a write fails the
+    mutations stay applied in memory and their callers keep waiting while
+    the whole state is rewritten with backoff, so memory and disk converge
+    again once the disk recovers.
+    """
+
+    # Storage backend used by managers that haven't loaded yet
+    backend: state_backends = "json"
+    # Every manager created, so they can be closed together on shutdown
+    _instances: List["StateManager"] = []
 
-    def __init__(self, state_dir: str, filename: str, model_cls: Type[T]):
+    def __init__(
+        self,
+        state_dir: str,
+        filename: str,
+        model_cls: Type[T],
+        journaled: bool = True,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        commit_window: float = DEFAULT_COMMIT_WINDOW,
+    ):
         """
         Initialize a state manager.
 
         Args:
             state_dir: Directory to store state files
-            filename: Name of the state file
+            filename: Name of the JSON state file; its stem names the SQLite table
             model_cls: Pydantic model class to serialize/deserialize
+            journaled: Append JSON mutations to a journal instead of rewriting the file
+            compact_threshold: Journal size in bytes that triggers compaction
+            commit_window: Seconds to wait for more writes before committing
         """
         self.state_dir = Path(state_dir)
-        self.state_file = self.state_dir / filename
+        self.filename = filename
         self.model_cls = model_cls
+        self.journaled = journaled
+        self.compact_threshold = compact_threshold
+        self.commit_window = commit_window
+
+        # In-memory store, populated lazily on first access
+        self._items: Dict[str, T] = {}
+        # Serialized form of each item, reused when writing the state file
+        self._encoded: Dict[str, str] = {}
+        self._store: Optional[StateStore] = None
+
+        # Mutations waiting for the next group commit, and their waiters
+        self._pending: List[StateOp] = []
+        self._waiters: List[asyncio.Future] = []
+        self._writer: Optional[asyncio.Task] = None
+        # Set after a failed write, which may have left a partial batch behind
+        self._resync = False
+        self._closing = False
 
         # Create state directory if it doesn't exist
         os.makedirs(self.state_dir, exist_ok=True)
+        StateManager._instances.append(self)
 
-        # Create empty state file if it doesn't exist
-        if not self.state_file.exists():
-            with open(self.state_file, "w") as f:
-                json.dump([], f)
+    @classmethod
+    def configure(cls, backend: state_backends) -> None:
+        """Select the storage backend for every manager loaded afterwards."""
+        cls.backend = backend
 
-    def get_all(self) -> List[T]:
-        """Get all items in the state file."""
-        try:
-            with open(self.state_file, "r") as f:
-                data = json.load(f)
+    @classmethod
+    async def load_all(cls) -> None:
+        """Load every manager's records on the IO thread pool."""
+        loop = asyncio.get_running_loop()
+        for manager in cls._instances:
+            await loop.run_in_executor(get_io_executor(), manager._ensure_loaded)
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Flush pending writes and close the stores of every manager."""
+        for manager in cls._instances:
+            await manager.close()
 
-            # Convert each dict to a model instance
-            return [self.model_cls.model_validate(item) for item in data]
-        except Exception as e:
-            logger.error(f"reading state file: {e}")
-            return []
+    def _json_store(self) -> JsonStateStore:
+        """Build the JSON store for this manager's state file."""
+        return JsonStateStore(
+            self.state_dir,
+            self.filename,
+            journaled=self.journaled,
+            compact_threshold=self.compact_threshold,
+        )
+
+    def _open_store(self) -> StateStore:
+        """Open the configured store, migrating JSON state into SQLite once."""
+        if self.backend != "sqlite":
+            return self._json_store()
+
+        store = SqliteStateStore(self.state_dir, Path(self.filename).stem)
+        json_store = self._json_store()
+        if not store.exists() and json_store.exists():
+            records = json_store.load()
+            logger.info(
+                f"migrating {len(records)} records from {json_store.state_file} to {store.db_file}"
+            )
+            store.compact(
+                {id: json.dumps(record) for id, record in records.items()}
+            )
+            json_store.retire()
+        return store
+
+    def _ensure_loaded(self) -> StateStore:
+        """Open the store and validate its records into memory once, returning the store."""
+        if self._store is not None:
+            return self._store
+
+        store = self._open_store()
+        for record in store.load().values():
+            try:
+                self._apply_put(self.model_cls.model_validate(record))
+            except Exception as e:
+                logger.error(f"skipping invalid state record {record.get('id')}: {e}")
+        self._store = store
+        return store
+
+    def get_all(self) -> List[T]:
+        """Get all items in the state."""
+        self._ensure_loaded()
+        # Hand out copies so callers can't mutate the store without update()
+        return [item.model_copy(deep=True) for item in self._items.values()]
 
     def get_by_id(self, id: str) -> Optional[T]:
         """Get an item by its ID."""
-        items = self.get_all()
-        for item in items:
-            if item.id == id:
-                return item
-        return None
-
-    def _save_items(self, items: List[T]) -> None:
-        """Save items to the state file with error handling."""
-        try:
-            with open(self.state_file, "w") as f:
-                json.dump(
-                    [item.model_dump() for item in items],
-                    f,
-                    default=self._json_serializer,
+        self._ensure_loaded()
+        item = self._items.get(id)
+        return item.model_copy(deep=True) if item is not None else None
+
+    def view_all(self) -> List[T]:
+        """
+        Get all items without copying them, for internal read-only use.
+
+        Stored items are replaced on update, never changed in place, so the
+        returned items stay consistent even while other writers run, and may
+        be handed to a worker thread. Callers must not mutate them.
+        """
+        self._ensure_loaded()
+        return list(self._items.values())
+
+    def view_by_id(self, id: str) -> Optional[T]:
+        """Get an item by its ID without copying it; see ``view_all``."""
+        self._ensure_loaded()
+        return self._items.get(id)
+
+    def _encode(self, item: T) -> str:
+        """Serialize a single item to its JSON representation."""
+        return json.dumps(item.model_dump(), default=self._json_serializer)
+
+    def _apply_put(self, item: T) -> str:
+        """Insert or replace an item in memory, returning its encoding."""
+        encoded = self._encode(item)
+        self._items[item.id] = item
+        self._encoded[item.id] = encoded
+        return encoded
+
+    def _apply_delete(self, id: str) -> bool:
+        """Remove an item from memory."""
+        if id not in self._items:
+            return False
+        del self._items[id]
+        del self._encoded[id]
+        return True
+
+    def _write(
+        self,
+        store: StateStore,
+        ops: List[StateOp],
+        snapshot: Optional[Dict[str, str]],
+        resync: bool,
+    ) -> None:
+        """Persist a batch of mutations, compacting afterwards if needed."""
+        # On resync the snapshot holds every mutation, including ones from failed batches
+        if not resync:
+            store.commit(ops)
+        if snapshot is not None and (resync or store.needs_compaction()):
+            store.compact(snapshot)
+
+    async def _commit(self) -> None:
+        """Single writer: persist everything queued, one batch at a time."""
+        loop = asyncio.get_running_loop()
+        retry_delay = self.commit_window
+        while self._pending or self._resync:
+            # Let concurrent writers join this batch
+            await asyncio.sleep(self.commit_window)
+            # Loaded already: mutations load the manager before queuing
+            store = self._ensure_loaded()
+
+            ops, self._pending = self._pending, []
+            waiters, self._waiters = self._waiters, []
+            resync = self._resync
+            # Copy the encoded state for compaction; the loop keeps mutating it
+            snapshot = (
+                dict(self._encoded) if resync or store.needs_compaction() else None
+            )
+            try:
+                await loop.run_in_executor(
+                    get_io_executor(), self._write, store, ops, snapshot, resync
                 )
-        except Exception as e:
-            logger.error(f"saving state file: {e}")
-            raise
+            except Exception as e:
+                if self._closing:
+                    logger.error(f"saving state file, giving up on shutdown: {e}")
+                    self._resync = False
+                    for waiter in waiters + self._waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                    self._pending, self._waiters = [], []
+                    break
+
+                logger.error(f"saving state file, retrying in {retry_delay:.2f}s: {e}")
+                # The batch may be partly on disk; rewrite the whole state next time
+                self._resync = True
+                self._waiters[:0] = waiters
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
+                continue
+
+            retry_delay = self.commit_window
+            self._resync = False
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
 
-    def add(self, item: T) -> T:
+        self._writer = None
+
+    async def _enqueue(self, op: StateOp) -> None:
+        """Queue a mutation for the next group commit and wait for it."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending.append(op)
+        self._waiters.append(waiter)
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._commit())
+        await waiter
+
+    async def flush(self) -> None:
+        """Wait until every queued mutation has been committed."""
+        if self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    async def add(self, item: T) -> T:
         """Add a new item to the state."""
-        items = self.get_all()
-        items.append(item)
-        self._save_items(items)
-        return item
+        return await self.update(item)
 
-    def update(self, item: T) -> T:
+    async def update(self, item: T) -> T:
         """Update an existing item in the state."""
-        items = self.get_all()
-        items = [i for i in items if i.id != item.id]
-        items.append(item)
-        self._save_items(items)
+        self._ensure_loaded()
+        encoded = self._apply_put(item.model_copy(deep=True))
+        await self._enqueue(("put", item.id, encoded))
         return item
 
-    def delete(self, id: str) -> bool:
+    async def delete(self, id: str) -> bool:
         """Delete an item from the state."""
-        items = self.get_all()
-        new_items = [item for item in items if item.id != id]
+        self._ensure_loaded()
 
         # If no items were removed, return False
-        if len(new_items) == len(items):
+        if not self._apply_delete(id):
             return False
 
-        self._save_items(new_items)
+        await self._enqueue(("delete", id, None))
         return True
 
+    async def close(self) -> None:
+        """Flush and release the underlying store; it is reopened on next access."""
+        self._closing = True
+        try:
+            await self.flush()
+        finally:
+            self._closing = False
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+            self._items.clear()
+            self._encoded.clear()
+
     def _json_serializer(self, obj: Any) -> Any:
         """Custom JSON serializer to handle datetime objects."""
         if isinstance(obj, datetime):
             return obj.isoformat()
         raise TypeError(f"Type {type(obj)} not serializable")
-
-    @asynccontextmanager
-    async def lifespan(self):
-        """Context manager to handle state loading and saving."""
-        self.state = self.get_all()
-        try:
-            yield self
-        finally:
-            self._save_items(self.state)
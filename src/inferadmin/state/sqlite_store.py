@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+from loguru import logger
+
+from .stores import StateOp
+
+# Shared database file for every SQLite-backed manager
+SQLITE_FILENAME = "state.db"
+
+
+class SqliteStateStore:
+    """
+    Persists records in a SQLite table, one row per item.
+
+    The database runs in WAL mode so a commit only appends the changed pages,
+    and each table is keyed by an indexed ``id`` primary key. Statements are
+    fixed parameterized SQL so sqlite3's statement cache reuses them.
+    """
+
+    def __init__(self, state_dir: Path, table: str):
+        """
+        Initialize a SQLite state store.
+
+        Args:
+            state_dir: Directory holding the shared database file
+            table: Name of the table storing this manager's items
+        """
+        self.db_file = state_dir / SQLITE_FILENAME
+        self.table = table
+        self._lock = threading.Lock()
+
+        # Commits may run on the IO thread pool, serialized by self._lock
+        self._conn = sqlite3.connect(
+            self.db_file, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+
+        self._table_existed = (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ).fetchone()
+            is not None
+        )
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" (id TEXT PRIMARY KEY, data TEXT NOT NULL)'
+        )
+
+        self._select_all_sql = f'SELECT data FROM "{table}" ORDER BY rowid'
+        self._upsert_sql = (
+            f'INSERT INTO "{table}" (id, data) VALUES (?, ?) '
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data"
+        )
+        self._delete_sql = f'DELETE FROM "{table}" WHERE id = ?'
+        self._clear_sql = f'DELETE FROM "{table}"'
+
+    def exists(self) -> bool:
+        """Whether the table existed before this store opened it."""
+        return self._table_existed
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Read every row, returning records keyed by id in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(self._select_all_sql).fetchall()
+
+        records = {}
+        for (data,) in rows:
+            record = json.loads(data)
+            records[record["id"]] = record
+        return records
+
+    def commit(self, ops: List[StateOp]) -> None:
+        """
+        Persist a batch of mutations in a single transaction.
+
+        Args:
+            ops: Mutations to persist, in order
+        """
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for op, id, data in ops:
+                    if op == "put":
+                        self._conn.execute(self._upsert_sql, (id, data))
+                    else:
+                        self._conn.execute(self._delete_sql, (id,))
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                logger.error(f"committing state to {self.db_file}: {e}")
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def needs_compaction(self) -> bool:
+        """Rows are updated in place, so there is nothing to fold."""
+        return False
+
+    def compact(self, encoded: Dict[str, str]) -> None:
+        """Replace the table contents with exactly the given items."""
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute(self._clear_sql)
+                self._conn.executemany(self._upsert_sql, encoded.items())
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                logger.error(f"rewriting state in {self.db_file}: {e}")
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
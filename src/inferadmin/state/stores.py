@@ -0,0 +1,50 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Protocol, Tuple, TypeAlias
+
+# A single mutation: ("put", id, encoded item) or ("delete", id, None)
+StateOp: TypeAlias = Tuple[Literal["put", "delete"], str, Optional[str]]
+
+state_backends: TypeAlias = Literal["json", "sqlite"]
+
+
+def fsync_dir(path: Path) -> None:
+    """Flush a directory entry so a rename inside it survives a crash."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StateStore(Protocol):
+    """Durable storage behind a StateManager's in-memory index."""
+
+    def exists(self) -> bool:
+        """Whether the store already holds persisted state."""
+        ...
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Return every persisted record keyed by id, in insertion order."""
+        ...
+
+    def commit(self, ops: List[StateOp]) -> None:
+        """Durably persist a batch of mutations."""
+        ...
+
+    def needs_compaction(self) -> bool:
+        """Whether the store would benefit from a compact() call."""
+        ...
+
+    def compact(self, encoded: Dict[str, str]) -> None:
+        """Replace the persisted state with exactly the given items."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        ...
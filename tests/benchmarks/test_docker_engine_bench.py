@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import docker
+import pytest
+
+from inferadmin.docker_engine import AsyncDockerEngine, DockerPyEngine
+from test_docker_engine import FakeEngine, container
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 200
+# Time the fake daemon takes to answer each request
+DAEMON_LATENCY = 0.005
+
+
+async def inspect(request):
+    await asyncio.sleep(DAEMON_LATENCY)
+    return 200, {}, container("abc")
+
+
+async def concurrent_status_calls(engine):
+    """Wall time of CALLS concurrent container inspections."""
+    started = time.perf_counter()
+    found = await asyncio.gather(*(engine.containers_get("abc") for _ in range(CALLS)))
+    elapsed = time.perf_counter() - started
+    assert [c.status for c in found] == ["running"] * CALLS
+    return elapsed
+
+
+@pytest.mark.asyncio
+async def test_concurrent_status_calls(tmp_path):
+    results = {}
+
+    fake = FakeEngine(tmp_path / "async.sock")
+    fake.route("GET", "/containers/abc/json", inspect)
+    await fake.start()
+    engine = AsyncDockerEngine(fake.socket_path, max_connections=64)
+    try:
+        results["asyncio engine"] = (await concurrent_status_calls(engine), fake.connections)
+    finally:
+        await engine.close()
+        await fake.stop()
+
+    fake = FakeEngine(tmp_path / "docker-py.sock")
+    fake.route("GET", "/v1.43/containers/abc/json", inspect)
+    await fake.start()
+    client = docker.DockerClient(base_url=f"unix://{fake.socket_path}", version="1.43")
+    try:
+        # Blocking calls on the IO thread pool, as in the fallback engine
+        elapsed = await concurrent_status_calls(DockerPyEngine(client))
+        results["docker-py engine"] = (elapsed, fake.connections)
+    finally:
+        client.close()
+        await fake.stop()
+
+    print(f"\n{'client':>18} {'wall':>10} {'connections':>12}")
+    for name, (elapsed, connections) in results.items():
+        print(f"{name:>18} {elapsed * 1e3:>8.1f}ms {connections:>12}")
+
+    assert results["asyncio engine"][1] <= 64
+    assert results["asyncio engine"][0] < results["docker-py engine"][0]
@@ -0,0 +1,89 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from inferadmin.routes.models.support import REQUIRED_MODEL_FILES, scan_model_folder
+
+pytestmark = pytest.mark.benchmark
+
+MODELS = 20
+SUBDIRS = 10
+FILES_PER_SUBDIR = 50
+
+
+def build_tree(root):
+    """MODELS complete model folders, each with SUBDIRS x FILES_PER_SUBDIR extra files."""
+    folders = []
+    for m in range(MODELS):
+        folder = root / f"org_model-{m}"
+        folder.mkdir()
+        for name in REQUIRED_MODEL_FILES:
+            (folder / name).write_bytes(b"{}")
+        (folder / "model-00001.safetensors").write_bytes(b"x" * 1000)
+        for d in range(SUBDIRS):
+            subdir = folder / f"dir-{d}"
+            subdir.mkdir()
+            for f in range(FILES_PER_SUBDIR):
+                (subdir / f"file-{f}.bin").write_bytes(b"x" * 100)
+        folders.append(folder)
+    return folders
+
+
+def three_pass_scan(folder):
+    """
+    The scan scan_model_folder replaced: a validity check with pathlib, then
+    one os.walk summing sizes and another finding the newest mtime.
+    """
+    path = Path(folder)
+    if not path.is_dir() or not any(path.iterdir()):
+        return None
+    if not list(path.glob("*.safetensors")):
+        return None
+    for name in REQUIRED_MODEL_FILES:
+        if not (path / name).exists():
+            return None
+
+    total_bytes = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            if not os.path.islink(file_path):
+                total_bytes += os.path.getsize(file_path)
+
+    last_modified = 0.0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            if os.path.isfile(file_path):
+                last_modified = max(last_modified, os.path.getmtime(file_path))
+    return total_bytes, last_modified
+
+
+def best_of(runs, fn):
+    """Fastest of several timings of ``fn``, in seconds."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def test_single_scandir_pass_against_three_passes(tmp_path):
+    folders = build_tree(tmp_path)
+
+    old = [three_pass_scan(folder) for folder in folders]
+    new = [scan_model_folder(folder) for folder in folders]
+    assert [(scan.total_bytes, scan.last_modified) for scan in new] == old
+
+    three_pass = best_of(5, lambda: [three_pass_scan(folder) for folder in folders])
+    single_pass = best_of(5, lambda: [scan_model_folder(folder) for folder in folders])
+
+    files = MODELS * (len(REQUIRED_MODEL_FILES) + 1 + SUBDIRS * FILES_PER_SUBDIR)
+    print(f"\n{files} files in {MODELS} model folders")
+    print(f"{'three passes':>14} {three_pass * 1e3:>8.1f}ms")
+    print(f"{'scandir':>14} {single_pass * 1e3:>8.1f}ms")
+
+    assert single_pass < three_pass
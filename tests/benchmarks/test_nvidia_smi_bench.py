@@ -0,0 +1,48 @@
+import os
+import resource
+import time
+
+import pytest
+
+from inferadmin.routes.infra.gpus.nvidia_smi import NvidiaSmiStream, query_gpus
+from test_nvidia_smi import FakeNvidiaSmi, row, take
+
+pytestmark = pytest.mark.benchmark
+
+SAMPLES = 50
+INTERVAL = 0.02
+GPUS = ["GPU-a", "GPU-b", "GPU-c", "GPU-d"]
+
+
+def cpu_seconds():
+    """CPU time of this process and its reaped children so far."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+@pytest.mark.asyncio
+async def test_stream_against_a_process_per_sample(tmp_path, monkeypatch):
+    nvidia_smi = FakeNvidiaSmi(tmp_path)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    # One batch more than sampled, since a sample ends when the next one starts
+    nvidia_smi.emit(*([row(uuid, used=n) for uuid in GPUS] for n in range(SAMPLES + 1)))
+
+    results = {}
+
+    started, cpu = time.perf_counter(), cpu_seconds()
+    samples = await take(NvidiaSmiStream(interval=INTERVAL), SAMPLES, timeout=30.0)
+    results["stream"] = (time.perf_counter() - started, cpu_seconds() - cpu)
+    assert len(samples) == SAMPLES
+
+    started, cpu = time.perf_counter(), cpu_seconds()
+    for _ in range(SAMPLES):
+        assert len(await query_gpus()) == len(GPUS)
+    results["process per sample"] = (time.perf_counter() - started, cpu_seconds() - cpu)
+
+    print(f"\n{SAMPLES} samples of {len(GPUS)} GPUs from a fake nvidia-smi")
+    print(f"{'backend':>20} {'wall':>10} {'cpu':>10} {'cpu/sample':>12}")
+    for name, (wall, cpu) in results.items():
+        print(f"{name:>20} {wall * 1e3:>8.0f}ms {cpu * 1e3:>8.0f}ms {cpu / SAMPLES * 1e3:>10.2f}ms")
+
+    assert results["stream"][1] < results["process per sample"][1]
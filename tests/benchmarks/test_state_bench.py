@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from inferadmin.state.manager import StateManager
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [10, 1_000, 10_000]
+
+
+class Record(BaseModel):
+    id: str
+    name: str
+    value: int = 0
+    tags: list[str] = []
+
+
+def record(i, value=0):
+    return Record(id=f"r{i}", name=f"record {i}", value=value, tags=["a", "b"])
+
+
+async def seeded(path, size):
+    """A manager holding ``size`` records, committed without a group window."""
+    manager = StateManager(path, "records.json", Record, commit_window=0)
+    for start in range(0, size, 1000):
+        await asyncio.gather(
+            *(manager.add(record(i)) for i in range(start, min(start + 1000, size)))
+        )
+    return manager
+
+
+def best_of(runs, fn):
+    """Fastest of several timings of ``fn``, in seconds."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+async def best_of_async(runs, fn):
+    """Fastest of several timings of the coroutine function ``fn``, in seconds."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+@pytest.mark.asyncio
+async def test_reads_and_updates_stay_flat_as_the_store_grows(tmp_path):
+    results = {}
+    for size in SIZES:
+        manager = await seeded(tmp_path / str(size), size)
+        ids = list(range(0, size, max(size // 100, 1)))
+
+        def reads():
+            for i in ids:
+                manager.get_by_id(f"r{i}")
+
+        async def updates():
+            for n in range(50):
+                await manager.update(record(ids[n % len(ids)], value=n))
+
+        read = best_of(5, reads) / len(ids)
+        update = await best_of_async(3, updates) / 50
+        results[size] = (read, update)
+        await manager.close()
+
+    print(f"\n{'records':>8} {'get_by_id':>12} {'update':>12}")
+    for size, (read, update) in results.items():
+        print(f"{size:>8} {read * 1e6:>10.1f}us {update * 1e3:>10.3f}ms")
+
+    # Loose bounds; rewriting the whole file per update grows with the record count
+    smallest, largest = results[SIZES[0]], results[SIZES[-1]]
+    assert largest[0] < 5 * smallest[0]
+    assert largest[1] < 5 * smallest[1]
+
+
+@pytest.mark.asyncio
+async def test_json_and_sqlite_backends(tmp_path):
+    results = {}
+    try:
+        for backend in ("json", "sqlite"):
+            StateManager.configure(backend)
+            for size in SIZES[1:]:
+                path = tmp_path / backend / str(size)
+                started = time.perf_counter()
+                manager = await seeded(path, size)
+                seed = time.perf_counter() - started
+
+                async def updates():
+                    for n in range(50):
+                        await manager.update(record(n * (size // 50), value=n))
+
+                update = await best_of_async(3, updates) / 50
+                await manager.close()
+
+                reopened = StateManager(path, "records.json", Record)
+                started = time.perf_counter()
+                loaded = reopened.view_all()
+                load = time.perf_counter() - started
+                assert len(loaded) == size
+                await reopened.close()
+                results[backend, size] = (seed, update, load)
+    finally:
+        StateManager.configure("json")
+
+    print(f"\n{'backend':>8} {'records':>8} {'seed':>10} {'update':>10} {'load':>10}")
+    for (backend, size), (seed, update, load) in results.items():
+        print(
+            f"{backend:>8} {size:>8} {seed * 1e3:>8.1f}ms "
+            f"{update * 1e3:>8.3f}ms {load * 1e3:>8.1f}ms"
+        )
+    for backend in ("json", "sqlite"):
+        assert results[backend, 10_000][1] < 5 * results[backend, 1_000][1]
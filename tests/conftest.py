@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Module-level state managers live under ~/.inferadmin; keep them out of the real home
+os.environ["HOME"] = tempfile.mkdtemp(prefix="inferadmin-tests-")
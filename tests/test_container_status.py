@@ -0,0 +1,124 @@
+import asyncio
+import queue
+import time
+
+import pytest
+import pytest_asyncio
+
+from inferadmin.common.container_status import ContainerStatusWatcher, docker_list_source
+from inferadmin.docker import DockerManager
+from inferadmin.docker_engine import EngineContainer
+
+
+class FakeEventSource:
+    """Stands in for the Docker events stream; tests push events into it."""
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.filters = []
+
+    def push(self, action, container_id, **extra):
+        self.events.put({"Type": "container", "Action": action, "Actor": {"ID": container_id}, **extra})
+
+    def __call__(self, filters):
+        self.filters.append(filters)
+        return self._stream()
+
+    def _stream(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                return
+            yield event
+
+
+def listing(*containers):
+    """A list source returning the given (id, status) pairs."""
+
+    async def source():
+        return list(containers)
+
+    return source
+
+
+async def until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def source():
+    return FakeEventSource()
+
+
+@pytest_asyncio.fixture
+async def watcher(source):
+    watcher = ContainerStatusWatcher(event_source=source, list_source=listing(("a", "running")))
+    await watcher.start()
+    yield watcher
+    source.events.put(None)
+    await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_listing_seeds_the_table(watcher, source):
+    await until(lambda: watcher.synced)
+    assert watcher.get("a") == "running"
+    assert watcher.get("b") == "not_found"
+    assert source.filters[0]["label"] == "managed-by=inferadmin"
+
+
+@pytest.mark.asyncio
+async def test_events_update_statuses(watcher, source):
+    await until(lambda: watcher.synced)
+
+    source.push("die", "a")
+    await until(lambda: watcher.get("a") == "exited")
+    source.push("create", "b")
+    source.push("start", "b")
+    await until(lambda: watcher.get("b") == "running")
+    source.push("destroy", "a")
+    await until(lambda: watcher.get("a") == "not_found")
+
+
+@pytest.mark.asyncio
+async def test_unrelated_events_are_ignored(watcher, source):
+    await until(lambda: watcher.synced)
+    source.push("exec_start: sh", "a")
+    source.push("die", "a")
+    await until(lambda: watcher.get("a") == "exited")
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_events_newer_than_the_listing():
+    watcher = ContainerStatusWatcher(list_source=listing(("a", "running"), ("b", "running")))
+    # Both arrived while the listing was in flight
+    later = time.time_ns() + 10**9
+    watcher.handle_event({"Action": "die", "Actor": {"ID": "a"}, "timeNano": later})
+    watcher.handle_event({"Action": "destroy", "Actor": {"ID": "b"}, "timeNano": later})
+    watcher.handle_event({"Action": "pause", "Actor": {"ID": "c"}, "timeNano": 0})
+
+    await watcher.reconcile()
+
+    assert watcher.synced
+    assert watcher.get("a") == "exited"
+    assert watcher.get("b") == "not_found"
+    # Stale events are superseded by the listing
+    assert watcher.get("c") == "not_found"
+
+
+@pytest.mark.asyncio
+async def test_docker_listing_goes_through_the_async_engine(monkeypatch):
+    calls = []
+
+    class Engine:
+        async def containers_list(self, **kwargs):
+            calls.append(kwargs)
+            return [EngineContainer({"Id": "a", "State": "running"})]
+
+    monkeypatch.setattr(DockerManager, "engine", Engine())
+
+    assert await docker_list_source() == [("a", "running")]
+    assert calls == [{"all": True, "filters": {"label": "managed-by=inferadmin"}}]
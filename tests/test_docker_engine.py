@@ -0,0 +1,265 @@
+import asyncio
+import base64
+import json
+import struct
+
+import docker
+import pytest
+import pytest_asyncio
+
+from inferadmin.docker import DockerManagerClass
+from inferadmin.docker_engine import MULTIPLEXED_STREAM, AsyncDockerEngine, demux_log_stream
+
+
+class FakeEngine:
+    """
+    A Docker Engine API stand-in listening on a unix socket.
+
+    Routes map (method, path) to a handler, plain or async, taking the
+    request and returning (status, headers, body). A dict body is sent as JSON, and a list of
+    bytes is sent chunked, one chunk per item.
+    Every request is recorded, and connections are counted to observe pooling.
+    """
+
+    def __init__(self, socket_path):
+        self.socket_path = str(socket_path)
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self._server = None
+
+    def route(self, method, path, handler):
+        self.routes[(method, path)] = handler
+
+    async def start(self):
+        self._server = await asyncio.start_unix_server(self._serve, self.socket_path)
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                path, _, query = target.partition("?")
+                request = {
+                    "method": method,
+                    "path": path,
+                    "query": query,
+                    "headers": headers,
+                    "body": json.loads(body) if body else None,
+                }
+                self.requests.append(request)
+                handler = self.routes.get((method, path))
+                if handler is None:
+                    status, response_headers, payload = 404, {}, {"message": "no such route"}
+                else:
+                    result = handler(request)
+                    if asyncio.iscoroutine(result):
+                        # Async handlers can stand in for a slow daemon
+                        result = await result
+                    status, response_headers, payload = result
+                writer.write(self._encode(status, response_headers, payload))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _encode(status, headers, payload):
+        if isinstance(payload, dict):
+            payload = json.dumps(payload).encode()
+            headers = {"Content-Type": "application/json", **headers}
+        head = f"HTTP/1.1 {status} Status\r\n"
+        for name, value in headers.items():
+            head += f"{name}: {value}\r\n"
+        if isinstance(payload, list):
+            head += "Transfer-Encoding: chunked\r\n\r\n"
+            body = b"".join(b"%x\r\n%s\r\n" % (len(chunk), chunk) for chunk in payload)
+            return head.encode() + body + b"0\r\n\r\n"
+        head += f"Content-Length: {len(payload)}\r\n\r\n"
+        return head.encode() + payload
+
+    def paths(self):
+        return [(request["method"], request["path"]) for request in self.requests]
+
+
+def frame(stream, data):
+    return struct.pack(">BxxxL", stream, len(data)) + data
+
+
+@pytest_asyncio.fixture
+async def fake(tmp_path):
+    fake = FakeEngine(tmp_path / "docker.sock")
+    await fake.start()
+    yield fake
+    await fake.stop()
+
+
+@pytest_asyncio.fixture
+async def engine(fake):
+    engine = AsyncDockerEngine(socket_path=fake.socket_path, timeout=5.0)
+    yield engine
+    await engine.close()
+
+
+def container(id, status="running"):
+    return {"Id": id, "State": {"Status": status}, "Config": {"Labels": {}, "Tty": False}}
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_pooled_connections(engine, fake):
+    fake.route("GET", "/containers/abc/json", lambda r: (200, {}, container("abc")))
+
+    for _ in range(3):
+        found = await engine.containers_get("abc")
+
+    assert found.id == "abc"
+    assert found.status == "running"
+    assert fake.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_raise_docker_exceptions(engine, fake):
+    fake.route(
+        "POST", "/containers/abc/start", lambda r: (500, {}, {"message": "driver failed"})
+    )
+
+    with pytest.raises(docker.errors.NotFound):
+        await engine.containers_get("missing")
+    with pytest.raises(docker.errors.APIError) as error:
+        await engine.containers_start("abc")
+    assert error.value.explanation == "driver failed"
+
+
+@pytest.mark.asyncio
+async def test_run_pulls_a_missing_image_with_registry_auth(engine, fake, tmp_path, monkeypatch):
+    credentials = base64.b64encode(b"user:secret").decode()
+    (tmp_path / "config.json").write_text(
+        json.dumps({"auths": {"registry.example.com": {"auth": credentials}}})
+    )
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path))
+
+    pulled = []
+
+    def create(request):
+        if not pulled:
+            return 404, {}, {"message": "No such image"}
+        return 201, {}, {"Id": "new"}
+
+    def pull(request):
+        pulled.append(request)
+        return 200, {}, [b'{"status": "Pulling"}\n', b'{"status": "Downloaded"}\n']
+
+    fake.route("POST", "/containers/create", create)
+    fake.route("POST", "/images/create", pull)
+    fake.route("POST", "/containers/new/start", lambda r: (204, {}, b""))
+    fake.route("GET", "/containers/new/json", lambda r: (200, {}, container("new")))
+
+    result = await engine.containers_run(
+        "registry.example.com/team/server:1.0",
+        name="svc",
+        ports={"8000": 18000},
+        gpu_uuids=["GPU-1"],
+    )
+
+    assert result.id == "new"
+    assert fake.paths() == [
+        ("POST", "/containers/create"),
+        ("POST", "/images/create"),
+        ("POST", "/containers/create"),
+        ("POST", "/containers/new/start"),
+        ("GET", "/containers/new/json"),
+    ]
+    sent = json.loads(base64.urlsafe_b64decode(pulled[0]["headers"]["x-registry-auth"]))
+    assert (sent["username"], sent["password"]) == ("user", "secret")
+    assert "fromImage=registry.example.com%2Fteam%2Fserver&tag=1.0" in pulled[0]["query"]
+    create_body = fake.requests[0]["body"]
+    assert create_body["HostConfig"]["PortBindings"] == {"8000/tcp": [{"HostPort": "18000"}]}
+    assert create_body["HostConfig"]["DeviceRequests"][0]["DeviceIDs"] == ["GPU-1"]
+
+
+@pytest.mark.asyncio
+async def test_pull_errors_mid_stream_raise(engine, fake):
+    fake.route(
+        "POST",
+        "/images/create",
+        lambda r: (200, {}, [b'{"status": "Pulling"}\n', b'{"error": "manifest unknown"}\n']),
+    )
+
+    progress = []
+    with pytest.raises(docker.errors.APIError):
+        async for record in engine.images_pull("library/app:missing"):
+            progress.append(record)
+    assert progress == [{"status": "Pulling"}]
+
+
+@pytest.mark.asyncio
+async def test_logs_are_demultiplexed_without_an_inspect(engine, fake):
+    body = frame(1, b"out line\n") + frame(2, b"err line\n")
+    fake.route(
+        "GET",
+        "/containers/abc/logs",
+        lambda r: (200, {"Content-Type": MULTIPLEXED_STREAM, "Api-Version": "1.45"}, body),
+    )
+
+    assert await engine.containers_logs("abc") == b"out line\nerr line\n"
+    assert fake.paths() == [("GET", "/containers/abc/logs")]
+
+
+@pytest.mark.asyncio
+async def test_log_stream_reassembles_split_frames(engine, fake):
+    body = frame(1, b"first\n") + frame(1, b"second\n")
+    fake.route(
+        "GET",
+        "/containers/abc/logs",
+        lambda r: (200, {"Content-Type": MULTIPLEXED_STREAM}, [body[:5], body[5:12], body[12:]]),
+    )
+
+    chunks = [chunk async for chunk in engine.containers_logs_stream("abc")]
+
+    assert b"".join(chunks) == b"first\nsecond\n"
+    assert "follow=1" in fake.requests[0]["query"]
+
+
+@pytest.mark.asyncio
+async def test_old_daemons_are_asked_whether_logs_are_a_tty(engine, fake):
+    fake.route(
+        "GET",
+        "/containers/abc/logs",
+        lambda r: (
+            200,
+            {"Content-Type": "application/vnd.docker.raw-stream", "Api-Version": "1.41"},
+            b"raw\n",
+        ),
+    )
+    tty = {**container("abc"), "Config": {"Tty": True}}
+    fake.route("GET", "/containers/abc/json", lambda r: (200, {}, tty))
+
+    assert await engine.containers_logs("abc") == b"raw\n"
+    assert ("GET", "/containers/abc/json") in fake.paths()
+
+
+def test_demux_keeps_a_partial_frame():
+    data = frame(1, b"complete") + frame(2, b"partial")[:10]
+    output, rest = demux_log_stream(data)
+    assert output == b"complete"
+    assert rest == frame(2, b"partial")[:10]
+
+
+def test_engine_is_required_before_use():
+    manager = DockerManagerClass()
+    with pytest.raises(RuntimeError):
+        manager.get_engine()
+    manager.engine = AsyncDockerEngine("/nonexistent.sock")
+    assert manager.get_engine() is manager.engine
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from inferadmin.routes.infra.gpus.models import GpuState
+from inferadmin.routes.infra.gpus.telemetry import GpuRing, GpuTelemetry
+
+
+def gpu(uuid, used=1.0):
+    return GpuState(uuid=uuid, total_vram=80.0, used_vram=used, utilization=50.0, power_consumption=300.0)
+
+
+def test_ring_keeps_the_newest_samples_in_order():
+    ring = GpuRing(3)
+    for i in range(5):
+        ring.append(1000.0 + i, gpu("GPU-0", used=i))
+
+    assert len(ring) == 3
+    assert [sample.used_vram for sample in ring.last()] == [2.0, 3.0, 4.0]
+    assert [sample.used_vram for sample in ring.last(2)] == [3.0, 4.0]
+    assert ring.last(0) == []
+    assert ring.last(10)[0].timestamp == datetime.fromtimestamp(1002.0)
+
+
+def test_partly_filled_ring_returns_only_what_was_recorded():
+    ring = GpuRing(4)
+    ring.append(1.0, gpu("GPU-0", used=7))
+
+    assert [sample.used_vram for sample in ring.last()] == [7.0]
+
+
+def test_history_is_kept_per_gpu():
+    telemetry = GpuTelemetry(history=2)
+    telemetry.record([gpu("GPU-0", 1), gpu("GPU-1", 10)], timestamp=1.0)
+    telemetry.record([gpu("GPU-0", 2), gpu("GPU-1", 20)], timestamp=2.0)
+    telemetry.record([gpu("GPU-0", 3), gpu("GPU-1", 30)], timestamp=3.0)
+
+    assert telemetry.synced
+    assert [g.used_vram for g in telemetry.latest()] == [3.0, 30.0]
+    history = {h.uuid: [s.used_vram for s in h.samples] for h in telemetry.recent()}
+    assert history == {"GPU-0": [2.0, 3.0], "GPU-1": [20.0, 30.0]}
+    (one,) = telemetry.recent(samples=1, uuid="GPU-1")
+    assert [s.used_vram for s in one.samples] == [30.0]
+
+
+def test_lookups_fail_before_the_first_sample_or_for_unknown_gpus():
+    telemetry = GpuTelemetry()
+    with pytest.raises(HTTPException) as error:
+        telemetry.latest()
+    assert error.value.status_code == 500
+
+    telemetry.record([gpu("GPU-0")])
+    with pytest.raises(HTTPException) as error:
+        telemetry.recent(uuid="GPU-9")
+    assert error.value.status_code == 404
@@ -0,0 +1,157 @@
+from datetime import datetime, time
+
+import docker
+import pytest
+
+from inferadmin.docker import DockerManager
+from inferadmin.docker_engine import EngineImage
+from inferadmin.routes.images import prepull
+from inferadmin.routes.images.models import ImageCatalogEntry
+from inferadmin.routes.images.pull_jobs import ImagePullJobs, normalize_reference
+from inferadmin.state.manager import StateManager
+
+
+class FakeRegistryEngine:
+    """
+    Stands in for the Docker engine and the registry behind it.
+
+    ``registry`` maps references to the digest the registry currently
+    serves; pulling copies that digest into the local images.
+    """
+
+    def __init__(self):
+        self.registry = {}
+        self.local = {}
+        self.pulls = []
+        self.offline = False
+
+    def publish(self, reference, digest):
+        self.registry[normalize_reference(reference)] = digest
+
+    async def distribution_inspect(self, reference):
+        if self.offline:
+            raise docker.errors.APIError("registry unreachable")
+        digest = self.registry.get(normalize_reference(reference))
+        if digest is None:
+            raise docker.errors.ImageNotFound(reference)
+        return {"Descriptor": {"digest": digest}}
+
+    async def images_pull(self, reference):
+        self.pulls.append(reference)
+        key = normalize_reference(reference)
+        digest = self.registry[key]
+        repository = key.rpartition(":")[0]
+        self.local[key] = {
+            "Id": f"sha256:{digest[-12:]}",
+            "RepoTags": [key],
+            "RepoDigests": [f"{repository}@{digest}"],
+            "Size": 1000,
+            "Created": "2026-01-01T00:00:00Z",
+        }
+        yield {"status": f"Digest: {digest}"}
+
+    async def images_tag(self, image, repository, tag=None):
+        self.local[normalize_reference(repository)] = self.local[normalize_reference(image)]
+
+    async def images_get(self, name):
+        attrs = self.local.get(normalize_reference(name))
+        if attrs is None:
+            raise docker.errors.ImageNotFound(name)
+        return EngineImage(attrs)
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    engine = FakeRegistryEngine()
+    monkeypatch.setattr(DockerManager, "engine", engine)
+    monkeypatch.setattr(prepull, "image_pull_jobs", ImagePullJobs())
+    monkeypatch.setattr(
+        prepull, "image_catalog", StateManager(tmp_path, "image_catalog.json", ImageCatalogEntry)
+    )
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_missing_image_is_pulled_and_cataloged(engine):
+    engine.publish("vllm/vllm-openai:v1", "sha256:aaa")
+    scheduler = prepull.ImagePrepullScheduler(["vllm/vllm-openai:v1"])
+
+    await scheduler.refresh()
+
+    entry = prepull.image_catalog.get_by_id("vllm/vllm-openai:v1")
+    assert engine.pulls == ["vllm/vllm-openai:v1"]
+    assert entry.up_to_date
+    assert entry.digest == entry.remote_digest == "sha256:aaa"
+    assert entry.size == 1000
+    assert entry.pulled is not None
+    assert scheduler.last_run is not None
+
+
+@pytest.mark.asyncio
+async def test_current_image_is_not_pulled_again(engine):
+    engine.publish("app", "sha256:aaa")
+    scheduler = prepull.ImagePrepullScheduler(["app"])
+
+    await scheduler.refresh()
+    await scheduler.refresh()
+
+    assert engine.pulls == ["app"]
+    assert prepull.image_catalog.get_by_id("app:latest").up_to_date
+
+
+@pytest.mark.asyncio
+async def test_stale_image_is_pulled_when_the_registry_moves(engine):
+    engine.publish("app:1", "sha256:aaa")
+    scheduler = prepull.ImagePrepullScheduler(["app:1"])
+    await scheduler.refresh()
+
+    engine.publish("app:1", "sha256:bbb")
+    await scheduler.refresh(pull=False)
+    assert not prepull.image_catalog.get_by_id("app:1").up_to_date
+
+    await scheduler.refresh()
+    entry = prepull.image_catalog.get_by_id("app:1")
+    assert len(engine.pulls) == 2
+    assert entry.up_to_date
+    assert entry.digest == "sha256:bbb"
+
+
+@pytest.mark.asyncio
+async def test_unreachable_registry_keeps_the_local_image(engine):
+    engine.publish("app:1", "sha256:aaa")
+    scheduler = prepull.ImagePrepullScheduler(["app:1"])
+    await scheduler.refresh()
+
+    engine.offline = True
+    engine.publish("app:1", "sha256:bbb")
+    await scheduler.refresh()
+
+    entry = prepull.image_catalog.get_by_id("app:1")
+    assert len(engine.pulls) == 1
+    assert entry.remote_digest == "sha256:aaa"
+    assert entry.error.startswith("registry check failed")
+
+
+@pytest.mark.asyncio
+async def test_failed_reference_does_not_stop_the_rest(engine):
+    engine.publish("good:1", "sha256:aaa")
+    scheduler = prepull.ImagePrepullScheduler(["unknown:1", "good:1"])
+
+    await scheduler.refresh()
+
+    assert prepull.image_catalog.get_by_id("good:1").up_to_date
+    assert prepull.image_catalog.get_by_id("unknown:1").error is not None
+
+
+def test_window_may_wrap_past_midnight():
+    window = prepull.parse_window("23:00-02:00")
+    assert prepull.in_window(datetime(2026, 1, 1, 23, 30), window)
+    assert prepull.in_window(datetime(2026, 1, 2, 1, 59), window)
+    assert not prepull.in_window(datetime(2026, 1, 2, 2, 0), window)
+    assert prepull.next_window_start(datetime(2026, 1, 1, 23, 30), window) == datetime(2026, 1, 2, 23, 0)
+
+
+def test_malformed_window_is_rejected():
+    with pytest.raises(ValueError):
+        prepull.parse_window("2am-5am")
+    assert prepull.parse_window("02:00-05:00") == (time(2), time(5))
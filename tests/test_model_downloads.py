@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import pytest_asyncio
+from huggingface_hub import constants
+
+from inferadmin.config.loader import config_manager
+from inferadmin.config.models import InferAdminConfig
+from inferadmin.routes.models.blobs import blob_store
+from inferadmin.routes.models.downloads import ModelDownloads
+from inferadmin.routes.models.index import model_index
+from inferadmin.routes.models.models import ModelDownloadJob
+from inferadmin.routes.models.quota import model_quota
+from inferadmin.routes.models.support import REQUIRED_MODEL_FILES
+from inferadmin.routes.models.transfer import PARTIAL_DIR
+from inferadmin.state.manager import StateManager
+
+REVISION = "0123456789abcdef0123456789abcdef01234567"
+
+
+class FakeHub:
+    """
+    A Hugging Face Hub stand-in serving model metadata and ranged file downloads.
+
+    ``repos`` maps repository IDs to their files' contents. Every file
+    request is logged with its byte range; ``corrupt`` files are served with
+    different content than their recorded hash, and ``stall`` holds back a
+    range starting at a given byte until ``release`` is set.
+    """
+
+    def __init__(self):
+        self.repos = {}
+        self.ranges = []
+        self.corrupt = set()
+        self.stall = None
+        self.stalled = threading.Event()
+        self.release = threading.Event()
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                hub.handle(self)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.release.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_model(self, repo_id, weights_size=5000):
+        files = {name: f'{{"name": "{name}"}}'.encode() for name in REQUIRED_MODEL_FILES}
+        files["model.safetensors"] = bytes(range(256)) * (weights_size // 256) + b"w" * (weights_size % 256)
+        self.repos[repo_id] = files
+        return files
+
+    def _send(self, request, status, body, headers=None):
+        request.send_response(status)
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def handle(self, request):
+        path = request.path.partition("?")[0]
+        if path.startswith("/api/models/"):
+            repo_id = path[len("/api/models/"):]
+            files = self.repos.get(repo_id)
+            if files is None:
+                self._send(request, 404, b"{}", {"X-Error-Code": "RepoNotFound"})
+                return
+            self._send(request, 200, json.dumps(self._info(repo_id, files)).encode())
+            return
+
+        repo_id, _, rest = path.lstrip("/").partition("/resolve/")
+        filename = rest.partition("/")[2]
+        content = self.repos.get(repo_id, {}).get(filename)
+        if content is None:
+            self._send(request, 404, b"not found")
+            return
+        if filename in self.corrupt:
+            content = bytes(len(content))
+
+        range_header = request.headers.get("Range")
+        if range_header is None:
+            self.ranges.append((filename, 0, len(content)))
+            self._send(request, 200, content)
+            return
+        first, _, last = range_header[len("bytes="):].partition("-")
+        start, end = int(first), int(last) + 1 if last else len(content)
+        self.ranges.append((filename, start, end))
+        if self.stall == (filename, start):
+            self.stalled.set()
+            self.release.wait(5)
+        self._send(
+            request,
+            206,
+            content[start:end],
+            {"Content-Range": f"bytes {start}-{end - 1}/{len(content)}"},
+        )
+
+    @staticmethod
+    def _info(repo_id, files):
+        siblings = []
+        for name, content in files.items():
+            sibling = {
+                "rfilename": name,
+                "size": len(content),
+                "blobId": hashlib.sha1(f"blob {len(content)}\0".encode() + content).hexdigest(),
+            }
+            if name.endswith(".safetensors"):
+                sibling["lfs"] = {
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                    "size": len(content),
+                    "pointerSize": 130,
+                }
+            siblings.append(sibling)
+        return {"id": repo_id, "sha": REVISION, "siblings": siblings}
+
+
+@pytest.fixture
+def hub(monkeypatch, tmp_path):
+    hub = FakeHub()
+    hub.start()
+    monkeypatch.setattr(constants, "ENDPOINT", hub.endpoint)
+    monkeypatch.setattr(
+        constants,
+        "HUGGINGFACE_CO_URL_TEMPLATE",
+        hub.endpoint + "/{repo_id}/resolve/{revision}/{filename}",
+    )
+
+    volume = tmp_path / "models"
+    volume.mkdir()
+    monkeypatch.setattr(
+        config_manager,
+        "config",
+        InferAdminConfig(model_storage_path=str(volume), hf_token="hf_test"),
+        raising=False,
+    )
+    for component in (model_index, blob_store, model_quota):
+        monkeypatch.setattr(component, "volume_path", str(volume))
+    monkeypatch.setattr(model_quota, "quota", 10**9)
+    yield hub
+    hub.stop()
+
+
+@pytest_asyncio.fixture
+async def downloads(hub, tmp_path):
+    downloads = ModelDownloads(workers=1, chunk_size=1000, checkpoint_interval=0.05)
+    downloads.jobs = StateManager(tmp_path, "model_downloads.json", ModelDownloadJob)
+    await downloads.start()
+    yield downloads
+    await downloads.close()
+
+
+async def finished(downloads, job_id, timeout=10.0):
+    async def poll():
+        while downloads.get(job_id).state in ("queued", "downloading", "verifying"):
+            await asyncio.sleep(0.01)
+        return downloads.get(job_id)
+
+    return await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_download_fetches_ranges_and_indexes_the_model(hub, downloads):
+    files = hub.add_model("org/complete")
+
+    job = await downloads.submit("org/complete")
+    job = await finished(downloads, job.id)
+
+    assert job.state == "completed", job.error
+    assert job.revision == REVISION
+    assert job.downloaded_bytes == job.total_bytes == sum(map(len, files.values()))
+    folder = os.path.join(model_index.volume_path, "org_complete")
+    for name, content in files.items():
+        with open(os.path.join(folder, name), "rb") as f:
+            assert f.read() == content
+    assert not os.listdir(os.path.join(folder, PARTIAL_DIR))
+    weights = [r for r in hub.ranges if r[0] == "model.safetensors"]
+    assert sorted(weights) == [("model.safetensors", s, s + 1000) for s in range(0, 5000, 1000)]
+    # The files that make the folder a model arrive last
+    assert hub.ranges[-1][0] in REQUIRED_MODEL_FILES
+    assert model_index.get("org_complete").valid
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_job(hub, downloads):
+    hub.add_model("org/shared")
+
+    first = await downloads.submit("org/shared")
+    second = await downloads.submit("org/shared")
+
+    assert first.id == second.id
+    assert (await finished(downloads, first.id)).state == "completed"
+
+
+@pytest.mark.asyncio
+async def test_corrupt_files_fail_verification_and_are_removed(hub, downloads):
+    hub.add_model("org/corrupt")
+    hub.corrupt.add("model.safetensors")
+
+    job = await finished(downloads, (await downloads.submit("org/corrupt")).id)
+
+    assert job.state == "failed"
+    assert "Integrity check failed" in job.error
+    folder = os.path.join(model_index.volume_path, "org_corrupt")
+    assert not os.path.exists(os.path.join(folder, "model.safetensors"))
+    assert os.path.exists(os.path.join(folder, "config.json"))
+    weights = next(f for f in job.files if f.path == "model.safetensors")
+    assert not weights.done and weights.downloaded == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_repository_fails(hub, downloads):
+    job = await finished(downloads, (await downloads.submit("org/missing")).id)
+
+    assert job.state == "failed"
+    assert "not found" in job.error
+
+
+@pytest.mark.asyncio
+async def test_cancelled_download_resumes_where_it_stopped(hub, downloads):
+    hub.add_model("org/resume", weights_size=10000)
+    hub.stall = ("model.safetensors", 3000)
+
+    job = await downloads.submit("org/resume")
+    await asyncio.get_running_loop().run_in_executor(None, hub.stalled.wait, 5)
+    cancel = asyncio.ensure_future(downloads.cancel(job.id))
+    await asyncio.sleep(0.05)
+    hub.release.set()
+    job = await cancel
+
+    assert job.state == "cancelled"
+    assert downloads.jobs.get_by_id(job.id).state == "cancelled"
+    weights = next(f for f in job.files if f.path == "model.safetensors")
+    # The stalled range was stopped before any of it was read
+    assert weights.chunks[:4] == [1000, 1000, 1000, 0]
+    assert not weights.done
+
+    hub.ranges.clear()
+    job = await finished(downloads, (await downloads.resume(job.id)).id)
+
+    assert job.state == "completed", job.error
+    fetched = sorted(start for name, start, _ in hub.ranges if name == "model.safetensors")
+    assert fetched == list(range(3000, 10000, 1000))
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+from inferadmin.routes.models.index import ModelIndex
+from inferadmin.routes.models.models import ModelFile, ModelIndexEntry, ModelWeights
+from inferadmin.state.manager import StateManager
+
+
+def entry(name, valid=True, files=3):
+    return ModelIndexEntry(
+        id=name,
+        path=f"/models/{name}",
+        valid=valid,
+        total_bytes=3 * 1024**3,
+        files=[ModelFile(path=f"shard-{i}", size=1, mtime=0) for i in range(files)],
+        weights=ModelWeights(
+            parameters=8, dtypes={"BF16": 8}, weight_bytes=16, weight_vram_gb=0.1, shards=1
+        ),
+        indexed=datetime.now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_reads_entries_without_copying_manifests(tmp_path, monkeypatch):
+    index = ModelIndex(volume_path=str(tmp_path))
+    index.entries = StateManager(tmp_path, "model_index.json", ModelIndexEntry)
+    await index.entries.add(entry("org_model", files=1000))
+    await index.entries.add(entry("org_partial", valid=False))
+
+    def copying_read():
+        raise AssertionError("listing must not copy index entries")
+
+    monkeypatch.setattr(index.entries, "get_all", copying_read)
+    (model,) = index.list_models()
+
+    assert (model.repo_id, model.size_gb) == ("org/model", 3.0)
+    # The listed record is the caller's to change
+    model.weights.dtypes["F32"] = 1
+    assert index.entries.view_by_id("org_model").weights.dtypes == {"BF16": 8}
+    await index.entries.close()
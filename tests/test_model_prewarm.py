@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from inferadmin.config.loader import config_manager
+from inferadmin.config.models import InferAdminConfig
+from inferadmin.routes.models.prewarm import ModelPrewarmer
+
+
+@pytest.fixture
+def volume(tmp_path, monkeypatch):
+    volume = tmp_path / "models"
+    (volume / "org_model").mkdir(parents=True)
+    (volume / "org_model" / "model.safetensors").write_bytes(b"w" * 10000)
+    monkeypatch.setattr(
+        config_manager,
+        "config",
+        InferAdminConfig(model_storage_path=str(volume), hf_token="hf_test"),
+        raising=False,
+    )
+    return volume
+
+
+@pytest.mark.asyncio
+async def test_prewarm_reads_every_byte(volume, monkeypatch):
+    recorded = []
+
+    async def record_use(repo_id, deployed=False):
+        recorded.append(repo_id)
+
+    monkeypatch.setattr("inferadmin.routes.models.prewarm.model_quota.record_use", record_use)
+    prewarmer = ModelPrewarmer(workers=2, chunk_size=4096)
+
+    job = await prewarmer.prewarm("org/model")
+
+    assert job.state == "completed", job.error
+    assert job.read_bytes == job.total_bytes == 10000
+    assert recorded == ["org/model"]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_leaves_queued_jobs_cancelled(volume):
+    prewarmer = ModelPrewarmer()
+    job = prewarmer.submit("org/model")
+    # Another job holds the disk, so this one is still queued
+    await prewarmer._slot.acquire()
+    task = prewarmer._jobs[job.id].task
+    await asyncio.sleep(0)
+
+    await prewarmer.close()
+
+    assert task.cancelled()
+    assert job.state == "cancelled"
+    assert job.finished is not None
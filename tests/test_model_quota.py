@@ -0,0 +1,76 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from inferadmin.routes.models import quota as quota_module
+from inferadmin.routes.models.models import ModelFile, ModelIndexEntry, ModelUsage
+from inferadmin.routes.models.quota import LinkSurvey, ModelQuota
+from inferadmin.state.manager import StateManager
+
+
+def write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def entry(volume, name, files):
+    return ModelIndexEntry(
+        id=name,
+        path=str(volume / name),
+        valid=True,
+        files=[ModelFile(path=f, size=os.path.getsize(volume / name / f), mtime=0) for f in files],
+        indexed=datetime.now(),
+    )
+
+
+@pytest.fixture
+def volume(tmp_path):
+    volume = tmp_path / "models"
+    write(volume / "a_old" / "shared", 1000)
+    write(volume / "a_old" / "own", 10)
+    (volume / "b_new").mkdir()
+    os.link(volume / "a_old" / "shared", volume / "b_new" / "shared")
+    write(volume / "b_new" / "own", 20)
+    return volume
+
+
+def test_hard_linked_files_count_once(volume, tmp_path):
+    write(tmp_path / "outside", 5)
+    os.link(tmp_path / "outside", volume / "b_new" / "pinned")
+    links = LinkSurvey(
+        str(volume),
+        [entry(volume, "a_old", ["shared", "own"]), entry(volume, "b_new", ["shared", "own", "pinned"])],
+    )
+
+    assert links.used() == 1035
+    assert (links.exclusive("a_old"), links.exclusive("b_new")) == (10, 20)
+    assert links.evict("a_old") == 10
+    # The last folder linking the shared file frees it; the pinned file stays
+    assert links.evict("b_new") == 1020
+
+
+@pytest.mark.asyncio
+async def test_plan_sizes_evictions_by_what_they_free(volume, tmp_path, monkeypatch):
+    index = StateManager(tmp_path, "model_index.json", ModelIndexEntry)
+    await index.add(entry(volume, "a_old", ["shared", "own"]))
+    await index.add(entry(volume, "b_new", ["shared", "own"]))
+    monkeypatch.setattr(quota_module.model_index, "entries", index)
+
+    def copying_read():
+        raise AssertionError("planning must not copy index entries")
+
+    monkeypatch.setattr(index, "get_all", copying_read)
+
+    quota = ModelQuota(str(volume), quota=1100, high_watermark=1.0, low_watermark=0.5)
+    quota.usage = StateManager(tmp_path, "model_usage.json", ModelUsage)
+    now = datetime.now()
+    await quota.usage.add(ModelUsage(id="a_old", repo_id="a/old", last_used=now - timedelta(days=1)))
+    await quota.usage.add(ModelUsage(id="b_new", repo_id="b/new", last_used=now))
+
+    plan = await quota.plan(needed_bytes=100)
+
+    assert plan.used_bytes == 1030
+    assert [(c.repo_id, c.size_bytes) for c in plan.evict] == [("a/old", 10), ("b/new", 1020)]
+    assert plan.freed_bytes == 1030
+    assert plan.sufficient
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from inferadmin.routes.models.support import (
+    REQUIRED_MODEL_FILES,
+    check_hf_model_exists,
+    scan_model_folder,
+)
+from inferadmin.routes.models.transfer import PARTIAL_DIR
+
+
+def write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def model(tmp_path):
+    folder = tmp_path / "org_model"
+    for name in REQUIRED_MODEL_FILES:
+        write(folder / name, 10)
+    write(folder / "model-00001.safetensors", 1000)
+    return folder
+
+
+def test_scan_measures_every_file(model):
+    write(model / "onnx" / "model.onnx", 500)
+
+    scan = scan_model_folder(model)
+
+    assert scan.total_bytes == 10 * len(REQUIRED_MODEL_FILES) + 1000 + 500
+    assert {f.path for f in scan.files} == REQUIRED_MODEL_FILES | {
+        "model-00001.safetensors",
+        "onnx/model.onnx",
+    }
+    assert set(scan.directories) == {"", "onnx"}
+    assert scan.last_modified == max(os.stat(model / f.path).st_mtime for f in scan.files)
+
+
+def test_incomplete_folders_are_not_walked(model):
+    (model / "tokenizer.json").unlink()
+    assert scan_model_folder(model) is None
+    assert not check_hf_model_exists(model)
+
+    write(model / "tokenizer.json", 10)
+    (model / "model-00001.safetensors").unlink()
+    write(model / "model.bin", 10)
+    assert scan_model_folder(model) is None
+
+
+def test_missing_folders_scan_as_none(tmp_path):
+    assert scan_model_folder(tmp_path / "absent") is None
+    write(tmp_path / "file", 1)
+    assert scan_model_folder(tmp_path / "file") is None
+
+
+def test_symlinks_count_towards_mtime_not_size(model, tmp_path):
+    write(tmp_path / "elsewhere.safetensors", 5000)
+    os.symlink(tmp_path / "elsewhere.safetensors", model / "linked.safetensors")
+    os.symlink(tmp_path / "absent", model / "dangling")
+
+    scan = scan_model_folder(model)
+
+    files = {f.path: f for f in scan.files}
+    assert files["linked.safetensors"].size == 0
+    assert "dangling" not in files
+    assert scan.total_bytes == 10 * len(REQUIRED_MODEL_FILES) + 1000
+
+
+def test_partial_downloads_are_skipped(model):
+    write(model / PARTIAL_DIR / "model-00002.safetensors.part", 700)
+    write(model / ".cache" / "other", 3)
+
+    scan = scan_model_folder(model)
+
+    assert PARTIAL_DIR not in scan.directories
+    assert ".cache" in scan.directories
+    assert ".cache/other" in {f.path for f in scan.files}
+    assert scan.total_bytes == 10 * len(REQUIRED_MODEL_FILES) + 1000 + 3
+
+
+def test_directory_markers_change_when_entries_change(model):
+    write(model / "sub" / "a", 1)
+    os.utime(model / "sub", ns=(0, 10**18))
+    assert scan_model_folder(model).directories["sub"] == 10**18
+
+    write(model / "sub" / "b", 1)
+    assert scan_model_folder(model).directories["sub"] != 10**18
@@ -0,0 +1,53 @@
+import hashlib
+
+import pytest
+
+from inferadmin.config.loader import config_manager
+from inferadmin.config.models import InferAdminConfig
+from inferadmin.routes.models.models import ExpectedModelFile, ModelVerification
+from inferadmin.routes.models.verify import ModelVerifier
+from inferadmin.state.manager import StateManager
+
+
+@pytest.fixture
+def verifier(tmp_path, monkeypatch):
+    volume = tmp_path / "models"
+    (volume / "org_model").mkdir(parents=True)
+    monkeypatch.setattr(
+        config_manager,
+        "config",
+        InferAdminConfig(model_storage_path=str(volume), hf_token="hf_test"),
+        raising=False,
+    )
+    verifier = ModelVerifier()
+    verifier.records = StateManager(tmp_path, "model_verification.json", ModelVerification)
+    verifier.folder = volume / "org_model"
+    return verifier
+
+
+def expect(content):
+    return ExpectedModelFile(size=len(content), sha256=hashlib.sha256(content).hexdigest())
+
+
+@pytest.mark.asyncio
+async def test_integrity_summary_follows_each_check(verifier, monkeypatch):
+    (verifier.folder / "model.safetensors").write_bytes(b"weights")
+    assert verifier.integrity("org_model") is None
+
+    await verifier.verify("org/model", {"model.safetensors": expect(b"weights")})
+
+    def copying_read(id):
+        raise AssertionError("the summary must not read the per-file record")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(verifier.records, "get_by_id", copying_read)
+        summary = verifier.integrity("org_model")
+    assert (summary.state, summary.problems) == ("verified", [])
+
+    await verifier.verify("org/model", {"model.safetensors": expect(b"other!!")})
+    summary = verifier.integrity("org_model")
+    assert summary.state == "failed"
+    assert summary.problems and "SHA256" in summary.problems[0]
+
+    await verifier.forget("org/model")
+    assert verifier.integrity("org_model") is None
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+from fastapi import HTTPException
+
+from inferadmin.routes.infra.gpus.nvidia_smi import (
+    GPU_QUERY_FIELDS,
+    NvidiaSmiStream,
+    parse_gpu_csv,
+    parse_gpu_row,
+    query_gpus,
+)
+from inferadmin.routes.infra.gpus.telemetry import GpuTelemetry
+
+# Emits the rows of a script file like nvidia-smi would: with a loop interval, one
+# batch of rows per interval until the batches run out; otherwise the first
+# batch only. Every invocation's arguments are appended to a log.
+FAKE_NVIDIA_SMI = textwrap.dedent(
+    """\
+    #!{python}
+    import json, sys, time
+    script = json.load(open({script!r}))
+    with open({log!r}, "a") as log:
+        log.write(json.dumps(sys.argv[1:]) + "\\n")
+    interval = None
+    args = iter(sys.argv[1:])
+    for arg in args:
+        # nvidia-smi takes "-lms N", "--loop-ms N" and "--loop-ms=N"
+        if arg in ("-lms", "--loop-ms"):
+            interval = int(next(args))
+        elif arg.startswith("--loop-ms="):
+            interval = int(arg.partition("=")[2])
+    for batch in script["batches"] if interval is not None else script["batches"][:1]:
+        sys.stdout.write("".join(line + "\\n" for line in batch))
+        sys.stdout.flush()
+        if interval is not None:
+            time.sleep(interval / 1000)
+    sys.exit(script.get("exit", 0))
+    """
+)
+
+
+class FakeNvidiaSmi:
+    """An nvidia-smi on the PATH that replays scripted output."""
+
+    def __init__(self, directory):
+        self.script = directory / "script.json"
+        self.log = directory / "calls.log"
+        self.log.touch()
+        path = directory / "nvidia-smi"
+        path.write_text(
+            FAKE_NVIDIA_SMI.format(python=sys.executable, script=str(self.script), log=str(self.log))
+        )
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+
+    def emit(self, *batches, exit=0):
+        self.script.write_text(json.dumps({"batches": [list(b) for b in batches], "exit": exit}))
+
+    def calls(self):
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+
+@pytest.fixture
+def nvidia_smi(tmp_path, monkeypatch):
+    fake = FakeNvidiaSmi(tmp_path)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    return fake
+
+
+def row(uuid, used=1000, power="250.5"):
+    return f"{uuid}, 40, {power}, 81920, {used}"
+
+
+async def take(stream, count, timeout=5.0):
+    samples = []
+
+    async def collect():
+        async for sample in stream.samples():
+            samples.append(sample)
+            if len(samples) == count:
+                return
+
+    try:
+        await asyncio.wait_for(collect(), timeout)
+    finally:
+        await stream.close()
+    return samples
+
+
+def test_rows_parse_into_gpu_states():
+    gpu = parse_gpu_row("GPU-a, 40, 250.5, 81920, 1000")
+    assert (gpu.uuid, gpu.utilization, gpu.power_consumption) == ("GPU-a", 40.0, 250.5)
+    assert (gpu.total_vram, gpu.used_vram) == (81920.0, 1000.0)
+
+    assert parse_gpu_row("") is None
+    assert parse_gpu_row("# comment") is None
+    assert parse_gpu_row("GPU-a, 40, [N/A], 81920, 1000") is None
+    assert [g.uuid for g in parse_gpu_csv("GPU-a, 1, 2, 3, 4\nbad\nGPU-b, 1, 2, 3, 4\n")] == [
+        "GPU-a",
+        "GPU-b",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_groups_rows_into_samples(nvidia_smi):
+    nvidia_smi.emit(
+        [row("GPU-a", 1), row("GPU-b", 2)],
+        [row("GPU-a", 3), row("GPU-b", 4)],
+        [row("GPU-a", 5), row("GPU-b", 6)],
+    )
+
+    samples = await take(NvidiaSmiStream(interval=0.01), 3)
+
+    assert [[g.used_vram for g in sample] for sample in samples] == [[1, 2], [3, 4], [5, 6]]
+    # One process, started with the query fields and the repeat interval
+    assert nvidia_smi.calls() == [
+        [f"--query-gpu={GPU_QUERY_FIELDS}", "--format=csv,noheader,nounits", "-lms", "10"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_relearns_the_gpu_set(nvidia_smi):
+    # GPU-b falls off the bus
+    nvidia_smi.emit(
+        [row("GPU-a", 1), row("GPU-b", 1)],
+        [row("GPU-a", 2), row("GPU-b", 2)],
+        [row("GPU-a", 3)],
+        [row("GPU-a", 4)],
+        [row("GPU-a", 5)],
+    )
+
+    samples = await take(NvidiaSmiStream(interval=0.01), 4)
+
+    assert [[g.uuid for g in sample] for sample in samples] == [
+        ["GPU-a", "GPU-b"],
+        ["GPU-a", "GPU-b"],
+        ["GPU-a"],
+        ["GPU-a"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_skips_rows_it_cannot_parse(nvidia_smi):
+    nvidia_smi.emit(
+        [row("GPU-a", 1), row("GPU-b", power="[N/A]")],
+        [row("GPU-a", 2), row("GPU-b", power="[N/A]")],
+        [row("GPU-a", 3)],
+    )
+
+    samples = await take(NvidiaSmiStream(interval=0.01), 2)
+
+    assert [[g.used_vram for g in sample] for sample in samples] == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_stream_restarts_a_process_that_exits(nvidia_smi):
+    nvidia_smi.emit([row("GPU-a", 1)], [row("GPU-a", 2)], exit=1)
+    stream = NvidiaSmiStream(interval=0.01)
+
+    samples = await take(stream, 3)
+
+    assert [[g.used_vram for g in sample] for sample in samples] == [[1], [2], [1]]
+    assert stream.restarts >= 1
+    assert len(nvidia_smi.calls()) >= 2
+
+
+@pytest.mark.asyncio
+async def test_stream_needs_nvidia_smi(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(HTTPException):
+        await take(NvidiaSmiStream(interval=0.01), 1)
+
+
+@pytest.mark.asyncio
+async def test_query_runs_nvidia_smi_once(nvidia_smi):
+    nvidia_smi.emit([row("GPU-a", 1), row("GPU-b", 2)], [row("GPU-a", 3)])
+
+    gpus = await query_gpus()
+
+    assert [g.used_vram for g in gpus] == [1, 2]
+    assert nvidia_smi.calls() == [[f"--query-gpu={GPU_QUERY_FIELDS}", "--format=csv,noheader,nounits"]]
+
+
+@pytest.mark.asyncio
+async def test_failing_query_raises(nvidia_smi):
+    nvidia_smi.emit(["NVIDIA-SMI has failed"], exit=9)
+
+    with pytest.raises(HTTPException) as error:
+        await query_gpus()
+    assert "NVIDIA-SMI has failed" in error.value.detail
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["stream", "poll"])
+async def test_telemetry_records_samples_in_the_background(nvidia_smi, backend):
+    nvidia_smi.emit(*([row("GPU-a", i), row("GPU-b", i)] for i in range(50)))
+    telemetry = GpuTelemetry(interval=0.01, backend=backend)
+
+    await telemetry.start()
+    try:
+        async def sampled_twice():
+            while not telemetry.synced or len(telemetry.recent(uuid="GPU-a")[0].samples) < 2:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(sampled_twice(), 5.0)
+    finally:
+        await telemetry.stop()
+
+    assert [g.uuid for g in telemetry.latest()] == ["GPU-a", "GPU-b"]
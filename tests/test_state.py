@@ -0,0 +1,199 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from inferadmin.state.json_store import JsonStateStore
+from inferadmin.state.manager import StateManager
+
+
+class Item(BaseModel):
+    id: str
+    value: int = 0
+    tags: list[str] = []
+
+
+class CountingStore(JsonStateStore):
+    """JSON store that records each batch it commits and can fail on demand."""
+
+    def __init__(self, *args, failures: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+        self.compactions = 0
+        self.failures = failures
+
+    def _maybe_fail(self):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+
+    def commit(self, ops):
+        self._maybe_fail()
+        self.batches.append(list(ops))
+        super().commit(ops)
+
+    def compact(self, encoded):
+        self._maybe_fail()
+        self.compactions += 1
+        super().compact(encoded)
+
+
+def make_manager(tmp_path, store=None, **kwargs):
+    manager = StateManager(tmp_path, "items.json", Item, **kwargs)
+    if store is not None:
+        manager._open_store = lambda: store
+    return manager
+
+
+def reopen(tmp_path, backend="json"):
+    StateManager.configure(backend)
+    try:
+        manager = StateManager(tmp_path, "items.json", Item)
+        return {item.id: item for item in manager.get_all()}
+    finally:
+        StateManager.configure("json")
+
+
+@pytest.mark.asyncio
+async def test_reads_are_copies(tmp_path):
+    manager = make_manager(tmp_path)
+    await manager.add(Item(id="a", tags=["x"]))
+
+    item = manager.get_by_id("a")
+    item.value = 5
+    item.tags.append("y")
+    manager.get_all()[0].tags.append("z")
+
+    assert manager.get_by_id("a") == Item(id="a", tags=["x"])
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_views_are_replaced_not_mutated(tmp_path):
+    manager = make_manager(tmp_path)
+    await manager.add(Item(id="a", value=1))
+
+    viewed = manager.view_by_id("a")
+    assert manager.view_all() == [viewed]
+    await manager.update(Item(id="a", value=2))
+
+    assert viewed.value == 1
+    assert manager.view_by_id("a").value == 2
+    assert manager.view_by_id("missing") is None
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(tmp_path):
+    store = CountingStore(tmp_path, "items.json")
+    manager = make_manager(tmp_path, store, commit_window=0.05)
+
+    await asyncio.gather(*(manager.add(Item(id=str(i), value=i)) for i in range(20)))
+
+    assert len(store.batches) == 1
+    assert [id for _, id, _ in store.batches[0]] == [str(i) for i in range(20)]
+    await manager.close()
+    assert len(reopen(tmp_path)) == 20
+
+
+@pytest.mark.asyncio
+async def test_delete_is_persisted(tmp_path):
+    manager = make_manager(tmp_path)
+    await manager.add(Item(id="a"))
+    await manager.add(Item(id="b"))
+    assert await manager.delete("a")
+    assert not await manager.delete("missing")
+    await manager.close()
+
+    assert list(reopen(tmp_path)) == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_torn_journal_tail_is_discarded(tmp_path):
+    manager = make_manager(tmp_path)
+    await manager.add(Item(id="a", value=1))
+    await manager.add(Item(id="b", value=2))
+    await manager.close()
+
+    journal = tmp_path / "items.json.journal"
+    intact = journal.stat().st_size
+    with open(journal, "a") as f:
+        # The process died halfway through appending a record
+        f.write('{"op": "put", "item": {"id": "c", "val')
+
+    records = reopen(tmp_path)
+    assert records == {"a": Item(id="a", value=1), "b": Item(id="b", value=2)}
+    assert journal.stat().st_size == intact
+
+
+@pytest.mark.asyncio
+async def test_journal_is_compacted_into_snapshot(tmp_path):
+    store = CountingStore(tmp_path, "items.json", compact_threshold=200)
+    manager = make_manager(tmp_path, store)
+    for i in range(10):
+        await manager.update(Item(id="a", value=i))
+    await manager.close()
+
+    assert store.compactions > 0
+    snapshot = json.loads((tmp_path / "items.json").read_text())
+    assert snapshot[0]["id"] == "a"
+    assert reopen(tmp_path)["a"].value == 9
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_retried(tmp_path):
+    store = CountingStore(tmp_path, "items.json", failures=2)
+    manager = make_manager(tmp_path, store, commit_window=0.001)
+
+    await asyncio.gather(manager.add(Item(id="a")), manager.add(Item(id="b")))
+    await manager.close()
+
+    # The retry rewrites the whole state rather than replaying the batch
+    assert store.compactions == 1
+    assert set(reopen(tmp_path)) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_failed_write_on_close_reaches_callers(tmp_path):
+    store = CountingStore(tmp_path, "items.json", failures=100)
+    manager = make_manager(tmp_path, store, commit_window=0.001)
+
+    write = asyncio.ensure_future(manager.add(Item(id="a")))
+    await asyncio.sleep(0.01)
+    await manager.close()
+
+    with pytest.raises(OSError):
+        await write
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_round_trips(tmp_path):
+    StateManager.configure("sqlite")
+    try:
+        manager = StateManager(tmp_path, "items.json", Item)
+        await asyncio.gather(*(manager.add(Item(id=str(i), value=i)) for i in range(5)))
+        await manager.delete("0")
+        await manager.update(Item(id="1", value=10))
+        await manager.close()
+    finally:
+        StateManager.configure("json")
+
+    records = reopen(tmp_path, "sqlite")
+    assert list(records) == ["1", "2", "3", "4"]
+    assert records["1"].value == 10
+    assert not (tmp_path / "items.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_json_state_is_migrated_to_sqlite(tmp_path):
+    manager = make_manager(tmp_path)
+    await manager.add(Item(id="a", value=1))
+    await manager.add(Item(id="b", value=2))
+    await manager.close()
+
+    assert reopen(tmp_path, "sqlite") == {"a": Item(id="a", value=1), "b": Item(id="b", value=2)}
+    assert (tmp_path / "items.json.journal.migrated").exists()
+    # Migration only happens once; the retired JSON files aren't read again
+    assert not JsonStateStore(tmp_path, "items.json").exists()
+    assert set(reopen(tmp_path, "sqlite")) == {"a", "b"}